@@ -1,5 +1,8 @@
+from typing import Any
+
 from django.contrib import admin
-from .models import UniformSpec
+from .history import specs_as_of
+from .models import SpecRevision, UniformSpec
 
 
 @admin.register(UniformSpec)
@@ -24,3 +27,28 @@ class UniformSpecAdmin(admin.ModelAdmin):
         ("Version Control", {"fields": ("version", "frozen")}),
         ("Timestamps", {"fields": ("created_at", "updated_at")}),
     )
+
+
+@admin.register(SpecRevision)
+class SpecRevisionAdmin(admin.ModelAdmin):
+    list_display = ["spec", "revision", "is_snapshot", "recorded_at"]
+    list_select_related = ["spec__school"]
+    search_fields = ["spec__school__name", "spec__item_name"]
+    ordering = ["-recorded_at"]
+    readonly_fields = [
+        "id", "spec", "revision", "recorded_at", "content", "changes", "snapshot"
+    ]
+
+    @admin.display(boolean=True, description="Snapshot")
+    def is_snapshot(self, obj: SpecRevision) -> bool:
+        return obj.snapshot is not None
+
+    @admin.display(description="Content at this revision")
+    def content(self, obj: SpecRevision) -> Any:
+        return specs_as_of([obj.spec_id], obj.recorded_at).get(obj.spec_id)
+
+    def has_add_permission(self, request: Any) -> bool:
+        return False
+
+    def has_change_permission(self, request: Any, obj: Any = None) -> bool:
+        return False
@@ -0,0 +1,83 @@
+"""Catalog cache keys and invalidation."""
+
+from typing import Any, Iterable
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+from config.cache import bump_generation_on_commit, get_generation, get_generations
+
+# Entries are invalidated on write via the per-school generation, so the TTL
+# only bounds memory use, not staleness.
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Frozen specs no longer change, so their serialized form is cached without a
+# TTL under its own namespace, outside the catalog generations
+FROZEN_SPEC_CACHE_TIMEOUT = None
+
+
+def catalog_scope(school_id: Any) -> str:
+    return f"catalog:{school_id}"
+
+
+def catalog_cache_key(school_id: Any, query_params: str = "", section: str = "") -> str:
+    """Build the cache key for a school's catalog at its current generation.
+
+    ``section`` separates derived responses (e.g. facets) cached alongside the
+    catalog listing itself.
+    """
+    generation = get_generation(catalog_scope(school_id))
+    return _catalog_key(school_id, generation, query_params, section)
+
+
+def facets_cache_key(school_id: Any, latest: bool, search_text: str = "") -> str:
+    """Build the cache key for a school's facet counts.
+
+    Keyed on the only parameters that change the counts, normalised, so the
+    facets of every filtered, ordered or paged catalog view share one entry.
+    """
+    return catalog_cache_key(
+        school_id, urlencode({"latest": int(latest), "q": search_text}), section="facets"
+    )
+
+
+def catalog_cache_keys(
+    school_ids: Iterable[Any], query_params: str = "", section: str = ""
+) -> dict[Any, str]:
+    """catalog_cache_key() for several schools, fetching their generations at once"""
+    school_ids = list(school_ids)
+    generations = get_generations(catalog_scope(school_id) for school_id in school_ids)
+    return {
+        school_id: _catalog_key(
+            school_id, generations[catalog_scope(school_id)], query_params, section
+        )
+        for school_id in school_ids
+    }
+
+
+def _catalog_key(school_id: Any, generation: int, query_params: str, section: str) -> str:
+    base = f"catalog:{school_id}:v{generation}"
+    if section:
+        base = f"{base}:{section}"
+    return f"{base}:{query_params}" if query_params else base
+
+
+def invalidate_catalogs(school_ids: Iterable[Any]) -> None:
+    """Invalidate cached catalogs of the given schools once the write commits"""
+    bump_generation_on_commit(*(catalog_scope(school_id) for school_id in set(school_ids)))
+
+
+def frozen_spec_cache_key(spec_id: Any) -> str:
+    return f"spec_frozen:{spec_id}"
+
+
+def forget_frozen_spec(spec_id: Any) -> None:
+    """Drop a spec's frozen cache entry, e.g. when it is edited or unfrozen.
+
+    Deleted again on commit so a reader that cached the old row in between
+    does not keep it forever.
+    """
+    key = frozen_spec_cache_key(spec_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,82 @@
+"""Catalog filter backends."""
+
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from django.db.models import Q, QuerySet, Value
+from django.db.models.lookups import (
+    Exact,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from .models import CatalogEntry
+from .queries import MeasurementValue
+
+MEASUREMENT_PARAM = re.compile(
+    r"^measurements\.(?P<key>[A-Za-z0-9_]+?)(?:__(?P<lookup>exact|gt|gte|lt|lte))?$"
+)
+
+# Bounds on numeric values, well past any real measurement: Postgres numeric
+# overflows on huge exponents, which would otherwise surface as a 500
+MAX_MEASUREMENT_EXPONENT = 15
+MAX_MEASUREMENT_DIGITS = 30
+
+LOOKUPS = {
+    "exact": Exact,
+    "gt": GreaterThan,
+    "gte": GreaterThanOrEqual,
+    "lt": LessThan,
+    "lte": LessThanOrEqual,
+}
+
+
+class MeasurementFilter(BaseFilterBackend):
+    """
+    Filter specs on their measurements JSON, e.g. ?measurements.chest__gte=32.
+
+    Numeric values compare through measurement_value(), which has expression
+    indexes for the common keys (catalog.queries.MEASUREMENT_INDEXED_KEYS).
+    Non-numeric exact matches (?measurements.size=M) use JSONB containment,
+    served by the GIN jsonb_path_ops index on measurements.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        field = "spec__measurements" if queryset.model is CatalogEntry else "measurements"
+
+        for param, values in request.query_params.lists():
+            match = MEASUREMENT_PARAM.match(param)
+            if not match:
+                continue
+            key, lookup = match["key"], match["lookup"] or "exact"
+            for raw in values:
+                queryset = queryset.filter(self.build_condition(field, key, lookup, raw))
+        return queryset
+
+    def build_condition(self, field: str, key: str, lookup: str, raw: str) -> Any:
+        try:
+            number = Decimal(raw)
+        except InvalidOperation:
+            number = None
+
+        if number is None or not number.is_finite():
+            if lookup != "exact":
+                raise ValidationError(
+                    {f"measurements.{key}__{lookup}": "A number is required."}
+                )
+            return Q(**{f"{field}__contains": {key: raw}})
+
+        if (
+            abs(number.adjusted()) > MAX_MEASUREMENT_EXPONENT
+            or len(number.as_tuple().digits) > MAX_MEASUREMENT_DIGITS
+        ):
+            param = f"measurements.{key}" + ("" if lookup == "exact" else f"__{lookup}")
+            raise ValidationError({param: "Number out of range."})
+
+        return LOOKUPS[lookup](MeasurementValue(field, Value(key)), number)
@@ -0,0 +1,177 @@
+"""
+Spec revision history.
+
+Each change to a spec's content is recorded as a SpecRevision (see
+catalog.signals). Most revisions hold only the fields that changed, and for
+measurements only the keys that changed; every SPEC_SNAPSHOT_INTERVAL-th
+revision holds the full content instead. Rebuilding a spec as it was at any
+moment reads the newest revisions up to that moment back to a snapshot, so
+at most SPEC_SNAPSHOT_INTERVAL rows through idx_spec_revision_recorded,
+however long the spec's history.
+
+Writes that skip model signals (QuerySet.update, raw SQL) are not recorded;
+bulk inserts record their specs' first revision with record_initial_revisions.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SpecRevision, UniformSpec
+
+# Revisions 1, 1 + N, 1 + 2N, ... hold a full snapshot
+SPEC_SNAPSHOT_INTERVAL = 10
+
+# Spec fields kept in the history
+HISTORY_FIELDS = (
+    "academic_year",
+    "description",
+    "item_type",
+    "item_name",
+    "gender",
+    "season",
+    "fabric_gsm",
+    "pantone",
+    "measurements",
+    "frozen",
+    "version",
+)
+
+# Key of a revision's changes holding {"set": {...}, "unset": [...]} for
+# measurements, used when both the old and new measurements are objects
+MEASUREMENTS_PATCH = "measurements_patch"
+
+# Snapshots every given spec's current content as its first revision
+RECORD_INITIAL_REVISIONS_SQL = f"""
+    INSERT INTO spec_revisions (id, spec_id, revision, snapshot, recorded_at)
+    SELECT gen_random_uuid(), id, 1,
+           jsonb_build_object({", ".join(f"'{field}', {field}" for field in HISTORY_FIELDS)}),
+           created_at
+    FROM uniform_specs
+    WHERE id = ANY(%s::uuid[])
+    ON CONFLICT (spec_id, revision) DO NOTHING
+"""
+
+# The newest revisions of each spec recorded up to a moment: enough to reach
+# back to a snapshot, read in index order
+REVISIONS_AS_OF_SQL = """
+    SELECT revision.*
+    FROM unnest(%s::uuid[]) AS spec (id)
+    CROSS JOIN LATERAL (
+        SELECT *
+        FROM spec_revisions
+        WHERE spec_id = spec.id AND recorded_at <= %s
+        ORDER BY recorded_at DESC, revision DESC
+        LIMIT %s
+    ) AS revision
+"""
+
+_MISSING = object()
+
+
+def spec_state(spec: UniformSpec) -> dict[str, Any]:
+    """A spec's current content, as kept in the history"""
+    return {field: getattr(spec, field) for field in HISTORY_FIELDS}
+
+
+def diff_states(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """The changes that turn the old content into the new (see apply_changes)"""
+    changes: dict[str, Any] = {}
+    for field in HISTORY_FIELDS:
+        before, after = old.get(field, _MISSING), new[field]
+        if before == after:
+            continue
+        if field == "measurements" and isinstance(before, dict) and isinstance(after, dict):
+            changes[MEASUREMENTS_PATCH] = {
+                "set": {
+                    key: value
+                    for key, value in after.items()
+                    if before.get(key, _MISSING) != value
+                },
+                "unset": [key for key in before if key not in after],
+            }
+        else:
+            changes[field] = after
+    return changes
+
+
+def apply_changes(state: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+    state = {**state, **changes}
+    if patch := state.pop(MEASUREMENTS_PATCH, None):
+        measurements = {**state["measurements"], **patch["set"]}
+        for key in patch["unset"]:
+            measurements.pop(key, None)
+        state["measurements"] = measurements
+    return state
+
+
+def rebuild(revisions: Sequence[SpecRevision]) -> dict[str, Any] | None:
+    """Content as of the first of revisions, given newest first.
+
+    None when the revisions do not reach back to a snapshot.
+    """
+    for position, revision in enumerate(revisions):
+        if revision.snapshot is not None:
+            state = revision.snapshot
+            for newer in reversed(revisions[:position]):
+                state = apply_changes(state, newer.changes)
+            return {**state, "revision": revisions[0].revision}
+    return None
+
+
+def record_revision(spec: UniformSpec) -> SpecRevision | None:
+    """Record a spec's current content if it differs from its last revision"""
+    with transaction.atomic():
+        # Saves of one spec record their revisions one at a time
+        UniformSpec.objects.select_for_update().filter(pk=spec.pk).exists()
+        recent = list(
+            SpecRevision.objects.filter(spec_id=spec.pk).order_by("-revision")[
+                :SPEC_SNAPSHOT_INTERVAL
+            ]
+        )
+        previous = rebuild(recent)
+        current = spec_state(spec)
+        if previous is not None:
+            previous.pop("revision")
+            if previous == current:
+                return None
+
+        number = recent[0].revision + 1 if recent else 1
+        if previous is None or (number - 1) % SPEC_SNAPSHOT_INTERVAL == 0:
+            return SpecRevision.objects.create(
+                spec_id=spec.pk, revision=number, snapshot=current, recorded_at=timezone.now()
+            )
+        return SpecRevision.objects.create(
+            spec_id=spec.pk,
+            revision=number,
+            changes=diff_states(previous, current),
+            recorded_at=timezone.now(),
+        )
+
+
+def record_initial_revisions(spec_ids: Iterable[Any]) -> None:
+    """Record the first revision of specs inserted without model signals"""
+    spec_ids = [str(spec_id) for spec_id in spec_ids]
+    if spec_ids:
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_INITIAL_REVISIONS_SQL, [spec_ids])
+
+
+def specs_as_of(spec_ids: Iterable[Any], at: datetime) -> dict[Any, dict[str, Any]]:
+    """Map spec ids to their content at a moment, with its revision number.
+
+    Specs with no revision recorded by then are left out.
+    """
+    spec_ids = list({str(spec_id) for spec_id in spec_ids})
+    if not spec_ids:
+        return {}
+    revisions: defaultdict[Any, list[SpecRevision]] = defaultdict(list)
+    for revision in SpecRevision.objects.raw(
+        REVISIONS_AS_OF_SQL, [spec_ids, at, SPEC_SNAPSHOT_INTERVAL]
+    ):
+        revisions[revision.spec_id].append(revision)
+    states = {spec_id: rebuild(newest_first) for spec_id, newest_first in revisions.items()}
+    return {spec_id: state for spec_id, state in states.items() if state is not None}
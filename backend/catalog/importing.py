@@ -0,0 +1,222 @@
+"""
+Bulk spec import (see config.importing).
+
+Rows name their school by code. Each row becomes a new version of its item
+(see SPEC_VERSION_KEY), numbered in SQL after the newest existing version,
+unless it matches that version's content, in which case it is left alone so
+re-running an import creates nothing. An item repeated within a chunk is
+loaded from its last line.
+"""
+
+import json
+import re
+from typing import IO, Any
+
+from django.db import DatabaseError, connection, transaction
+from rest_framework import serializers
+
+from config.importing import (
+    IMPORT_CHUNK_SIZE,
+    ImportReport,
+    chunked,
+    copy_rows,
+    read_records,
+)
+from schools.models import School
+from .cache import invalidate_catalogs
+from .history import record_initial_revisions
+from .queries import SPEC_VERSION_KEY, lock_schools
+from .read_model import refresh_catalog_entries
+
+# Plausible fabric weights, in grams per square metre
+MIN_FABRIC_GSM = 30
+MAX_FABRIC_GSM = 1000
+
+# Pantone codes as spec sheets write them: "PMS 287C", "287 C", "19-4052 TCX"
+# or a named colour like "Reflex Blue C"
+PANTONE_CODE = re.compile(
+    r"^(?:PMS|Pantone)?\s*"
+    r"(?:\d{2}-\d{4}(?:\s*(?:TCX|TPX|TPG|TSX))?|\d{3,4}\s*[CU]?|[A-Z][A-Z ]*?\d*\s*[CU])$",
+    re.IGNORECASE,
+)
+
+MAX_MEASUREMENT_KEY_LENGTH = 50
+
+# Columns set from the import, in COPY order after the line number
+IMPORTED_COLUMNS = (
+    "school_id",
+    "academic_year",
+    "description",
+    "item_type",
+    "item_name",
+    "gender",
+    "season",
+    "fabric_gsm",
+    "pantone",
+    "measurements",
+)
+
+STAGING_COLUMNS = ("line", *IMPORTED_COLUMNS)
+
+# Columns compared with the newest version to tell an unchanged row
+_CONTENT_COLUMNS = ("academic_year", "description", "fabric_gsm", "pantone", "measurements")
+
+_KEY = ", ".join(SPEC_VERSION_KEY)
+
+CREATE_STAGING_SQL = """
+    CREATE TEMPORARY TABLE spec_import (
+        line integer NOT NULL,
+        school_id uuid NOT NULL,
+        academic_year varchar(20) NOT NULL,
+        description text NOT NULL,
+        item_type varchar(100) NOT NULL,
+        item_name varchar(100) NOT NULL,
+        gender varchar(20) NOT NULL,
+        season varchar(50) NOT NULL,
+        fabric_gsm integer NOT NULL,
+        pantone varchar(50) NOT NULL,
+        measurements jsonb NOT NULL
+    ) ON COMMIT DROP
+"""
+
+# The schools are locked beforehand (see lock_schools), so latest sees every
+# version committed before this chunk
+INSERT_SQL = f"""
+    WITH staged AS (
+        SELECT DISTINCT ON ({_KEY}) *
+        FROM spec_import
+        ORDER BY {_KEY}, line DESC
+    ),
+    latest AS (
+        SELECT DISTINCT ON ({_KEY}) {_KEY}, version, {", ".join(_CONTENT_COLUMNS)}
+        FROM uniform_specs
+        WHERE school_id IN (SELECT school_id FROM staged)
+        ORDER BY {_KEY}, version DESC
+    )
+    INSERT INTO uniform_specs (
+        id, {", ".join(IMPORTED_COLUMNS)}, frozen, version, created_at, updated_at
+    )
+    SELECT gen_random_uuid(), {", ".join(f"staged.{column}" for column in IMPORTED_COLUMNS)},
+           false, coalesce(latest.version, 0) + 1, now(), now()
+    FROM staged
+    LEFT JOIN latest USING ({_KEY})
+    WHERE ({", ".join(f"latest.{column}" for column in _CONTENT_COLUMNS)})
+          IS DISTINCT FROM
+          ({", ".join(f"staged.{column}" for column in _CONTENT_COLUMNS)})
+    RETURNING id, school_id, version
+"""
+
+
+class MeasurementsField(serializers.Field):
+    """An object of measurement names to numbers or text; CSV cells hold it as JSON"""
+
+    default_error_messages = {
+        "invalid_json": "Expected a JSON object.",
+        "invalid": 'Expected an object like {{"chest": 36}} with number or text values.',
+    }
+
+    def to_internal_value(self, data: Any) -> dict[str, Any]:
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                self.fail("invalid_json")
+        if not isinstance(data, dict) or not all(
+            0 < len(key) <= MAX_MEASUREMENT_KEY_LENGTH
+            and isinstance(value, (int, float, str))
+            and not isinstance(value, bool)
+            for key, value in data.items()
+        ):
+            self.fail("invalid")
+        return data
+
+    def to_representation(self, value: Any) -> Any:
+        return value
+
+
+class SpecImportSerializer(serializers.Serializer):
+    """Validate one imported spec row"""
+
+    school = serializers.CharField(max_length=50, help_text="The school's code")
+    academic_year = serializers.CharField(max_length=20)
+    description = serializers.CharField(default="")
+    item_type = serializers.CharField(max_length=100)
+    item_name = serializers.CharField(max_length=100)
+    gender = serializers.CharField(max_length=20)
+    season = serializers.CharField(max_length=50)
+    fabric_gsm = serializers.IntegerField(min_value=MIN_FABRIC_GSM, max_value=MAX_FABRIC_GSM)
+    pantone = serializers.RegexField(PANTONE_CODE, max_length=50)
+    measurements = MeasurementsField(default=dict)
+
+    def validate_pantone(self, value: str) -> str:
+        return " ".join(value.split())
+
+
+def import_specs(
+    stream: IO[str], format: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> ImportReport:
+    """Validate and load the specs in a CSV or JSON Lines stream.
+
+    New items are reported as created and new versions of existing items as
+    updated.
+    """
+    report = ImportReport()
+    # One serializer validates every row (see schools.importing)
+    validator = SpecImportSerializer()
+    for chunk in chunked(read_records(stream, format, report), chunk_size):
+        valid = []
+        for line, record in chunk:
+            try:
+                valid.append((line, validator.run_validation(record)))
+            except serializers.ValidationError as exc:
+                report.add_error(line, exc.detail)
+
+        school_ids = dict(
+            School.objects.filter(code__in={data["school"] for _, data in valid}).values_list(
+                "code", "id"
+            )
+        )
+        rows = []
+        for line, data in valid:
+            school_id = school_ids.get(data["school"])
+            if school_id is None:
+                report.add_error(line, {"school": ["No school with this code."]})
+                continue
+            data = {
+                **data,
+                "school_id": school_id,
+                "measurements": json.dumps(data["measurements"]),
+            }
+            rows.append((line, *(data[column] for column in IMPORTED_COLUMNS)))
+        if rows:
+            load_chunk(rows, report)
+    return report
+
+
+def load_chunk(rows: list[tuple[Any, ...]], report: ImportReport) -> None:
+    """Insert one chunk of validated rows in its own transaction"""
+    school_ids = {row[1] for row in rows}
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            lock_schools(school_ids)
+            cursor.execute(CREATE_STAGING_SQL)
+            copy_rows(cursor, "spec_import", STAGING_COLUMNS, rows)
+            cursor.execute(INSERT_SQL)
+            inserted = cursor.fetchall()
+            # See schools.importing
+            cursor.execute("DROP TABLE spec_import")
+            # Raw SQL skips the model signals that maintain the history, the
+            # read model and the caches
+            spec_ids = [spec_id for spec_id, _, _ in inserted]
+            record_initial_revisions(spec_ids)
+            refresh_catalog_entries(spec_ids)
+            invalidate_catalogs({school_id for _, school_id, _ in inserted})
+    except DatabaseError as exc:
+        for row in rows:
+            report.add_error(row[0], {"non_field_errors": [str(exc).strip()]})
+        return
+
+    created = sum(1 for _, _, version in inserted if version == 1)
+    report.created += created
+    report.updated += len(inserted) - created
+    report.unchanged += len(rows) - len(inserted)
@@ -0,0 +1,61 @@
+"""
+Management command to rebuild the denormalized catalog read model.
+
+Usage:
+    python manage.py rebuild_catalog
+    python manage.py rebuild_catalog --school <school_id> --batch-size 1000
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from catalog.cache import invalidate_catalogs
+from catalog.models import CatalogEntry, UniformSpec
+from catalog.read_model import catalog_specs, save_catalog_entries
+
+
+class Command(BaseCommand):
+    help = "Rebuild catalog_entries from uniform specs and their active listings"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--school",
+            action="append",
+            dest="schools",
+            default=[],
+            help="Only rebuild entries for this school id (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Specs upserted per transaction (default: 500)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        school_ids: list[str] = options["schools"]
+        batch_size: int = options["batch_size"]
+
+        spec_ids = UniformSpec.objects.order_by("id")
+        if school_ids:
+            spec_ids = spec_ids.filter(school_id__in=school_ids)
+        spec_ids = list(spec_ids.values_list("id", flat=True))
+
+        self.stdout.write(f"Rebuilding catalog entries for {len(spec_ids)} specs...")
+
+        rebuilt = 0
+        for start in range(0, len(spec_ids), batch_size):
+            batch = spec_ids[start : start + batch_size]
+            with transaction.atomic():
+                rebuilt += save_catalog_entries(catalog_specs().filter(id__in=batch))
+            self.stdout.write(f"  {rebuilt}/{len(spec_ids)}")
+
+        # Drop cached catalogs that may have been built from outdated entries
+        invalidate_catalogs(
+            school_ids
+            or CatalogEntry.objects.values_list("school_id", flat=True).distinct()
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} catalog entries"))
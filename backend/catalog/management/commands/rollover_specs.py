@@ -0,0 +1,84 @@
+"""
+Management command to roll school specs over into the next academic year.
+
+Usage:
+    python manage.py rollover_specs --from-year 2025-2026
+    python manage.py rollover_specs --from-year 2025-2026 --carry-listings
+    python manage.py rollover_specs --from-year 2025-2026 --to-year 2026-2027 \\
+        --school <school_id> --batch-size 200
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from catalog.rollover import ROLLOVER_BATCH_SIZE, next_academic_year, rollover_schools
+from schools.models import School
+
+
+class Command(BaseCommand):
+    help = "Clone the current specs of schools into the next academic year"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--from-year",
+            required=True,
+            help="Academic year to roll over from, e.g. 2025-2026",
+        )
+        parser.add_argument(
+            "--to-year",
+            help="Academic year to create specs in (default: the one after --from-year)",
+        )
+        parser.add_argument(
+            "--school",
+            action="append",
+            dest="schools",
+            default=[],
+            help="Only roll over this school id (repeatable; default: all active schools)",
+        )
+        parser.add_argument(
+            "--carry-listings",
+            action="store_true",
+            help="Copy enabled listings of each spec onto its clone",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ROLLOVER_BATCH_SIZE,
+            help=f"Schools cloned per transaction (default: {ROLLOVER_BATCH_SIZE})",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from_year: str = options["from_year"]
+        to_year: str | None = options["to_year"]
+        if to_year is None:
+            try:
+                to_year = next_academic_year(from_year)
+            except ValueError as exc:
+                raise CommandError(f"{exc}; pass --to-year") from exc
+        batch_size: int = options["batch_size"]
+
+        schools = School.objects.order_by("id")
+        if options["schools"]:
+            schools = schools.filter(id__in=options["schools"])
+        else:
+            schools = schools.filter(is_active=True)
+        school_ids = list(schools.values_list("id", flat=True))
+
+        self.stdout.write(
+            f"Rolling {len(school_ids)} schools over from {from_year} to {to_year}..."
+        )
+        specs = listings = 0
+        for start in range(0, len(school_ids), batch_size):
+            batch = school_ids[start : start + batch_size]
+            created = rollover_schools(batch, from_year, to_year, options["carry_listings"])
+            specs += created["specs"]
+            listings += created["listings"]
+            self.stdout.write(
+                f"  {start + len(batch)}/{len(school_ids)} schools: "
+                f"{specs} specs, {listings} listings"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {specs} specs and {listings} listings in {to_year}")
+        )
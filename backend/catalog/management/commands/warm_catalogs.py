@@ -0,0 +1,177 @@
+"""
+Management command to pre-populate catalog, facet and school caches.
+
+Run after a deploy or Redis restart so the first parents of each school do not
+pay for a cold catalog. Requests go through the real views, so exactly the
+entries a client request would cache are written.
+
+Usage:
+    python manage.py warm_catalogs
+    python manage.py warm_catalogs --workers 8 --rate 20
+    python manage.py warm_catalogs --recent-orders 7
+    python manage.py warm_catalogs --school <school_id>
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from checkout.models import OrderItem
+from schools.models import School
+
+# (url name, school id URL kwarg, query params) requested per school
+WARM_REQUESTS = [
+    ("school-catalog", "school_id", {}),
+    ("school-catalog", "school_id", {"summary": "true"}),
+    ("school-catalog-facets", "school_id", {}),
+    ("school-detail", "pk", {}),
+]
+
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart across all threads"""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_at = time.monotonic()
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Command(BaseCommand):
+    help = "Warm the catalog, facet and school detail caches of active schools"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--school",
+            action="append",
+            dest="schools",
+            default=[],
+            help="Only warm this school id (repeatable)",
+        )
+        parser.add_argument(
+            "--recent-orders",
+            type=int,
+            metavar="DAYS",
+            help="Only warm schools with orders in the last DAYS days",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Concurrent workers, each with its own DB connection (default: 4)",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=10,
+            help="Maximum requests per second across all workers, 0 for no limit "
+            "(default: 10)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        schools = School.objects.filter(is_active=True).order_by("name")
+        if options["schools"]:
+            schools = schools.filter(id__in=options["schools"])
+        if options["recent_orders"] is not None:
+            since = timezone.now() - timedelta(days=options["recent_orders"])
+            schools = schools.filter(
+                id__in=OrderItem.objects.filter(order__created_at__gte=since).values(
+                    "listing__school_id"
+                )
+            )
+        schools = list(schools.values_list("id", "name"))
+
+        self.total = len(schools)
+        self.done = 0
+        self.failed = 0
+        self.progress_lock = threading.Lock()
+        self.rate_limiter = RateLimiter(options["rate"])
+        # Views only check that the user is authenticated; nothing is saved
+        self.user = get_user_model()(email="cache-warmer@localhost", role="parent")
+        self.factory = APIRequestFactory()
+
+        self.stdout.write(f"Warming caches for {self.total} schools...")
+        started = time.monotonic()
+
+        pending: queue.SimpleQueue = queue.SimpleQueue()
+        for school in schools:
+            pending.put(school)
+
+        workers = max(1, min(options["workers"], self.total))
+        if workers == 1:
+            self.work(pending)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self.work_in_thread, pending) for _ in range(workers)
+                ]
+            for future in futures:
+                future.result()
+
+        elapsed = time.monotonic() - started
+        summary = f"Warmed {self.done - self.failed}/{self.total} schools in {elapsed:.1f}s"
+        if self.failed:
+            self.stdout.write(self.style.WARNING(f"{summary} ({self.failed} failed)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def work_in_thread(self, pending: queue.SimpleQueue) -> None:
+        try:
+            self.work(pending)
+        finally:
+            # Each worker thread opened its own connection
+            connection.close()
+
+    def work(self, pending: queue.SimpleQueue) -> None:
+        while True:
+            try:
+                school_id, name = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            started = time.monotonic()
+            error = None
+            try:
+                self.warm_school(school_id)
+            except Exception as exc:
+                error = exc
+
+            elapsed_ms = (time.monotonic() - started) * 1000
+            with self.progress_lock:
+                self.done += 1
+                prefix = f"  [{self.done}/{self.total}] {name}"
+                if error is None:
+                    self.stdout.write(f"{prefix}: {elapsed_ms:.0f} ms")
+                else:
+                    self.failed += 1
+                    self.stderr.write(self.style.ERROR(f"{prefix}: {error}"))
+
+    def warm_school(self, school_id: Any) -> None:
+        for url_name, kwarg, params in WARM_REQUESTS:
+            path = reverse(url_name, kwargs={kwarg: school_id})
+            match = resolve(path)
+            request = self.factory.get(path, params)
+            force_authenticate(request, user=self.user)
+
+            self.rate_limiter.wait()
+            response = match.func(request, *match.args, **match.kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:15
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_add_optimized_indexes'),
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogEntry',
+            fields=[
+                ('spec', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='catalog_entry', serialize=False, to='catalog.uniformspec')),
+                ('school_name', models.CharField(max_length=255)),
+                ('item_type', models.CharField(max_length=100)),
+                ('item_name', models.CharField(max_length=100)),
+                ('gender', models.CharField(max_length=20)),
+                ('season', models.CharField(max_length=50)),
+                ('version', models.IntegerField()),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('listings', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('listing_count', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_entries', to='schools.school')),
+            ],
+            options={
+                'db_table': 'catalog_entries',
+                'ordering': ['item_type', '-version'],
+                'indexes': [models.Index(fields=['school', 'item_type'], name='idx_entry_school_item')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_catalog_entry'),
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='catalogentry',
+            index=models.Index(fields=['school', 'item_type', 'item_name', 'gender', 'season', '-version'], name='idx_entry_latest_version'),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(fields=['school', 'item_type', 'item_name', 'gender', 'season', '-version'], name='idx_spec_latest_version'),
+        ),
+    ]
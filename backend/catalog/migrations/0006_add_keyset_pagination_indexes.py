@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_add_latest_version_indexes'),
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogentry',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        # Copy the spec's timestamp onto existing read-model rows
+        migrations.RunSQL(
+            sql="""
+                UPDATE catalog_entries e
+                SET created_at = s.created_at
+                FROM uniform_specs s
+                WHERE s.id = e.spec_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='catalogentry',
+            name='created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='catalogentry',
+            index=models.Index(fields=['school', 'created_at', 'spec'], name='idx_entry_school_created'),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(fields=['school', 'created_at', 'id'], name='idx_spec_school_created'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:22
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_add_keyset_pagination_indexes'),
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uniformspec',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('item_name', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('pantone', config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_spec_search_vector'),
+        ),
+    ]
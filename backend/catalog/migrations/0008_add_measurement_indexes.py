@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:24
+
+import catalog.queries
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_add_spec_search_vector'),
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        # IMMUTABLE so it can be indexed; yields NULL rather than failing on
+        # values that are not numbers ("M", "36-38"), unlike a plain ::numeric
+        migrations.RunSQL(
+            sql=r"""
+                CREATE OR REPLACE FUNCTION measurement_value(measurements jsonb, key text)
+                RETURNS numeric
+                LANGUAGE sql
+                IMMUTABLE
+                PARALLEL SAFE
+                AS $$
+                    SELECT CASE
+                        WHEN jsonb_typeof(measurements -> key) = 'number'
+                            THEN (measurements ->> key)::numeric
+                        WHEN (measurements ->> key) ~ '^\s*-?[0-9]+(\.[0-9]+)?\s*$'
+                            THEN trim(measurements ->> key)::numeric
+                    END
+                $$;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS measurement_value(jsonb, text);",
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['measurements'], name='idx_spec_measurements', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(models.F('school'), catalog.queries.MeasurementValue('measurements', models.Value('chest')), name='idx_spec_measure_chest'),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(models.F('school'), catalog.queries.MeasurementValue('measurements', models.Value('waist')), name='idx_spec_measure_waist'),
+        ),
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(models.F('school'), catalog.queries.MeasurementValue('measurements', models.Value('length')), name='idx_spec_measure_length'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_add_measurement_indexes'),
+        ('vendors', '0006_add_listing_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogentry',
+            name='min_lead_time_days',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='catalogentry',
+            name='min_mrp',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='catalogentry',
+            name='vendor_count',
+            field=models.IntegerField(default=0),
+        ),
+        # Summarize the active listings of existing read-model rows
+        migrations.RunSQL(
+            sql="""
+                UPDATE catalog_entries e
+                SET min_mrp = a.min_mrp,
+                    vendor_count = a.vendor_count,
+                    min_lead_time_days = a.min_lead_time_days
+                FROM (
+                    SELECT l.spec_id,
+                           MIN(l.mrp) AS min_mrp,
+                           COUNT(DISTINCT l.vendor_id) AS vendor_count,
+                           MIN(l.lead_time_days) AS min_lead_time_days
+                    FROM listings l
+                    JOIN vendors v ON v.id = l.vendor_id
+                    WHERE l.enabled AND v.status = 'approved' AND v.is_active
+                    GROUP BY l.spec_id
+                ) a
+                WHERE a.spec_id = e.spec_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
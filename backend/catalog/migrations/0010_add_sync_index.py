@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_add_price_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uniformspec',
+            index=models.Index(fields=['updated_at', 'id'], name='idx_spec_updated'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:04
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_add_sync_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpecRevision',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('revision', models.IntegerField()),
+                ('snapshot', models.JSONField(null=True)),
+                ('changes', models.JSONField(null=True)),
+                ('recorded_at', models.DateTimeField()),
+                ('spec', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='catalog.uniformspec')),
+            ],
+            options={
+                'db_table': 'spec_revisions',
+                'ordering': ['spec', 'revision'],
+                'indexes': [models.Index(fields=['spec', 'recorded_at', 'revision'], name='idx_spec_revision_recorded')],
+                'unique_together': {('spec', 'revision')},
+            },
+        ),
+        # Existing specs start their history with their current content
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO spec_revisions (id, spec_id, revision, snapshot, recorded_at)
+                SELECT gen_random_uuid(), id, 1,
+                       jsonb_build_object(
+                           'academic_year', academic_year,
+                           'description', description,
+                           'item_type', item_type,
+                           'item_name', item_name,
+                           'gender', gender,
+                           'season', season,
+                           'fabric_gsm', fabric_gsm,
+                           'pantone', pantone,
+                           'measurements', measurements,
+                           'frozen', frozen,
+                           'version', version
+                       ),
+                       created_at
+                FROM uniform_specs
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,7 +1,11 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from typing import ClassVar
 from schools.models import School
+from .queries import MEASUREMENT_INDEXED_KEYS, MeasurementValue
 
 
 class UniformSpec(models.Model):
@@ -25,6 +29,16 @@ class UniformSpec(models.Model):
     version = models.IntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by Postgres from the searchable text columns
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("item_name", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+            + SearchVector("pantone", weight="C", config="simple")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         db_table = "uniform_specs"
@@ -37,7 +51,123 @@ class UniformSpec(models.Model):
             models.Index(fields=["item_type"], name="idx_spec_item_type"),
             # idx_spec_gender created in 0002_add_performance_indexes migration
             models.Index(fields=["school", "frozen"], name="idx_school_frozen"),
+            # Backs the DISTINCT ON in catalog.queries.latest_versions
+            models.Index(
+                fields=["school", "item_type", "item_name", "gender", "season", "-version"],
+                name="idx_spec_latest_version",
+            ),
+            # Backs keyset pagination of the catalog
+            models.Index(
+                fields=["school", "created_at", "id"], name="idx_spec_school_created"
+            ),
+            GinIndex(fields=["search_vector"], name="idx_spec_search_vector"),
+            models.Index(fields=["updated_at", "id"], name="idx_spec_updated"),
+            # Measurement filters: containment for exact matches, expression
+            # indexes for numeric comparisons on the common keys
+            GinIndex(
+                fields=["measurements"],
+                opclasses=["jsonb_path_ops"],
+                name="idx_spec_measurements",
+            ),
+            *[
+                models.Index(
+                    models.F("school"),
+                    MeasurementValue("measurements", models.Value(key)),
+                    name=f"idx_spec_measure_{key}",
+                )
+                for key in MEASUREMENT_INDEXED_KEYS
+            ],
         ]
 
     def __str__(self) -> str:
         return f"{self.school.name} - {self.item_type} v{self.version}"
+
+
+class SpecRevision(models.Model):
+    """One recorded state of a spec's content, see catalog.history.
+
+    Holds either the full content (snapshot) or only what changed since the
+    previous revision (changes).
+    """
+
+    objects: ClassVar[models.Manager]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    spec = models.ForeignKey(
+        UniformSpec, on_delete=models.CASCADE, related_name="revisions"
+    )
+    revision = models.IntegerField()
+    snapshot = models.JSONField(null=True)
+    changes = models.JSONField(null=True)
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "spec_revisions"
+        ordering = ["spec", "revision"]
+        unique_together = [["spec", "revision"]]
+        indexes = [
+            # Backs as-of lookups: the newest revisions up to a moment
+            models.Index(
+                fields=["spec", "recorded_at", "revision"],
+                name="idx_spec_revision_recorded",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.spec_id} r{self.revision}"
+
+
+class CatalogEntry(models.Model):
+    """Denormalized catalog row: one per spec, with its active listings embedded.
+
+    Maintained incrementally by catalog.signals and rebuilt in bulk with the
+    rebuild_catalog management command.
+    """
+
+    objects: ClassVar[models.Manager]
+
+    spec = models.OneToOneField(
+        UniformSpec,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="catalog_entry",
+    )
+    school = models.ForeignKey(
+        School, on_delete=models.CASCADE, related_name="catalog_entries"
+    )
+    school_name = models.CharField(max_length=255)
+    # Copied from the spec for filtering and ordering
+    item_type = models.CharField(max_length=100)
+    item_name = models.CharField(max_length=100)
+    gender = models.CharField(max_length=20)
+    season = models.CharField(max_length=50)
+    version = models.IntegerField()
+    # Serialized spec fields and active listings, as served by the catalog
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    listings = models.JSONField(encoder=DjangoJSONEncoder, default=list)
+    # Price summary over the active listings
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    min_mrp = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    listing_count = models.IntegerField(default=0)
+    vendor_count = models.IntegerField(default=0)
+    min_lead_time_days = models.IntegerField(null=True)
+    created_at = models.DateTimeField()  # The spec's, for keyset pagination
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "catalog_entries"
+        ordering = ["item_type", "-version"]
+        indexes = [
+            models.Index(fields=["school", "item_type"], name="idx_entry_school_item"),
+            models.Index(
+                fields=["school", "item_type", "item_name", "gender", "season", "-version"],
+                name="idx_entry_latest_version",
+            ),
+            models.Index(
+                fields=["school", "created_at", "spec"], name="idx_entry_school_created"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.school_name} - {self.item_type} v{self.version}"
@@ -0,0 +1,179 @@
+"""Reusable catalog queryset building blocks."""
+
+from typing import Any, Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Count, DecimalField, F, Func, Max, Min, Q, QuerySet
+
+from schools.models import School
+
+# A spec's identity across versions: rows sharing these values are versions
+# of the same item
+SPEC_VERSION_KEY = ("school_id", "item_type", "item_name", "gender", "season")
+
+# Measurement keys with an expression index on measurement_value()
+MEASUREMENT_INDEXED_KEYS = ("chest", "waist", "length")
+
+
+class MeasurementValue(Func):
+    """Numeric value of a measurements key, NULL when absent or non-numeric.
+
+    Wraps the IMMUTABLE measurement_value(jsonb, text) SQL function created in
+    catalog migration 0008 so the same expression can be indexed.
+    """
+
+    function = "measurement_value"
+    output_field = DecimalField()
+
+
+# Per-spec aggregates over active listings, as annotated by with_price_summary()
+# and stored on CatalogEntry
+PRICE_SUMMARY_FIELDS = (
+    "min_price",
+    "max_price",
+    "min_mrp",
+    "vendor_count",
+    "min_lead_time_days",
+)
+
+
+def with_price_summary(queryset: QuerySet) -> QuerySet:
+    """Annotate specs with price, vendor and lead-time aggregates.
+
+    The aggregates only count the listings the catalog embeds (enabled, from
+    approved and active vendors) and are computed in the same query as the
+    specs themselves.
+    """
+    active = Q(
+        listings__enabled=True,
+        listings__vendor__status="approved",
+        listings__vendor__is_active=True,
+    )
+    return queryset.annotate(
+        min_price=Min("listings__base_price", filter=active),
+        max_price=Max("listings__base_price", filter=active),
+        min_mrp=Min("listings__mrp", filter=active),
+        vendor_count=Count("listings__vendor", filter=active, distinct=True),
+        min_lead_time_days=Min("listings__lead_time_days", filter=active),
+    )
+
+
+def latest_versions(queryset: QuerySet) -> QuerySet:
+    """Restrict specs (or catalog entries) to the newest version of each item.
+
+    The newest versions are picked in SQL with DISTINCT ON over an index-ordered
+    scan, then applied as an id filter so callers keep their own ordering.
+    """
+    latest = (
+        queryset.order_by(*SPEC_VERSION_KEY, "-version")
+        .distinct(*SPEC_VERSION_KEY)
+        .values("pk")
+    )
+    return queryset.filter(pk__in=latest)
+
+
+def search_specs(
+    queryset: QuerySet, text: str, vector_field: str = "search_vector"
+) -> QuerySet:
+    """Full-text match specs on item name, description and pantone.
+
+    Matches go through the GIN index on uniform_specs.search_vector and are
+    annotated with ``search_rank`` for relevance ordering.
+    """
+    query = SearchQuery(text, search_type="websearch", config="english")
+    return queryset.filter(**{vector_field: query}).annotate(
+        search_rank=SearchRank(F(vector_field), query)
+    )
+
+
+# (label, lower bound inclusive, upper bound exclusive) on a spec's cheapest
+# active listing; specs without one are counted as "unlisted"
+PRICE_BANDS = [
+    ("under_500", None, 500),
+    ("500_1000", 500, 1000),
+    ("1000_2000", 1000, 2000),
+    ("2000_plus", 2000, None),
+]
+
+FACET_FIELDS = ("item_type", "gender", "season", "price_band")
+
+
+def _price_band_case() -> tuple[str, list]:
+    whens, params = [], []
+    for label, lower, upper in PRICE_BANDS:
+        bounds = []
+        if lower is not None:
+            bounds.append("min_price >= %s")
+            params.append(lower)
+        if upper is not None:
+            bounds.append("min_price < %s")
+            params.append(upper)
+        whens.append(f"WHEN {' AND '.join(bounds)} THEN %s")
+        params.append(label)
+    return f"CASE WHEN min_price IS NULL THEN 'unlisted' {' '.join(whens)} END", params
+
+
+def catalog_facets(queryset: QuerySet) -> dict[str, dict[str, int]]:
+    """Count specs per item type, gender, season and price band.
+
+    All four facets come from one GROUPING SETS query over the specs selected
+    by ``queryset`` (uniform specs or catalog entries).
+    """
+    spec_sql, spec_params = queryset.order_by().values("pk").query.sql_with_params()
+    band_sql, band_params = _price_band_case()
+    sql = f"""
+        SELECT item_type, gender, season, price_band,
+               GROUPING(item_type, gender, season, price_band) AS grouping_id,
+               COUNT(*)
+        FROM (
+            SELECT s.item_type, s.gender, s.season, {band_sql} AS price_band
+            FROM (
+                SELECT s.id, s.item_type, s.gender, s.season,
+                       (
+                           SELECT MIN(l.base_price)
+                           FROM listings l
+                           JOIN vendors v ON v.id = l.vendor_id
+                           WHERE l.spec_id = s.id
+                             AND l.enabled
+                             AND v.status = 'approved'
+                             AND v.is_active
+                       ) AS min_price
+                FROM uniform_specs s
+                WHERE s.id IN ({spec_sql})
+            ) s
+        ) facets
+        GROUP BY GROUPING SETS ((item_type), (gender), (season), (price_band))
+    """
+
+    # GROUPING() sets a bit for every column aggregated away; exactly one
+    # column is kept per grouping set
+    all_bits = (1 << len(FACET_FIELDS)) - 1
+    kept_field = {
+        all_bits ^ (1 << (len(FACET_FIELDS) - 1 - index)): field
+        for index, field in enumerate(FACET_FIELDS)
+    }
+
+    facets: dict[str, dict[str, int]] = {field: {} for field in FACET_FIELDS}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*band_params, *spec_params])
+        for *values, grouping_id, count in cursor.fetchall():
+            field = kept_field[grouping_id]
+            facets[field][values[FACET_FIELDS.index(field)]] = count
+    return facets
+
+
+def lock_schools(school_ids: Iterable[Any]) -> None:
+    """Lock schools' rows until the transaction ends, in id order.
+
+    Bulk spec writes (rollover, import) take the lock in its own statement
+    before reading the versions they build on: a statement that waits for a
+    lock still reads from the snapshot it started with, so locking in the
+    same statement would miss specs a concurrent writer just committed.
+    """
+    list(
+        School.objects.select_for_update()
+        .filter(pk__in=list(school_ids))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
@@ -0,0 +1,106 @@
+"""Maintenance of the denormalized catalog read model (CatalogEntry)."""
+
+from typing import Any, Iterable
+
+from django.db.models import F, OuterRef, Subquery
+
+from schools.models import School
+from .models import CatalogEntry, UniformSpec
+from .serializers import (
+    LIVE_FIELDS,
+    UniformSpecSerializer,
+    active_listings_prefetch,
+    summarize_listings,
+)
+
+# Columns rewritten when an existing entry is refreshed
+ENTRY_UPDATE_FIELDS = [
+    "school",
+    "school_name",
+    "item_type",
+    "item_name",
+    "gender",
+    "season",
+    "version",
+    "data",
+    "listings",
+    "min_price",
+    "max_price",
+    "min_mrp",
+    "listing_count",
+    "vendor_count",
+    "min_lead_time_days",
+    "created_at",
+    "refreshed_at",
+]
+
+
+def build_catalog_entry(
+    spec: UniformSpec, serializer: UniformSpecSerializer | None = None
+) -> CatalogEntry:
+    """Build the read-model row for a spec loaded with catalog_specs()"""
+    serializer = serializer or UniformSpecSerializer()
+    data = dict(serializer.to_representation(spec))
+    listings = data["listings"]
+    for field in LIVE_FIELDS:
+        data.pop(field)
+    summary = summarize_listings(spec.active_listings)
+    return CatalogEntry(
+        spec=spec,
+        school_id=spec.school_id,
+        school_name=spec.school.name,
+        item_type=spec.item_type,
+        item_name=spec.item_name,
+        gender=spec.gender,
+        season=spec.season,
+        version=spec.version,
+        data=data,
+        listings=listings,
+        listing_count=len(spec.active_listings),
+        created_at=spec.created_at,
+        **summary,
+    )
+
+
+def catalog_specs():
+    """Specs with everything the catalog serializer needs loaded up front"""
+    return UniformSpec.objects.select_related("school").prefetch_related(
+        active_listings_prefetch()
+    )
+
+
+def save_catalog_entries(specs: Iterable[UniformSpec]) -> int:
+    """Upsert read-model rows for the given specs, returning the row count"""
+    # One serializer for every spec: building its fields costs more than
+    # serializing a spec, which showed in bulk imports
+    serializer = UniformSpecSerializer()
+    entries = [build_catalog_entry(spec, serializer) for spec in specs]
+    CatalogEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=["spec"],
+        update_fields=ENTRY_UPDATE_FIELDS,
+    )
+    return len(entries)
+
+
+def refresh_catalog_entries(spec_ids: Iterable[Any]) -> None:
+    """Recompute the read-model rows of the given specs (ids or an id queryset)"""
+    save_catalog_entries(catalog_specs().filter(id__in=spec_ids))
+
+
+def refresh_school_name(school_id: Any, name: str) -> None:
+    CatalogEntry.objects.filter(school_id=school_id).exclude(school_name=name).update(
+        school_name=name
+    )
+
+
+def refresh_school_names(school_ids: Iterable[Any]) -> None:
+    """refresh_school_name() for several schools, with names read from schools"""
+    CatalogEntry.objects.filter(school_id__in=list(school_ids)).exclude(
+        school_name=F("school__name")
+    ).update(
+        school_name=Subquery(
+            School.objects.filter(pk=OuterRef("school_id")).values("name")[:1]
+        )
+    )
@@ -0,0 +1,160 @@
+"""
+Academic-year rollover: clone each school's current specs into the next year.
+
+The newest version of every spec (see SPEC_VERSION_KEY) that belongs to the
+outgoing year is copied into the new year as the next version, unfrozen so it
+can be edited, with one INSERT ... SELECT per batch of schools. Enabled
+listings of the copied specs can be carried over in the same statement.
+
+Items that already have a spec in the new year are skipped, so a rollover can
+be re-run (or resumed after a failed batch) without creating duplicates.
+"""
+
+import re
+from typing import Any, Sequence
+
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from vendors.cache import invalidate_vendor_listings
+from .cache import invalidate_catalogs
+from .history import record_initial_revisions
+from .queries import lock_schools
+from .read_model import refresh_catalog_entries
+
+# Schools cloned per transaction, and the most one API request may roll over
+ROLLOVER_BATCH_SIZE = 100
+
+_ACADEMIC_YEAR = re.compile(r"^(\d{4})-(\d{4})$")
+
+# Spec columns copied unchanged to the clone
+_COPIED_SPEC_COLUMNS = (
+    "school_id",
+    "description",
+    "item_type",
+    "item_name",
+    "gender",
+    "season",
+    "fabric_gsm",
+    "pantone",
+    "measurements",
+)
+
+# Listing columns copied unchanged to the carried-over listing
+_COPIED_LISTING_COLUMNS = (
+    "vendor_id",
+    "school_id",
+    "sku",
+    "base_price",
+    "mrp",
+    "lead_time_days",
+)
+
+_IDENTITY_COLUMNS = ("school_id", "item_type", "item_name", "gender", "season")
+_IDENTITY = ", ".join(_IDENTITY_COLUMNS)
+
+# Data-modifying CTEs always run to completion, whether or not the final
+# SELECT reads them
+ROLLOVER_SQL = f"""
+    WITH latest AS (
+        SELECT DISTINCT ON ({_IDENTITY}) *
+        FROM uniform_specs
+        WHERE school_id = ANY(%(school_ids)s::uuid[])
+        ORDER BY {_IDENTITY}, version DESC
+    ),
+    cloned AS (
+        INSERT INTO uniform_specs (
+            id, academic_year, {", ".join(_COPIED_SPEC_COLUMNS)},
+            frozen, version, created_at, updated_at
+        )
+        SELECT gen_random_uuid(), %(to_year)s, {", ".join(_COPIED_SPEC_COLUMNS)},
+               false, version + 1, now(), now()
+        FROM latest
+        WHERE academic_year = %(from_year)s
+          AND NOT EXISTS (
+              SELECT 1 FROM uniform_specs existing
+              WHERE ({", ".join(f"existing.{column}" for column in _IDENTITY_COLUMNS)})
+                  = ({", ".join(f"latest.{column}" for column in _IDENTITY_COLUMNS)})
+                AND existing.academic_year = %(to_year)s
+          )
+        RETURNING id, {_IDENTITY}
+    ),
+    carried AS (
+        INSERT INTO listings (
+            id, spec_id, {", ".join(_COPIED_LISTING_COLUMNS)},
+            enabled, created_at, updated_at
+        )
+        SELECT gen_random_uuid(), cloned.id,
+               {", ".join(f"listing.{column}" for column in _COPIED_LISTING_COLUMNS)},
+               true, now(), now()
+        FROM cloned
+        JOIN latest USING ({_IDENTITY})
+        JOIN listings listing ON listing.spec_id = latest.id AND listing.enabled
+        WHERE %(carry_listings)s
+        RETURNING vendor_id
+    )
+    SELECT cloned.id, cloned.school_id,
+           (SELECT count(*) FROM carried),
+           (SELECT array_agg(DISTINCT vendor_id) FROM carried)
+    FROM cloned
+"""
+
+
+def next_academic_year(academic_year: str) -> str:
+    """The year after a "YYYY-YYYY" academic year, e.g. 2025-2026 -> 2026-2027"""
+    match = _ACADEMIC_YEAR.match(academic_year)
+    if match is None:
+        raise ValueError(f"Expected an academic year like 2025-2026, got {academic_year!r}")
+    start, end = (int(year) for year in match.groups())
+    return f"{start + 1}-{end + 1}"
+
+
+class RolloverSerializer(serializers.Serializer):
+    """Validate a rollover request; to_year defaults to the year after from_year"""
+
+    school_ids = serializers.ListField(
+        child=serializers.UUIDField(), min_length=1, max_length=ROLLOVER_BATCH_SIZE
+    )
+    from_year = serializers.CharField(max_length=20)
+    to_year = serializers.CharField(max_length=20, required=False)
+    carry_listings = serializers.BooleanField(default=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if "to_year" not in attrs:
+            try:
+                attrs["to_year"] = next_academic_year(attrs["from_year"])
+            except ValueError as exc:
+                raise serializers.ValidationError({"to_year": f"{exc}; pass to_year."})
+        if attrs["to_year"] == attrs["from_year"]:
+            raise serializers.ValidationError({"to_year": "Must differ from from_year."})
+        return attrs
+
+
+def rollover_schools(
+    school_ids: Sequence[Any], from_year: str, to_year: str, carry_listings: bool = False
+) -> dict[str, int]:
+    """Clone one batch of schools' specs into to_year in a single transaction.
+
+    Returns the number of specs and listings created.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        lock_schools(school_ids)
+        cursor.execute(
+            ROLLOVER_SQL,
+            {
+                "school_ids": [str(school_id) for school_id in school_ids],
+                "from_year": from_year,
+                "to_year": to_year,
+                "carry_listings": carry_listings,
+            },
+        )
+        rows = cursor.fetchall()
+        if rows:
+            # Raw SQL skips the model signals that maintain the read model,
+            # the history and the caches
+            spec_ids = [spec_id for spec_id, _, _, _ in rows]
+            record_initial_revisions(spec_ids)
+            refresh_catalog_entries(spec_ids)
+            invalidate_catalogs({school_id for _, school_id, _, _ in rows})
+            invalidate_vendor_listings(rows[0][3] or [])
+    return {"specs": len(rows), "listings": rows[0][2] if rows else 0}
@@ -1,14 +1,122 @@
+from typing import Any, Iterable
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
-from .models import UniformSpec
+from vendors.models import Listing
+from .cache import FROZEN_SPEC_CACHE_TIMEOUT, frozen_spec_cache_key
+from .models import CatalogEntry, UniformSpec
+from .queries import PRICE_SUMMARY_FIELDS
+
+
+def active_listings_prefetch() -> Prefetch:
+    """Batch-load approved, enabled listings (with vendor name) for a page of specs"""
+    return Prefetch(
+        "listings",
+        queryset=Listing.objects.filter(
+            enabled=True, vendor__status="approved", vendor__is_active=True
+        )
+        .select_related("vendor")
+        .only(
+            "id", "spec_id", "base_price", "mrp", "sku", "lead_time_days",
+            "vendor__official_name",
+        )
+        .order_by("base_price", "id"),
+        to_attr="active_listings",
+    )
+
+
+# Catalog fields derived from the school and listings rather than the spec row;
+# neither cached for frozen specs nor stored in CatalogEntry.data
+LIVE_FIELDS = ("school_name", "price_summary", "listings")
+
+
+def catalog_fields(context: dict) -> list[str]:
+    """Fields of a catalog item; summary mode leaves out the embedded listings"""
+    if context.get("summary"):
+        return [field for field in UniformSpecSerializer.Meta.fields if field != "listings"]
+    return UniformSpecSerializer.Meta.fields
+
+
+def summarize_listings(listings: Iterable[Listing]) -> dict[str, Any]:
+    """Compute with_price_summary()'s aggregates from already loaded listings"""
+    listings = list(listings)
+    prices = [listing.base_price for listing in listings]
+    return {
+        "min_price": min(prices, default=None),
+        "max_price": max(prices, default=None),
+        "min_mrp": min((listing.mrp for listing in listings), default=None),
+        "vendor_count": len({listing.vendor_id for listing in listings}),
+        "min_lead_time_days": min(
+            (listing.lead_time_days for listing in listings), default=None
+        ),
+    }
+
+
+def format_price_summary(values: dict[str, Any]) -> dict[str, Any]:
+    """Shape price summary aggregates like the embedded listings (prices as strings)"""
+
+    def price(value: Any) -> str | None:
+        return None if value is None else str(value)
+
+    return {
+        "min_price": price(values["min_price"]),
+        "max_price": price(values["max_price"]),
+        "min_mrp": price(values["min_mrp"]),
+        "vendor_count": values["vendor_count"],
+        "min_lead_time_days": values["min_lead_time_days"],
+    }
+
+
+class FrozenSpecListSerializer(serializers.ListSerializer):
+    """
+    Serialize a page of specs, reusing the cached representation of frozen ones.
+
+    Only the live parts (school name, price summary and listings) are computed
+    for frozen specs; their static fields come from one get_many on the frozen namespace.
+    """
+
+    def to_representation(self, data):
+        specs = list(data.all() if isinstance(data, BaseManager) else data)
+        frozen = [spec for spec in specs if spec.frozen]
+        if frozen:
+            cached = get_frozen_spec_data(frozen)
+            for spec in frozen:
+                spec.frozen_data = cached[spec.pk]
+        return [self.child.to_representation(spec) for spec in specs]
 
 
 class UniformSpecSerializer(serializers.ModelSerializer[UniformSpec]):
     school_name = serializers.CharField(source="school.name", read_only=True)
+    price_summary = serializers.SerializerMethodField()
     listings = serializers.SerializerMethodField()
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # ?summary=true: the browse page only needs the price summary
+        if self.context.get("summary"):
+            fields.pop("listings")
+        return fields
+
+    def active_listings(self, obj):
+        # Prefer listings prefetched by the catalog queryset (one batched query
+        # for the whole page); fall back to a per-spec query otherwise.
+        listings = getattr(obj, "active_listings", None)
+        if listings is None:
+            listings = obj.listings.filter(
+                enabled=True, vendor__status="approved", vendor__is_active=True
+            ).select_related("vendor").order_by("base_price", "id")
+        return listings
+
+    def get_price_summary(self, obj):
+        # Annotated by the catalog queryset (see queries.with_price_summary)
+        if hasattr(obj, "vendor_count"):
+            return format_price_summary(
+                {field: getattr(obj, field) for field in PRICE_SUMMARY_FIELDS}
+            )
+        return format_price_summary(summarize_listings(self.active_listings(obj)))
+
     def get_listings(self, obj):
-        # Return active listings for this spec
-        listings = obj.listings.filter(enabled=True, vendor__status="approved", vendor__is_active=True)
         return [
             {
                 "id": str(l.id),
@@ -18,11 +126,25 @@ class UniformSpecSerializer(serializers.ModelSerializer[UniformSpec]):
                 "sku": l.sku,
                 "lead_time_days": l.lead_time_days,
             }
-            for l in listings
+            for l in self.active_listings(obj)
         ]
 
+    def to_representation(self, instance: UniformSpec) -> dict:
+        frozen_data = getattr(instance, "frozen_data", None)
+        if frozen_data is None:
+            return super().to_representation(instance)
+        values = {
+            **frozen_data,
+            "school_name": instance.school.name,
+            "price_summary": self.get_price_summary(instance),
+        }
+        if not self.context.get("summary"):
+            values["listings"] = self.get_listings(instance)
+        return {field: values[field] for field in catalog_fields(self.context)}
+
     class Meta:
         model = UniformSpec
+        list_serializer_class = FrozenSpecListSerializer
         fields = [
             "id",
             "school",
@@ -38,8 +160,60 @@ class UniformSpecSerializer(serializers.ModelSerializer[UniformSpec]):
             "measurements",
             "frozen",
             "version",
+            "price_summary",
             "listings",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+
+class UniformSpecDetailSerializer(serializers.ModelSerializer[UniformSpec]):
+    """A spec's own fields, without the school name or live listing data"""
+
+    class Meta:
+        model = UniformSpec
+        fields = [
+            field
+            for field in UniformSpecSerializer.Meta.fields
+            if field not in LIVE_FIELDS
+        ]
+        read_only_fields = fields
+
+
+def get_frozen_spec_data(specs: list[UniformSpec]) -> dict:
+    """Map frozen specs' ids to their cached detail representation.
+
+    Misses are serialized and cached with no timeout; entries are dropped
+    when a spec is saved (see catalog.signals).
+    """
+    keys = {frozen_spec_cache_key(spec.pk): spec for spec in specs}
+    found = cache.get_many(list(keys))
+    missing = {
+        key: dict(UniformSpecDetailSerializer(spec).data)
+        for key, spec in keys.items()
+        if key not in found
+    }
+    if missing:
+        cache.set_many(missing, timeout=FROZEN_SPEC_CACHE_TIMEOUT)
+    return {spec.pk: found.get(key) or missing[key] for key, spec in keys.items()}
+
+
+class CatalogEntrySerializer(serializers.ModelSerializer[CatalogEntry]):
+    """Serve a read-model row in the same shape as UniformSpecSerializer"""
+
+    class Meta:
+        model = CatalogEntry
+        fields = UniformSpecSerializer.Meta.fields
+
+    def to_representation(self, instance: CatalogEntry) -> dict:
+        values = {
+            **instance.data,
+            "school_name": instance.school_name,
+            "price_summary": format_price_summary(
+                {field: getattr(instance, field) for field in PRICE_SUMMARY_FIELDS}
+            ),
+        }
+        if not self.context.get("summary"):
+            values["listings"] = instance.listings
+        return {field: values[field] for field in catalog_fields(self.context)}
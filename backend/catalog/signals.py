@@ -0,0 +1,102 @@
+"""
+Keep catalog caches and the CatalogEntry read model in step with writes.
+
+Read-model rows are refreshed inside the writing transaction; cache
+generations are bumped once it commits.
+"""
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from schools.models import School
+from schools.signals import schools_imported
+from vendors.models import Listing, Vendor, VendorApproval
+from vendors.signals import listing_visibility_changed
+from .cache import forget_frozen_spec, invalidate_catalogs
+from .history import record_revision
+from .models import UniformSpec
+from .read_model import refresh_catalog_entries, refresh_school_name, refresh_school_names
+
+
+@receiver(post_save, sender=UniformSpec)
+def spec_saved(sender: Any, instance: UniformSpec, **kwargs: Any) -> None:
+    record_revision(instance)
+    refresh_catalog_entries([instance.pk])
+    invalidate_catalogs([instance.school_id])
+    # Also covers a spec being unfrozen, so check no flag here
+    forget_frozen_spec(instance.pk)
+
+
+@receiver(post_delete, sender=UniformSpec)
+def spec_deleted(sender: Any, instance: UniformSpec, **kwargs: Any) -> None:
+    # The read-model row is removed by the cascade
+    invalidate_catalogs([instance.school_id])
+    forget_frozen_spec(instance.pk)
+
+
+@receiver(pre_save, sender=Listing)
+def remember_listing_placement(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    # A listing moved to another spec (or school) must leave the old entry
+    instance._previous_placement = (
+        None
+        if instance._state.adding
+        else Listing.objects.filter(pk=instance.pk).values_list("spec_id", "school_id").first()
+    )
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def listing_changed(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    spec_ids, school_ids = {instance.spec_id}, {instance.school_id}
+    if previous := getattr(instance, "_previous_placement", None):
+        spec_ids.add(previous[0])
+        school_ids.add(previous[1])
+    refresh_catalog_entries(spec_ids)
+    invalidate_catalogs(school_ids)
+
+
+@receiver(post_save, sender=VendorApproval)
+@receiver(post_delete, sender=VendorApproval)
+def approval_changed(sender: Any, instance: VendorApproval, **kwargs: Any) -> None:
+    refresh_catalog_entries(
+        Listing.objects.filter(vendor_id=instance.vendor_id, school_id=instance.school_id)
+        .values_list("spec_id", flat=True)
+        .distinct()
+    )
+    invalidate_catalogs([instance.school_id])
+
+
+@receiver(post_save, sender=School)
+def school_saved(sender: Any, instance: School, created: bool, **kwargs: Any) -> None:
+    # Catalog entries embed the school name
+    if not created:
+        refresh_school_name(instance.pk, instance.name)
+    invalidate_catalogs([instance.pk])
+
+
+@receiver(post_delete, sender=School)
+def school_deleted(sender: Any, instance: School, **kwargs: Any) -> None:
+    invalidate_catalogs([instance.pk])
+
+
+@receiver(schools_imported)
+def schools_imported_catalogs(
+    sender: Any, schools: list[dict[str, Any]], **kwargs: Any
+) -> None:
+    # New schools have no catalog yet
+    school_ids = [school["id"] for school in schools if not school["created"]]
+    refresh_school_names(school_ids)
+    invalidate_catalogs(school_ids)
+
+
+@receiver(post_save, sender=Vendor)
+def vendor_saved(sender: Any, instance: Vendor, **kwargs: Any) -> None:
+    # Vendor status and name decide which listings are shown, and how;
+    # other edits leave the catalog as it was
+    if not listing_visibility_changed(instance):
+        return
+    listings = Listing.objects.filter(vendor_id=instance.pk)
+    refresh_catalog_entries(listings.values_list("spec_id", flat=True).distinct())
+    invalidate_catalogs(listings.values_list("school_id", flat=True).distinct())
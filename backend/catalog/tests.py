@@ -1,11 +1,19 @@
 from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
+from config.cache import peek_generations
 from schools.models import School
-from .models import UniformSpec
+from vendors.cache import vendor_listings_generation
+from vendors.models import Vendor, Listing
+from .cache import catalog_scope
+from .models import CatalogEntry, UniformSpec
 
 User = get_user_model()
 
@@ -123,10 +131,13 @@ class CatalogTests(APITestCase):
         response1 = self.client.get(url)
         self.assertEqual(response1.status_code, status.HTTP_200_OK)
 
-        # Second request - should come from cache
-        response2 = self.client.get(url)
+        # Second request - should come from cache as pre-rendered JSON
+        with self.assertNumQueries(0):
+            response2 = self.client.get(url)
         self.assertEqual(response2.status_code, status.HTTP_200_OK)
-        self.assertEqual(response1.data, response2.data)
+        self.assertEqual(response2["Content-Type"], "application/json")
+        self.assertEqual(response1.json(), response2.json())
+
 
     def test_catalog_unauthenticated(self):
         """Test that unauthenticated users cannot access catalog"""
@@ -147,3 +158,1044 @@ class CatalogTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # No never-expiring generation key is created for a made-up id
+        self.assertEqual(peek_generations([catalog_scope(fake_school_id)]), {})
+
+    def _create_listing(self, spec, vendor, sku, **kwargs):
+        return Listing.objects.create(
+            vendor=vendor,
+            school=self.school,
+            spec=spec,
+            sku=sku,
+            base_price=kwargs.pop("base_price", Decimal("100.00")),
+            mrp=kwargs.pop("mrp", Decimal("120.00")),
+            lead_time_days=kwargs.pop("lead_time_days", 5),
+            **kwargs,
+        )
+
+    def test_catalog_embeds_only_active_listings(self):
+        """Test catalog embeds enabled listings of approved, active vendors only"""
+        approved = Vendor.objects.create(
+            official_name="Approved Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        pending = Vendor.objects.create(
+            official_name="Pending Vendor", city="Mumbai", status="pending"
+        )
+        self._create_listing(self.spec_pants, approved, "PANTS-1")
+        self._create_listing(self.spec_pants, approved, "PANTS-2", enabled=False)
+        self._create_listing(self.spec_pants, pending, "PANTS-3")
+
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        response = self.client.get(url, {"item_type": "pants"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        listings = response.data["results"][0]["listings"]
+        self.assertEqual([listing["sku"] for listing in listings], ["PANTS-1"])
+        self.assertEqual(listings[0]["vendor_name"], "Approved Vendor")
+
+    def test_catalog_query_count_constant(self):
+        """Test catalog query count does not grow with spec or listing count"""
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        vendors = [
+            Vendor.objects.create(
+                official_name=f"Vendor {i}", city="Mumbai", status="approved", is_active=True
+            )
+            for i in range(3)
+        ]
+
+        # school lookup, count, page of specs, batched listings prefetch
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        for i in range(15):
+            spec = UniformSpec.objects.create(
+                school=self.school,
+                academic_year="2025-2026",
+                description="Bulk Description",
+                item_type=f"item-{i}",
+                item_name=f"Item {i}",
+                gender="boys",
+                season="winter",
+                fabric_gsm=200,
+                pantone="PMS 100C",
+                measurements={"chest": "34"},
+            )
+            for vendor in vendors:
+                self._create_listing(spec, vendor, f"SKU-{i}-{vendor.id}")
+
+        cache.clear()
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 18)
+        self.assertEqual(
+            sum(len(item["listings"]) for item in response.data["results"]), 45
+        )
+
+    def test_catalog_cache_invalidated_on_listing_write(self):
+        """Test cached catalog reflects listing writes immediately"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        params = {"item_type": "pants"}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["results"][0]["listings"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            listing = self._create_listing(self.spec_pants, vendor, "PANTS-1")
+        response = self.client.get(url, params)
+        self.assertEqual(len(response.data["results"][0]["listings"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            listing.enabled = False
+            listing.save()
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["results"][0]["listings"], [])
+
+    def test_catalog_cache_invalidated_on_vendor_status_change(self):
+        """Test cached catalog drops listings of a vendor that loses approval"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_pants, vendor, "PANTS-1")
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        params = {"item_type": "pants"}
+
+        response = self.client.get(url, params)
+        self.assertEqual(len(response.data["results"][0]["listings"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            vendor.status = "rejected"
+            vendor.save()
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["results"][0]["listings"], [])
+
+    def test_catalog_cache_not_invalidated_before_commit(self):
+        """Test generation bumps wait for the write's transaction to commit"""
+        from .cache import catalog_cache_key
+
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        self.client.get(url)
+        cache_key = catalog_cache_key(self.school.id)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            UniformSpec.objects.get(pk=self.spec_pants.pk).save()
+        self.assertEqual(catalog_cache_key(self.school.id), cache_key)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(catalog_cache_key(self.school.id), cache_key)
+
+    def test_catalog_entry_maintained_on_write(self):
+        """Test read-model rows follow spec, listing and vendor writes"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_pants, vendor, "PANTS-1", base_price=Decimal("90.00"))
+        self._create_listing(self.spec_pants, vendor, "PANTS-2", base_price=Decimal("150.00"))
+
+        entry = CatalogEntry.objects.get(spec=self.spec_pants)
+        self.assertEqual(entry.school_name, "Test School")
+        self.assertEqual(
+            [listing["sku"] for listing in entry.listings], ["PANTS-1", "PANTS-2"]
+        )
+        self.assertEqual(entry.min_price, Decimal("90.00"))
+        self.assertEqual(entry.max_price, Decimal("150.00"))
+        self.assertEqual(entry.listing_count, 2)
+
+        vendor.is_active = False
+        vendor.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.listings, [])
+        self.assertIsNone(entry.min_price)
+
+        self.school.name = "Renamed School"
+        self.school.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.school_name, "Renamed School")
+
+    def test_catalog_entry_follows_moved_listing(self):
+        """Test a listing moved to another spec leaves the old spec's entry"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        listing = self._create_listing(self.spec_pants, vendor, "PANTS-1")
+
+        listing.spec = self.spec_shirt_boys
+        listing.save()
+
+        self.assertEqual(CatalogEntry.objects.get(spec=self.spec_pants).listings, [])
+        self.assertEqual(
+            [item["sku"] for item in CatalogEntry.objects.get(spec=self.spec_shirt_boys).listings],
+            ["PANTS-1"],
+        )
+
+    def test_catalog_entry_skips_vendor_profile_edits(self):
+        """Test vendor edits that do not change how listings show leave entries alone"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_pants, vendor, "PANTS-1")
+        refreshed_at = CatalogEntry.objects.get(spec=self.spec_pants).refreshed_at
+
+        vendor.phone = "+919999999999"
+        vendor.save()
+        self.assertEqual(CatalogEntry.objects.get(spec=self.spec_pants).refreshed_at, refreshed_at)
+
+        vendor.official_name = "Renamed Vendor"
+        vendor.save()
+        entry = CatalogEntry.objects.get(spec=self.spec_pants)
+        self.assertEqual(entry.listings[0]["vendor_name"], "Renamed Vendor")
+
+    def test_catalog_served_from_read_model(self):
+        """Test read-model catalog matches the live catalog in one lookup"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_shirt_boys, vendor, "SHIRT-1")
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        live = self.client.get(url).json()
+        cache.clear()
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            # school lookup, count, page of entries
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        def by_id(item):
+            return item["id"]
+
+        self.assertEqual(
+            sorted(response.json()["results"], key=by_id),
+            sorted(live["results"], key=by_id),
+        )
+
+    def test_rebuild_catalog_command(self):
+        """Test rebuild_catalog recreates every read-model row"""
+        CatalogEntry.objects.all().delete()
+
+        call_command("rebuild_catalog", stdout=StringIO())
+
+        self.assertEqual(
+            CatalogEntry.objects.filter(school=self.school).count(),
+            UniformSpec.objects.filter(school=self.school).count(),
+        )
+
+    def test_catalog_conditional_get(self):
+        """Test catalog answers a matching If-None-Match with 304 and no queries"""
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UniformSpec.objects.get(pk=self.spec_pants.pk).save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def _create_spec_version(self, spec, version):
+        return UniformSpec.objects.create(
+            school=spec.school,
+            academic_year=spec.academic_year,
+            description=f"{spec.description} v{version}",
+            item_type=spec.item_type,
+            item_name=spec.item_name,
+            gender=spec.gender,
+            season=spec.season,
+            fabric_gsm=spec.fabric_gsm,
+            pantone=spec.pantone,
+            measurements=spec.measurements,
+            version=version,
+        )
+
+    def test_catalog_latest_only(self):
+        """Test ?latest=true returns only the newest version of each item"""
+        shirt_v2 = self._create_spec_version(self.spec_shirt_boys, 2)
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 4)
+
+        response = self.client.get(url, {"latest": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = {item["id"] for item in response.data["results"]}
+        self.assertEqual(
+            ids,
+            {str(shirt_v2.id), str(self.spec_pants.id), str(self.spec_shirt_girls.id)},
+        )
+
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            response = self.client.get(url, {"latest": "true", "item_type": "shirt"})
+        ids = {item["id"] for item in response.data["results"]}
+        self.assertEqual(ids, {str(shirt_v2.id), str(self.spec_shirt_girls.id)})
+
+    @override_settings(CATALOG_LATEST_ONLY_DEFAULT=True)
+    def test_catalog_latest_only_default(self):
+        """Test the latest-only default can be overridden with ?latest=false"""
+        self._create_spec_version(self.spec_shirt_boys, 2)
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        self.assertEqual(self.client.get(url).data["count"], 3)
+        self.assertEqual(self.client.get(url, {"latest": "false"}).data["count"], 4)
+
+    def test_latest_versions_uses_index(self):
+        """Test the DISTINCT ON subquery can be served by its matching index"""
+        from django.db import connection
+        from .queries import latest_versions
+
+        queryset = latest_versions(UniformSpec.objects.filter(school=self.school))
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_spec_latest_version", plan)
+
+    def test_catalog_keyset_pagination(self):
+        """Test the catalog can be walked newest first with a cursor"""
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        seen = []
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            seen,
+            [
+                str(spec.id)
+                for spec in UniformSpec.objects.filter(school=self.school).order_by(
+                    "-created_at", "-id"
+                )
+            ],
+        )
+
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            response = self.client.get(url, {"pagination": "cursor", "page_size": 10})
+        self.assertEqual([item["id"] for item in response.data["results"]], seen)
+
+    def test_catalog_facets(self):
+        """Test facet counts per item type, gender, season and price band"""
+        vendor = Vendor.objects.create(
+            official_name="Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_pants, vendor, "PANTS-1", base_price=Decimal("650.00"))
+        self._create_listing(self.spec_pants, vendor, "PANTS-2", base_price=Decimal("2500.00"))
+        self._create_listing(self.spec_shirt_boys, vendor, "SHIRT-1", base_price=Decimal("300.00"))
+        self._create_spec_version(self.spec_shirt_girls, 2)
+        url = reverse("school-catalog-facets", kwargs={"school_id": self.school.id})
+
+        # school lookup, one GROUPING SETS query
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "item_type": {"shirt": 3, "pants": 1},
+                "gender": {"boys": 2, "girls": 2},
+                "season": {"summer": 4},
+                "price_band": {"under_500": 1, "500_1000": 1, "unlisted": 2},
+            },
+        )
+
+        response = self.client.get(url, {"latest": "true"})
+        self.assertEqual(response.data["item_type"], {"shirt": 2, "pants": 1})
+
+        # Served from the cache alongside the catalog, whatever filters,
+        # ordering or page the catalog view is showing
+        with self.assertNumQueries(0):
+            self.client.get(url)
+            self.client.get(url, {"item_type": "shirt", "ordering": "-version", "page": 2})
+
+    def test_catalog_facets_nonexistent_school(self):
+        """Test facets for non-existent school returns 404"""
+        import uuid
+
+        url = reverse("school-catalog-facets", kwargs={"school_id": uuid.uuid4()})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_catalog_search(self):
+        """Test ?q= full-text search ranks item name matches first"""
+        blazer = UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Navy wool blend",
+            item_type="blazer",
+            item_name="School Blazer",
+            gender="boys",
+            season="winter",
+            fabric_gsm=300,
+            pantone="PMS 533C",
+            measurements={},
+        )
+        sweater = UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Worn under the blazers in winter",
+            item_type="sweater",
+            item_name="V-neck Sweater",
+            gender="boys",
+            season="winter",
+            fabric_gsm=250,
+            pantone="PMS 533C",
+            measurements={},
+        )
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        response = self.client.get(url, {"q": "blazer"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [str(blazer.id), str(sweater.id)],
+        )
+
+        response = self.client.get(url, {"q": "533C"})
+        self.assertEqual(response.data["count"], 2)
+
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            response = self.client.get(url, {"q": "sweater"})
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(sweater.id)])
+
+    def test_catalog_search_uses_gin_index(self):
+        """Test spec search can be served by the tsvector GIN index"""
+        from django.db import connection
+        from .queries import search_specs
+
+        queryset = search_specs(UniformSpec.objects.all(), "shirt")
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_spec_search_vector", plan)
+
+    def test_catalog_measurement_filters(self):
+        """Test ?measurements.<key>__<lookup>= filters on numeric and text values"""
+        blazer = UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="blazer",
+            item_name="School Blazer",
+            gender="boys",
+            season="winter",
+            fabric_gsm=300,
+            pantone="PMS 533C",
+            measurements={"chest": 40, "size": "L"},
+        )
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        def ids(params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {item["id"] for item in response.json()["results"]}
+
+        # Numbers and numeric strings compare numerically
+        self.assertEqual(
+            ids({"measurements.chest__gte": "32"}),
+            {str(self.spec_shirt_boys.id), str(blazer.id)},
+        )
+        self.assertEqual(ids({"measurements.chest__gt": "36"}), {str(blazer.id)})
+        self.assertEqual(
+            ids({"measurements.chest__gte": "30", "measurements.chest__lte": "38"}),
+            {str(self.spec_shirt_boys.id)},
+        )
+        self.assertEqual(ids({"measurements.chest": "36.0"}), {str(self.spec_shirt_boys.id)})
+        self.assertEqual(ids({"measurements.size": "L"}), {str(blazer.id)})
+        self.assertEqual(ids({"measurements.waist__lt": "100"}), set())
+
+        cache.clear()
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            self.assertEqual(ids({"measurements.chest__gt": "36"}), {str(blazer.id)})
+            self.assertEqual(ids({"measurements.size": "L"}), {str(blazer.id)})
+
+    def test_catalog_measurement_filter_requires_number_for_ranges(self):
+        """Test range lookups on a non-numeric value are rejected"""
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        response = self.client.get(url, {"measurements.chest__gte": "large"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("measurements.chest__gte", response.data)
+
+    def test_catalog_measurement_filter_rejects_out_of_range_numbers(self):
+        """Test numbers Postgres cannot compare are rejected rather than failing"""
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        for param, value in (
+            ("measurements.chest__gte", "1e1000000"),
+            ("measurements.chest__lt", "1e-1000000"),
+            ("measurements.chest", "1" * 40),
+        ):
+            response = self.client.get(url, {param: value})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(param, response.data)
+
+    def test_measurement_filters_use_indexes(self):
+        """Test measurement filters can be served by their indexes"""
+        from django.db import connection
+        from .filters import MeasurementFilter
+
+        measurement_filter = MeasurementFilter()
+        # Unordered, so the plan reflects the filter rather than the sort
+        specs = UniformSpec.objects.filter(school=self.school).order_by()
+        numeric = specs.filter(
+            measurement_filter.build_condition("measurements", "chest", "gte", "32")
+        )
+        contains = UniformSpec.objects.order_by().filter(
+            measurement_filter.build_condition("measurements", "size", "exact", "L")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            numeric_plan = numeric.explain()
+            contains_plan = contains.explain()
+
+        self.assertIn("idx_spec_measure_chest", numeric_plan)
+        self.assertIn("idx_spec_measurements", contains_plan)
+
+    def test_spec_detail(self):
+        """Test the spec detail endpoint omits listings and must be revalidated"""
+        url = reverse("spec-detail", kwargs={"pk": self.spec_shirt_boys.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], str(self.spec_shirt_boys.id))
+        self.assertNotIn("listings", response.data)
+        self.assertNotIn("school_name", response.data)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_frozen_spec_detail_cached_immutably(self):
+        """Test frozen specs are cached indefinitely and served as immutable"""
+        from .cache import frozen_spec_cache_key
+
+        spec = UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="tie",
+            item_name="School Tie",
+            gender="boys",
+            season="summer",
+            fabric_gsm=120,
+            pantone="PMS 287C",
+            measurements={},
+            frozen=True,
+        )
+        url = reverse("spec-detail", kwargs={"pk": spec.id})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+        self.assertIsNotNone(cache.get(frozen_spec_cache_key(spec.id)))
+
+        # Served from the frozen namespace without touching the database
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.data, response.data)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn("immutable", response["Cache-Control"])
+
+        # Saving the spec (here: unfreezing it) drops the cached copy
+        spec.frozen = False
+        with self.captureOnCommitCallbacks(execute=True):
+            spec.save()
+        self.assertIsNone(cache.get(frozen_spec_cache_key(spec.id)))
+
+        response = self.client.get(url)
+        self.assertFalse(response.data["frozen"])
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_catalog_reuses_frozen_spec_cache(self):
+        """Test the catalog serves frozen specs' static fields from their cache"""
+        from .cache import frozen_spec_cache_key
+        from .serializers import UniformSpecSerializer
+
+        UniformSpec.objects.filter(id=self.spec_shirt_boys.id).update(frozen=True)
+        spec = UniformSpec.objects.get(id=self.spec_shirt_boys.id)
+        vendor = Vendor.objects.create(
+            official_name="Approved Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(spec, vendor, "SHIRT-1")
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        response = self.client.get(url, {"item_type": "shirt", "gender": "boys"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(cache.get(frozen_spec_cache_key(spec.id)))
+        # Same shape and values as a freshly serialized spec, live listings included
+        self.assertEqual(
+            list(response.data["results"][0].items()),
+            list(UniformSpecSerializer(spec).data.items()),
+        )
+        self.assertEqual(len(response.data["results"][0]["listings"]), 1)
+
+    def test_catalog_price_summary(self):
+        """Test each spec is annotated with a summary of its active listings"""
+        fast = Vendor.objects.create(
+            official_name="Fast Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        cheap = Vendor.objects.create(
+            official_name="Cheap Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        pending = Vendor.objects.create(
+            official_name="Pending Vendor", city="Mumbai", status="pending"
+        )
+        self._create_listing(
+            self.spec_pants, fast, "PANTS-1", base_price=Decimal("650.00"),
+            mrp=Decimal("700.00"), lead_time_days=2,
+        )
+        self._create_listing(
+            self.spec_pants, cheap, "PANTS-2", base_price=Decimal("480.00"),
+            mrp=Decimal("720.00"), lead_time_days=9,
+        )
+        self._create_listing(
+            self.spec_pants, cheap, "PANTS-3", base_price=Decimal("100.00"), enabled=False
+        )
+        self._create_listing(
+            self.spec_pants, pending, "PANTS-4", base_price=Decimal("50.00"), lead_time_days=1
+        )
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        expected = {
+            "min_price": "480.00",
+            "max_price": "650.00",
+            "min_mrp": "700.00",
+            "vendor_count": 2,
+            "min_lead_time_days": 2,
+        }
+        unlisted = {
+            "min_price": None,
+            "max_price": None,
+            "min_mrp": None,
+            "vendor_count": 0,
+            "min_lead_time_days": None,
+        }
+
+        for read_model in (False, True):
+            cache.clear()
+            with override_settings(CATALOG_SERVE_FROM_READ_MODEL=read_model):
+                response = self.client.get(url, {"item_type": "pants"})
+                shirts = self.client.get(url, {"item_type": "shirt"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["results"][0]["price_summary"], expected)
+            self.assertEqual(shirts.data["results"][0]["price_summary"], unlisted)
+
+    def test_catalog_summary_mode(self):
+        """Test ?summary=true drops embedded listings and their prefetch"""
+        vendor = Vendor.objects.create(
+            official_name="Approved Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(self.spec_pants, vendor, "PANTS-1")
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+
+        # school lookup, count, page of specs with their summaries
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"summary": "true", "item_type": "pants"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = response.json()["results"][0]
+        self.assertNotIn("listings", item)
+        self.assertEqual(item["price_summary"]["vendor_count"], 1)
+
+        cache.clear()
+        with override_settings(CATALOG_SERVE_FROM_READ_MODEL=True):
+            response = self.client.get(url, {"summary": "true", "item_type": "pants"})
+        self.assertEqual(response.json()["results"][0], item)
+
+    def test_warm_catalogs_command(self):
+        """Test warm_catalogs fills the catalog, facet and school caches"""
+        from django.conf import settings
+        from schools.cache import school_cache_key
+        from .cache import catalog_cache_key, facets_cache_key
+
+        out = StringIO()
+        call_command("warm_catalogs", "--workers", "1", "--rate", "0", stdout=out)
+
+        self.assertIn("Warmed 1/1 schools", out.getvalue())
+        for key in (
+            catalog_cache_key(self.school.id),
+            catalog_cache_key(self.school.id, "summary=true"),
+            facets_cache_key(self.school.id, latest=settings.CATALOG_LATEST_ONLY_DEFAULT),
+            school_cache_key(self.school.id),
+        ):
+            self.assertIsNotNone(cache.get(key), key)
+
+        # Warmed responses are served without touching the database
+        url = reverse("school-catalog", kwargs={"school_id": self.school.id})
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_warm_catalogs_recent_orders_only(self):
+        """Test --recent-orders skips schools without recent orders"""
+        out = StringIO()
+        call_command("warm_catalogs", "--recent-orders", "7", "--workers", "1", stdout=out)
+
+        self.assertIn("Warming caches for 0 schools", out.getvalue())
+
+    def test_batch_catalog(self):
+        """Test catalogs of several schools come back in one keyed response"""
+        import uuid
+
+        other_school = School.objects.create(
+            name="Other School",
+            code="SCH-002",
+            city="Pune",
+            address="456 Test St",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        missing_id = str(uuid.uuid4())
+        url = reverse("catalog-batch")
+        params = {"school_ids": f"{self.school.id},{other_school.id},{missing_id}"}
+
+        # schools without a generation yet, then schools, specs of every
+        # missing school, their listings
+        with self.assertNumQueries(4):
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(list(data["catalogs"]), [str(self.school.id), str(other_school.id)])
+        self.assertEqual(data["not_found"], [missing_id])
+        self.assertEqual(peek_generations([catalog_scope(missing_id)]), {})
+        catalog = data["catalogs"][str(self.school.id)]
+        self.assertEqual(catalog["school_name"], "Test School")
+        self.assertEqual(catalog["count"], 3)
+        self.assertEqual(
+            catalog["results"],
+            self.client.get(
+                reverse("school-catalog", kwargs={"school_id": self.school.id}),
+                {"ordering": "item_type,-version"},
+            ).json()["results"],
+        )
+        self.assertEqual(data["catalogs"][str(other_school.id)]["count"], 0)
+
+        # Known catalogs now come from one MGET; only the unknown id is
+        # looked up again
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, params)
+        self.assertEqual(cached.json(), data)
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=cached["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A write to one school only rebuilds that school's catalog (plus
+        # the lookup of the unknown id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.spec_pants.delete()
+        with self.assertNumQueries(4):
+            response = self.client.get(url, params)
+        self.assertEqual(response.json()["catalogs"][str(self.school.id)]["count"], 2)
+
+    def test_batch_catalog_validates_school_ids(self):
+        """Test batch catalog rejects missing, malformed and too many ids"""
+        import uuid
+        from .views import MAX_BATCH_SCHOOLS
+
+        url = reverse("catalog-batch")
+        too_many = ",".join(str(uuid.uuid4()) for _ in range(MAX_BATCH_SCHOOLS + 1))
+        for school_ids in ("", "not-a-uuid", too_many):
+            response = self.client.get(url, {"school_ids": school_ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("school_ids", response.data)
+
+    def test_rollover_clones_latest_versions(self):
+        """Test rollover clones each item's latest spec into the next year once"""
+        ops = User.objects.create_user(
+            email="ops@example.com", password="password123", role="ops"
+        )
+        self.client.force_authenticate(user=ops)
+        newer_pants = self._create_spec_version(self.spec_pants, 2)
+        newer_pants.measurements = {"waist": "30"}
+        newer_pants.save()
+        vendor = Vendor.objects.create(
+            official_name="Rollover Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        self._create_listing(newer_pants, vendor, "PANTS-NEW")
+        self._create_listing(newer_pants, vendor, "PANTS-OFF", enabled=False)
+        self._create_listing(self.spec_pants, vendor, "PANTS-OLD")
+
+        url = reverse("catalog-rollover")
+        payload = {
+            "school_ids": [str(self.school.id)],
+            "from_year": "2025-2026",
+            "carry_listings": True,
+        }
+        generation = vendor_listings_generation(vendor.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Cached listings of vendors whose listings were carried are dropped
+        self.assertNotEqual(vendor_listings_generation(vendor.id), generation)
+        self.assertEqual(
+            response.data,
+            {"from_year": "2025-2026", "to_year": "2026-2027", "specs": 3, "listings": 1},
+        )
+        clone = UniformSpec.objects.get(academic_year="2026-2027", item_type="pants")
+        self.assertEqual(clone.version, 3)
+        self.assertFalse(clone.frozen)
+        self.assertEqual(clone.measurements, {"waist": "30"})
+        self.assertEqual(
+            list(clone.listings.values_list("sku", "enabled")), [("PANTS-NEW", True)]
+        )
+        self.assertTrue(CatalogEntry.objects.filter(spec=clone).exists())
+        self.assertEqual(clone.revisions.get().snapshot["version"], 3)
+
+        # Re-running skips items already in the new year
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.data["specs"], 0)
+        self.assertEqual(UniformSpec.objects.filter(academic_year="2026-2027").count(), 3)
+
+    def test_rollover_requires_ops_and_a_valid_year(self):
+        """Test rollover is ops-only and rejects years it cannot advance"""
+        url = reverse("catalog-rollover")
+        payload = {"school_ids": [str(self.school.id)], "from_year": "2025"}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        ops = User.objects.create_user(
+            email="ops@example.com", password="password123", role="ops"
+        )
+        self.client.force_authenticate(user=ops)
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("to_year", response.data)
+
+        response = self.client.post(
+            url, {**payload, "to_year": "2025"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rollover_specs_command(self):
+        """Test rollover_specs rolls every active school over in batches"""
+        other_school = School.objects.create(
+            name="Other School",
+            code="SCH-002",
+            city="Pune",
+            address="456 Test St",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        UniformSpec.objects.create(
+            school=other_school,
+            academic_year="2025-2026",
+            description="Tie",
+            item_type="tie",
+            item_name="Tie",
+            gender="unisex",
+            season="all",
+            fabric_gsm=150,
+            pantone="PMS 281C",
+            measurements={},
+            version=1,
+        )
+        out = StringIO()
+
+        call_command(
+            "rollover_specs", "--from-year", "2025-2026", "--batch-size", "1", stdout=out
+        )
+
+        self.assertIn("Created 4 specs and 0 listings in 2026-2027", out.getvalue())
+        self.assertEqual(
+            UniformSpec.objects.filter(
+                academic_year="2026-2027", school=other_school
+            ).count(),
+            1,
+        )
+
+    def test_spec_history_records_changes_and_snapshots(self):
+        """Test spec edits are kept as diffs with periodic full snapshots"""
+        from django.utils import timezone
+        from .history import SPEC_SNAPSHOT_INTERVAL, spec_state, specs_as_of
+        from .models import SpecRevision
+
+        spec = self.spec_shirt_boys
+        states = {1: spec_state(spec)}
+        moments = {1: timezone.now()}
+        for number in range(2, 2 * SPEC_SNAPSHOT_INTERVAL + 3):
+            spec.measurements = {**spec.measurements, "chest": str(30 + number)}
+            if number == 5:
+                spec.measurements.pop("length")
+                spec.description = "Revised Description"
+            spec.save()
+            states[number] = spec_state(spec)
+            moments[number] = timezone.now()
+
+        # An unchanged save records nothing
+        spec.save()
+
+        revisions = SpecRevision.objects.filter(spec=spec)
+        self.assertEqual(revisions.count(), 2 * SPEC_SNAPSHOT_INTERVAL + 2)
+        self.assertEqual(
+            list(revisions.filter(snapshot__isnull=False).values_list("revision", flat=True)),
+            [1, SPEC_SNAPSHOT_INTERVAL + 1, 2 * SPEC_SNAPSHOT_INTERVAL + 1],
+        )
+        self.assertEqual(
+            revisions.get(revision=2).changes,
+            {"measurements_patch": {"set": {"chest": "32"}, "unset": []}},
+        )
+
+        for number, state in states.items():
+            with self.assertNumQueries(1):
+                as_of = specs_as_of([spec.pk], moments[number])
+            self.assertEqual(as_of[spec.pk], {**state, "revision": number})
+
+        # Specs without history by then are left out
+        self.assertEqual(specs_as_of([self.spec_pants.pk], date(2000, 1, 1)), {})
+
+    def test_spec_history_as_of_uses_index(self):
+        """Test as-of lookups read revisions through idx_spec_revision_recorded"""
+        from django.db import connection, transaction
+        from django.utils import timezone
+        from .history import REVISIONS_AS_OF_SQL, SPEC_SNAPSHOT_INTERVAL
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(
+                f"EXPLAIN {REVISIONS_AS_OF_SQL}",
+                [[str(self.spec_pants.pk)], timezone.now(), SPEC_SNAPSHOT_INTERVAL],
+            )
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertIn("idx_spec_revision_recorded", plan)
+
+
+class SpecImportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ops_user = User.objects.create_user(
+            email="ops@example.com", password="password123", role="ops"
+        )
+        cls.parent = User.objects.create_user(
+            email="parent@example.com", password="password123", role="parent"
+        )
+        cls.school = School.objects.create(
+            name="Test School",
+            code="SCH-001",
+            city="Mumbai",
+            address="123 Test St",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        cls.shirt = UniformSpec.objects.create(
+            school=cls.school,
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="shirt",
+            item_name="Test Shirt",
+            gender="boys",
+            season="summer",
+            fabric_gsm=180,
+            pantone="PMS 287C",
+            measurements={"chest": "36"},
+            version=2,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.ops_user)
+        self.url = reverse("spec-import")
+
+    def upload(self, name, content, **data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {"file": upload, **data}, format="multipart")
+
+    def test_import_csv(self):
+        """Test rows add versions numbered in SQL, and bad rows are reported"""
+        header = (
+            "school,academic_year,item_type,item_name,gender,season,"
+            "fabric_gsm,pantone,description,measurements\n"
+        )
+        content = header + (
+            'SCH-001,2025-2026,shirt,Test Shirt,boys,summer,200,PMS 287C,Thicker,'
+            '"{""chest"": 36}"\n'
+            "SCH-001,2025-2026,tie,Tie,unisex,all,150,19-4052 TCX,,\n"
+            "SCH-001,2025-2026,belt,Belt,unisex,all,5,PMS 287C,,\n"
+            "SCH-001,2025-2026,sock,Sock,unisex,all,150,not a colour,,\n"
+            'SCH-001,2025-2026,cap,Cap,unisex,all,150,287 C,,"[1, 2]"\n'
+            "SCH-404,2025-2026,cap,Cap,unisex,all,150,287 C,,\n"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload("sheet.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {key: response.data[key] for key in ("created", "updated", "unchanged", "failed")},
+            {"created": 1, "updated": 1, "unchanged": 0, "failed": 4},
+        )
+        self.assertEqual(
+            [(error["line"], list(error["errors"])) for error in response.data["errors"]],
+            [(4, ["fabric_gsm"]), (5, ["pantone"]), (6, ["measurements"]), (7, ["school"])],
+        )
+        shirt = UniformSpec.objects.get(item_type="shirt", version=3)
+        self.assertEqual(
+            (shirt.fabric_gsm, shirt.measurements, shirt.frozen), (200, {"chest": 36}, False)
+        )
+        tie = UniformSpec.objects.get(item_type="tie")
+        self.assertEqual((tie.version, tie.pantone, tie.description), (1, "19-4052 TCX", ""))
+        self.assertTrue(CatalogEntry.objects.filter(spec=tie).exists())
+        self.assertEqual(tie.revisions.get().snapshot["pantone"], "19-4052 TCX")
+
+        # Rows matching the newest version are left alone on a re-run
+        response = self.upload("sheet.csv", content)
+        self.assertEqual((response.data["created"], response.data["unchanged"]), (0, 2))
+        self.assertEqual(UniformSpec.objects.filter(item_type="shirt").count(), 2)
+
+    def test_import_requires_ops(self):
+        """Test only ops and staff can import, and a file and format are required"""
+        response = self.upload("sheet.txt", "school\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("format", response.data)
+
+        self.client.force_authenticate(user=self.parent)
+        response = self.upload("sheet.csv", "school\n")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_specs_command(self):
+        """Test the command imports JSON Lines, repeated items from their last line"""
+        import tempfile
+
+        row = (
+            '{{"school": "SCH-001", "academic_year": "2026-2027", "item_type": "tie", '
+            '"item_name": "Tie", "gender": "unisex", "season": "all", '
+            '"fabric_gsm": {gsm}, "pantone": "Reflex Blue C", "measurements": {{"length": 48}}}}\n'
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as source:
+            source.write(row.format(gsm=140) + row.format(gsm=160))
+            source.flush()
+            out = StringIO()
+            call_command("import_specs", source.name, "--chunk-size", "10", stdout=out)
+
+        self.assertIn("Created 1, updated 0, unchanged 1, failed 0", out.getvalue())
+        tie = UniformSpec.objects.get(item_type="tie")
+        self.assertEqual((tie.fabric_gsm, tie.measurements), (160, {"length": 48}))
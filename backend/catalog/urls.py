@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import CatalogViewSet
+from .views import CatalogViewSet, SpecViewSet, batch_catalog, import_spec_sheet, rollover
 
 urlpatterns = [
     path(
@@ -7,4 +7,17 @@ urlpatterns = [
         CatalogViewSet.as_view({"get": "list"}),
         name="school-catalog",
     ),
+    path(
+        "schools/<uuid:school_id>/catalog/facets",
+        CatalogViewSet.as_view({"get": "facets"}),
+        name="school-catalog-facets",
+    ),
+    path("specs/import", import_spec_sheet, name="spec-import"),
+    path(
+        "specs/<uuid:pk>",
+        SpecViewSet.as_view({"get": "retrieve"}),
+        name="spec-detail",
+    ),
+    path("catalog/batch", batch_catalog, name="catalog-batch"),
+    path("catalog/rollover", rollover, name="catalog-rollover"),
 ]
@@ -1,58 +1,418 @@
-from rest_framework import viewsets
+import io
+import json
+import uuid
+from urllib.parse import urlencode
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.request import Request
+from django.conf import settings
 from django.core.cache import cache
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
+from rest_framework.renderers import JSONRenderer
 from typing import Any
+from config.cache import get_or_compute, peek_generations
+from config.importing import IMPORT_FORMATS, detect_format
+from config.conditional import etag_matches, make_etag, not_modified
+from config.pagination import KeysetPaginationMixin
+from config.responses import cached_json_response, pack_rendered_json, unpack_json
 from schools.models import School
-from .models import UniformSpec
-from .serializers import UniformSpecSerializer
+from vendors.permissions import IsOpsOrStaff
+from .cache import (
+    CATALOG_CACHE_TIMEOUT,
+    catalog_cache_key,
+    catalog_cache_keys,
+    catalog_scope,
+    facets_cache_key,
+    frozen_spec_cache_key,
+)
+from .filters import MeasurementFilter
+from .models import CatalogEntry, UniformSpec
+from .importing import import_specs
+from .rollover import RolloverSerializer, rollover_schools
+from .queries import catalog_facets, latest_versions, search_specs, with_price_summary
+from .serializers import (
+    CatalogEntrySerializer,
+    UniformSpecDetailSerializer,
+    UniformSpecSerializer,
+    active_listings_prefetch,
+    get_frozen_spec_data,
+)
 
+# How long clients may keep a frozen spec (one year). The response is private:
+# specs need authentication, so shared caches must not store them.
+FROZEN_SPEC_MAX_AGE = 60 * 60 * 24 * 365
 
-class CatalogViewSet(viewsets.ReadOnlyModelViewSet[UniformSpec]):
+# Most schools one batch catalog request may ask for
+MAX_BATCH_SCHOOLS = 10
+
+
+def existing_schools(school_ids: list[Any]) -> list[Any]:
+    """The given school ids minus those of schools that do not exist.
+
+    Only schools whose catalog has no generation yet are looked up, so cached
+    catalogs are still answered without the database. Generation keys never
+    expire; checking first keeps requests for made-up ids from creating them.
+    Schools with a generation may since have been deleted, so building their
+    catalog still checks them.
+    """
+    scopes = {school_id: catalog_scope(school_id) for school_id in school_ids}
+    known = peek_generations(scopes.values())
+    unseen = [school_id for school_id, scope in scopes.items() if scope not in known]
+    if not unseen:
+        return school_ids
+    found = School.objects.filter(id__in=unseen).order_by().values_list("id", flat=True)
+    missing = set(unseen) - set(found)
+    return [school_id for school_id in school_ids if school_id not in missing]
+
+
+def require_school(school_id: Any) -> bool:
+    """Raise Http404 if a school whose catalog has no generation yet is unknown.
+
+    Returns whether the school was looked up. Schools with a generation are
+    not: the caller checks them only when it rebuilds their catalog.
+    """
+    if peek_generations([catalog_scope(school_id)]):
+        return False
+    if not School.objects.filter(id=school_id).exists():
+        raise Http404
+    return True
+
+
+def query_flag(request: Request, name: str, default: bool = False) -> bool:
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1", "yes")
+
+
+def catalog_serializer_class() -> type[serializers.BaseSerializer]:
+    if settings.CATALOG_SERVE_FROM_READ_MODEL:
+        return CatalogEntrySerializer
+    return UniformSpecSerializer
+
+
+def catalog_base_queryset(summary: bool = False) -> QuerySet:
+    """Catalog items of all schools, loaded the way the catalog serializers need"""
+    if settings.CATALOG_SERVE_FROM_READ_MODEL:
+        # One row per spec with listings pre-embedded: a single index
+        # lookup on school_id, no joins
+        deferred = ["listing_count", "refreshed_at"]
+        if summary:
+            deferred.append("listings")
+        return CatalogEntry.objects.defer(*deferred)
+
+    # select_related already applied - school is always needed for serializer.
+    # Listings for the whole page are fetched in one prefetch query, so the
+    # query count stays constant regardless of spec/listing count.
+    queryset = UniformSpec.objects.select_related("school").only(
+        "id", "school_id", "academic_year", "description",
+        "item_type", "item_name", "gender", "season",
+        "fabric_gsm", "pantone", "measurements", "frozen",
+        "version", "created_at", "updated_at",
+        "school__name"  # Only load school name for serializer
+    )
+    if summary:
+        return queryset
+    return queryset.prefetch_related(active_listings_prefetch())
+
+
+class CatalogViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet[UniformSpec]):
     serializer_class = UniformSpecSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, MeasurementFilter, OrderingFilter]
     filterset_fields = ["item_type", "gender"]
     ordering_fields = ["item_type", "gender", "version"]
     ordering = ["item_type"]
 
+    def get_serializer_class(self):
+        return catalog_serializer_class()
+
+    def latest_only(self) -> bool:
+        """Whether to return only the newest version of each spec (?latest=)"""
+        return query_flag(self.request, "latest", settings.CATALOG_LATEST_ONLY_DEFAULT)
+
+    def summary_only(self) -> bool:
+        """Whether to leave embedded listings out of the response (?summary=)"""
+        return query_flag(self.request, "summary")
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        context = super().get_serializer_context()
+        context["summary"] = self.summary_only()
+        return context
+
+    def search_text(self) -> str:
+        return self.request.query_params.get("q", "").strip()
+
     def get_queryset(self):
+        queryset = self.get_base_queryset()
+        if self.latest_only():
+            queryset = latest_versions(queryset)
+        if search_text := self.search_text():
+            vector_field = (
+                "spec__search_vector"
+                if settings.CATALOG_SERVE_FROM_READ_MODEL
+                else "search_vector"
+            )
+            queryset = search_specs(queryset, search_text, vector_field)
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Rank search results by relevance unless the client picked an order
+        if self.search_text() and "ordering" not in self.request.query_params:
+            queryset = queryset.order_by("-search_rank", "pk")
+        if not settings.CATALOG_SERVE_FROM_READ_MODEL:
+            # Annotated last so filters and latest_versions() stay plain
+            # WHERE clauses rather than running over the GROUP BY
+            queryset = with_price_summary(queryset)
+        return queryset
+
+    def get_base_queryset(self):
         school_id = self.kwargs.get("school_id")
-        # select_related already applied - school is always needed for serializer
-        return UniformSpec.objects.filter(school_id=school_id).select_related("school").only(
-            "id", "school_id", "item_type", "gender", "season",
-            "fabric_gsm", "pantone", "measurements", "frozen",
-            "version", "created_at", "updated_at",
-            "school__name"  # Only load school name for serializer
-        )
+        return catalog_base_queryset(self.summary_only()).filter(school_id=school_id)
 
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         school_id = kwargs.get("school_id")
+        looked_up = require_school(school_id)
 
-        # Check if school exists
-        get_object_or_404(School, id=school_id)
+        # Build cache key based on query params and the school's catalog
+        # generation, which is bumped whenever the catalog's data changes
+        cache_key = catalog_cache_key(school_id, request.query_params.urlencode())
 
-        # Build cache key based on query params
-        query_params = request.query_params.urlencode()
-        cache_key = (
-            f"catalog:{school_id}:{query_params}"
-            if query_params
-            else f"catalog:{school_id}"
+        # The key identifies this version of the response, so a client holding
+        # its ETag can be answered without touching the database
+        etag = make_etag(cache_key, request.accepted_renderer.format)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        def build() -> Any:
+            # Check if school exists; cached entries outlive it only until
+            # the delete bumps the generation
+            if not looked_up:
+                get_object_or_404(School, id=school_id)
+            return super(CatalogViewSet, self).list(request, *args, **kwargs).data
+
+        # Stored as rendered JSON; one worker rebuilds a missing or expiring
+        # catalog while concurrent requests get the previous copy or wait
+        return cached_json_response(
+            request, cache_key, build, CATALOG_CACHE_TIMEOUT, headers={"ETag": etag}
         )
 
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+    def facets(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Facet counts for the catalog filter sidebar.
+        Counts cover the whole catalog (honouring ?latest=), not the
+        currently applied filters.
+        """
+        school_id = kwargs.get("school_id")
+        looked_up = require_school(school_id)
+        cache_key = facets_cache_key(school_id, self.latest_only(), self.search_text())
+
+        etag = make_etag(cache_key, request.accepted_renderer.format)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        # Get from database
-        response = super().list(request, *args, **kwargs)
+        def build() -> dict:
+            if not looked_up:
+                get_object_or_404(School, id=school_id)
+            return catalog_facets(self.get_queryset())
 
-        # Cache the response
-        cache.set(cache_key, response.data, timeout=60 * 5)
+        data = get_or_compute(cache_key, build, timeout=CATALOG_CACHE_TIMEOUT)
+        return Response(data, headers={"ETag": etag})
 
+
+class SpecViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet[UniformSpec]):
+    """A single spec's own fields, without the live listings of the catalog"""
+
+    serializer_class = UniformSpecDetailSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = UniformSpec.objects.all()
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # Frozen specs are served straight from their cache namespace
+        data = cache.get(frozen_spec_cache_key(kwargs.get("pk")))
+        if data is None:
+            spec = self.get_object()
+            if spec.frozen:
+                data = get_frozen_spec_data([spec])[spec.pk]
+            else:
+                data = self.get_serializer(spec).data
+
+        etag = make_etag("spec", data["id"], data["updated_at"], request.accepted_renderer.format)
+        if etag_matches(request, etag):
+            response = not_modified(etag)
+        else:
+            response = Response(data, headers={"ETag": etag})
+
+        if data["frozen"]:
+            patch_cache_control(
+                response, private=True, max_age=FROZEN_SPEC_MAX_AGE, immutable=True
+            )
+        else:
+            patch_cache_control(response, no_cache=True)
         return response
+
+
+def build_batch_catalogs(
+    school_ids: list[uuid.UUID], latest: bool, summary: bool
+) -> dict[uuid.UUID, dict]:
+    """Build full catalogs for several schools with one query over all of them.
+
+    Schools that do not exist are left out of the result.
+    """
+    schools = dict(School.objects.filter(id__in=school_ids).values_list("id", "name"))
+    if not schools:
+        return {}
+
+    queryset = catalog_base_queryset(summary).filter(school_id__in=schools)
+    if latest:
+        queryset = latest_versions(queryset)
+    if not settings.CATALOG_SERVE_FROM_READ_MODEL:
+        queryset = with_price_summary(queryset)
+    queryset = queryset.order_by("item_type", "-version", "pk")
+
+    items = catalog_serializer_class()(
+        queryset, many=True, context={"summary": summary}
+    ).data
+    results: dict[str, list] = {str(school_id): [] for school_id in schools}
+    for item in items:
+        results[str(item["school"])].append(item)
+
+    return {
+        school_id: {
+            "school_name": name,
+            "count": len(results[str(school_id)]),
+            "results": results[str(school_id)],
+        }
+        for school_id, name in schools.items()
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def batch_catalog(request: Request) -> HttpResponse:
+    """
+    Full catalogs of several schools, e.g. ?school_ids=<id>,<id>.
+
+    Honours ?latest= and ?summary= like the per-school catalog. Cached
+    catalogs are read with one MGET and the rest built with one query across
+    the missing schools; each school's catalog is cached as JSON bytes that
+    are spliced into the response without being decoded.
+    """
+    raw_ids = [value for value in request.query_params.get("school_ids", "").split(",") if value]
+    if not raw_ids:
+        return Response(
+            {"school_ids": "A comma-separated list of school ids is required."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        school_ids = list(dict.fromkeys(uuid.UUID(value) for value in raw_ids))
+    except ValueError:
+        return Response(
+            {"school_ids": "Every school id must be a UUID."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(school_ids) > MAX_BATCH_SCHOOLS:
+        return Response(
+            {"school_ids": f"At most {MAX_BATCH_SCHOOLS} schools per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    latest = query_flag(request, "latest", settings.CATALOG_LATEST_ONLY_DEFAULT)
+    summary = query_flag(request, "summary")
+    found_ids = existing_schools(school_ids)
+    cache_keys = catalog_cache_keys(
+        found_ids, urlencode({"latest": int(latest), "summary": int(summary)}), section="batch"
+    )
+
+    etag = make_etag(*cache_keys.values())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    cached = cache.get_many(list(cache_keys.values()))
+    bodies = {
+        school_id: unpack_json(cached[key])
+        for school_id, key in cache_keys.items()
+        if key in cached
+    }
+
+    missing = [school_id for school_id in found_ids if school_id not in bodies]
+    if missing:
+        renderer = JSONRenderer()
+        built = {
+            school_id: renderer.render(catalog)
+            for school_id, catalog in build_batch_catalogs(missing, latest, summary).items()
+        }
+        cache.set_many(
+            {cache_keys[school_id]: pack_rendered_json(body) for school_id, body in built.items()},
+            timeout=CATALOG_CACHE_TIMEOUT,
+        )
+        bodies.update(built)
+
+    catalogs = b",".join(
+        b'"%s":%s' % (str(school_id).encode(), bodies[school_id])
+        for school_id in school_ids
+        if school_id in bodies
+    )
+    not_found = [str(school_id) for school_id in school_ids if school_id not in bodies]
+    body = b'{"catalogs":{%s},"not_found":%s}' % (catalogs, json.dumps(not_found).encode())
+
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+@api_view(["POST"])
+@permission_classes([IsOpsOrStaff])
+def rollover(request: Request) -> Response:
+    """
+    Clone schools' current specs into the next academic year (admin/ops only).
+    Body: school_ids, from_year, optional to_year and carry_listings. Items
+    already in to_year are skipped, so retries are safe. Roll over every
+    school with the rollover_specs management command.
+    """
+    serializer = RolloverSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    created = rollover_schools(
+        data["school_ids"], data["from_year"], data["to_year"], data["carry_listings"]
+    )
+    return Response(
+        {"from_year": data["from_year"], "to_year": data["to_year"], **created},
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsOpsOrStaff])
+@parser_classes([MultiPartParser])
+def import_spec_sheet(request: Request) -> Response:
+    """
+    Bulk import specs from an uploaded CSV or JSON Lines file (admin/ops only).
+    Each row adds a version of its item and invalid rows are reported by
+    line; see import_specs.
+    """
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"file": "No file was submitted."}, status=status.HTTP_400_BAD_REQUEST)
+    format = request.data.get("format") or detect_format(upload.name or "")
+    if format not in IMPORT_FORMATS:
+        return Response(
+            {"format": f"Pass one of: {', '.join(IMPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Large uploads are spooled to disk; read them back a line at a time
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    report = import_specs(stream, format)
+    return Response(report.as_dict(), status=status.HTTP_200_OK)
@@ -111,6 +111,9 @@ class Order(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "status"], name="idx_order_user_status"),
+            models.Index(
+                fields=["user", "created_at", "id"], name="idx_order_user_created"
+            ),
         ]
 
     def __str__(self) -> str:
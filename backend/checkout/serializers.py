@@ -1,6 +1,8 @@
 from decimal import Decimal
+from typing import Any
 from rest_framework import serializers
 
+from catalog.history import spec_state
 from .models import Cart, CartItem, Order, OrderItem, Payment
 
 
@@ -91,6 +93,30 @@ class OrderSerializer(serializers.ModelSerializer[Order]):
         read_only_fields = ["id", "user", "payment", "total_amount", "created_at", "updated_at"]
 
 
+class OrderItemDetailSerializer(OrderItemSerializer):
+    """An order item with its spec as it was when the order was placed.
+
+    Expects the specs_as_of() states in context["specs"]; specs with no
+    recorded history fall back to their current content.
+    """
+
+    spec = serializers.SerializerMethodField()
+
+    class Meta(OrderItemSerializer.Meta):
+        fields = [*OrderItemSerializer.Meta.fields, "spec"]
+
+    def get_spec(self, obj: OrderItem) -> dict[str, Any]:
+        spec = obj.listing.spec
+        state = self.context.get("specs", {}).get(spec.pk)
+        if state is None:
+            state = {**spec_state(spec), "revision": None}
+        return {"id": str(spec.pk), **state}
+
+
+class OrderDetailSerializer(OrderSerializer):
+    items = OrderItemDetailSerializer(many=True, read_only=True)
+
+
 class WebhookPayloadSerializer(serializers.Serializer):
     provider_ref = serializers.CharField()
     status = serializers.ChoiceField(choices=Payment.STATUS_CHOICES)
@@ -8,7 +8,7 @@ from rest_framework.test import APITestCase
 from schools.models import School
 from catalog.models import UniformSpec
 from vendors.models import Vendor, Listing
-from checkout.models import Cart, CartItem, Payment
+from checkout.models import Cart, CartItem, Payment, Order, OrderItem
 
 User = get_user_model()
 
@@ -269,3 +269,68 @@ class CheckoutTests(APITestCase):
         response2 = self.client.post(url, data, format="json")
         self.assertEqual(response2.status_code, status.HTTP_200_OK)
         self.assertEqual(response2.data["status"], "already_processed")
+
+    def test_list_orders_keyset_pagination(self):
+        """Test orders can be walked page by page with a cursor"""
+        order_ids = set()
+        for _ in range(5):
+            order = Order.objects.create(
+                user=self.user, total_amount=Decimal("120.00"), status="confirmed"
+            )
+            OrderItem.objects.create(
+                order=order,
+                listing=self.listing,
+                qty=1,
+                unit_price=Decimal("120.00"),
+                subtotal=Decimal("120.00"),
+            )
+            order_ids.add(str(order.id))
+
+        url = reverse("orders-list")
+        response = self.client.get(url)
+        self.assertEqual(len(response.data), 5)
+
+        seen = []
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(order["id"] for order in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), order_ids)
+
+    def test_order_detail_shows_spec_as_ordered(self):
+        """Test order detail resolves each item's spec as of the order"""
+        order = Order.objects.create(
+            user=self.user, total_amount=Decimal("120.00"), status="confirmed"
+        )
+        OrderItem.objects.create(
+            order=order,
+            listing=self.listing,
+            qty=1,
+            unit_price=Decimal("120.00"),
+            subtotal=Decimal("120.00"),
+        )
+        self.spec.fabric_gsm = 200
+        self.spec.measurements = {"chest": "38"}
+        self.spec.save()
+
+        url = reverse("order-detail", kwargs={"order_id": order.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        spec = response.data["items"][0]["spec"]
+        self.assertEqual(spec["id"], str(self.spec.id))
+        self.assertEqual((spec["fabric_gsm"], spec["measurements"]), (180, {}))
+        self.assertEqual(spec["revision"], 1)
+
+        other = User.objects.create_user(
+            email="other@example.com", password="password123", role="parent"
+        )
+        self.client.force_authenticate(user=other)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
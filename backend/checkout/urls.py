@@ -7,5 +7,6 @@ urlpatterns = [
     path("cart", views.get_cart, name="cart-get"),
     path("checkout/session", views.create_checkout_session, name="checkout-session"),
     path("orders", views.list_orders, name="orders-list"),
+    path("orders/<uuid:order_id>", views.get_order, name="order-detail"),
     path("payments/webhook", views.payment_webhook, name="payment-webhook"),
 ]
@@ -10,6 +10,8 @@ from django.db import transaction
 
 from django.shortcuts import get_object_or_404
 from django.core.cache import cache
+from catalog.history import specs_as_of
+from config.pagination import KeysetPagination, wants_keyset_pagination
 from vendors.models import Listing
 from .models import Cart, CartItem, Payment, Order, OrderItem
 from .serializers import (
@@ -17,6 +19,7 @@ from .serializers import (
     CartItemSerializer,
     CartItemCreateSerializer,
     CheckoutSessionSerializer,
+    OrderDetailSerializer,
     WebhookPayloadSerializer,
 )
 
@@ -232,7 +235,38 @@ from .serializers import OrderSerializer
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_orders(request: Request) -> Response:
-    """List user's orders"""
-    orders = Order.objects.filter(user=request.user).order_by("-created_at")
+    """
+    List user's orders.
+    Pass ?pagination=cursor for keyset pages instead of the full list.
+    """
+    orders = (
+        Order.objects.filter(user=request.user)
+        .prefetch_related("items__listing__spec", "items__listing__vendor")
+        .order_by("-created_at")
+    )
+
+    if wants_keyset_pagination(request):
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(orders, request)
+        serializer = OrderSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     serializer = OrderSerializer(orders, many=True)
     return Response(serializer.data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_order(request: Request, order_id: str) -> Response:
+    """Get one of the user's orders, each item with its spec as ordered"""
+    order = get_object_or_404(
+        Order.objects.filter(user=request.user).prefetch_related(
+            "items__listing__spec", "items__listing__vendor"
+        ),
+        pk=order_id,
+    )
+    specs = specs_as_of(
+        (item.listing.spec_id for item in order.items.all()), order.created_at
+    )
+    serializer = OrderDetailSerializer(order, context={"specs": specs})
+    return Response(serializer.data)
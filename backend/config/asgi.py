@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Imported once the app registry is ready
+from schools.autocomplete import warm_index  # noqa: E402
+
+warm_index()
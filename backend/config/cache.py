@@ -0,0 +1,176 @@
+"""
+Shared cache helpers.
+
+Cached responses embed a per-scope generation number in their keys. Writes bump
+the generation, which orphans every key built from the previous one, so entries
+can be cached for hours and still never be served stale after a write.
+
+get_or_compute() guards expensive entries against stampedes: one worker
+recomputes a missing or expiring value under a lock while the others keep
+serving the previous value (or wait briefly for the new one).
+"""
+
+import math
+import random
+import time
+from typing import Callable, Iterable, TypeVar
+
+from django.core.cache import cache
+from django.db import transaction
+
+T = TypeVar("T")
+
+# How long a worker may hold a recompute lock before others take over
+LOCK_TIMEOUT = 30
+
+# How often workers without a value re-check while another worker computes it
+LOCK_POLL_INTERVAL = 0.05
+
+# Keys of the dict get_or_compute() stores around each value
+_ENVELOPE_KEYS = frozenset(("value", "expires", "delta"))
+
+
+def _generation_key(scope: str) -> str:
+    return f"gen:{scope}"
+
+
+def _initial_generation() -> int:
+    # Seed from the clock rather than 1 so that a generation key lost to a
+    # Redis eviction or restart never reuses a number from before the loss.
+    return int(time.time() * 1000)
+
+
+def get_generation(scope: str) -> int:
+    """Return the current generation for a cache scope, creating it if needed.
+
+    Generation keys never expire, so views create them only for scopes whose
+    object exists; peek_generations() tells which scopes have one already.
+    """
+    key = _generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def peek_generations(scopes: Iterable[str]) -> dict[str, int]:
+    """The current generations of whichever scopes have one, creating none"""
+    keys = {_generation_key(scope): scope for scope in scopes}
+    return {keys[key]: generation for key, generation in cache.get_many(list(keys)).items()}
+
+
+def get_generations(scopes: Iterable[str]) -> dict[str, int]:
+    """get_generation() for several scopes in one cache round trip"""
+    scopes = list(scopes)
+    generations = peek_generations(scopes)
+    for scope in scopes:
+        if scope not in generations:
+            generations[scope] = get_generation(scope)
+    return generations
+
+
+def bump_generation(scope: str) -> None:
+    """Invalidate every cache entry keyed on the scope's current generation"""
+    key = _generation_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Nothing cached under this scope yet
+        cache.add(key, _initial_generation(), timeout=None)
+
+
+def bump_generation_on_commit(*scopes: str) -> None:
+    """Bump generations once the current transaction commits.
+
+    Bumping before commit would let a concurrent reader cache pre-write data
+    under the new generation.
+    """
+    for scope in scopes:
+        transaction.on_commit(lambda scope=scope: bump_generation(scope))
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _get_envelope(key: str) -> dict | None:
+    """The envelope stored under key, or None when it holds anything else.
+
+    A value cached in another format (say, by a worker still running older
+    code) is treated as a miss and overwritten rather than misread.
+    """
+    envelope = cache.get(key)
+    if isinstance(envelope, dict) and _ENVELOPE_KEYS <= envelope.keys():
+        return envelope
+    return None
+
+
+def _should_refresh(envelope: dict, beta: float) -> bool:
+    """Probabilistic early expiration ("XFetch").
+
+    Each reader refreshes early with a probability that grows as expiry nears
+    and with how long the value took to compute, so one reader usually
+    recomputes it before it expires instead of all readers at once after.
+    """
+    jitter = envelope["delta"] * beta * math.log(1.0 - random.random())
+    return time.time() - jitter >= envelope["expires"]
+
+
+def _compute_and_store(key: str, compute: Callable[[], T], timeout: int, grace: int) -> T:
+    started = time.monotonic()
+    value = compute()
+    envelope = {
+        "value": value,
+        "expires": time.time() + timeout,
+        "delta": time.monotonic() - started,
+    }
+    # Keep the entry past its logical expiry so it can be served stale while
+    # it is recomputed
+    cache.set(key, envelope, timeout=timeout + grace)
+    return value
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], T],
+    timeout: int,
+    *,
+    grace: int | None = None,
+    beta: float = 1.0,
+    lock_timeout: int = LOCK_TIMEOUT,
+) -> T:
+    """Return the cached value for key, computing it at most once at a time.
+
+    Values are fresh for ``timeout`` seconds and then served stale for up to
+    ``grace`` more (default: ``timeout``) while a single worker, holding a
+    cache.add() (Redis SET NX) lock, recomputes them. Workers finding no value
+    at all wait for the lock holder, then compute it themselves if it has not
+    finished within ``lock_timeout``.
+    """
+    if grace is None:
+        grace = timeout
+    lock_key = _lock_key(key)
+
+    envelope = _get_envelope(key)
+    if envelope is not None and not _should_refresh(envelope, beta):
+        return envelope["value"]
+
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        if cache.add(lock_key, 1, timeout=lock_timeout):
+            try:
+                return _compute_and_store(key, compute, timeout, grace)
+            finally:
+                cache.delete(lock_key)
+
+        # Someone else is recomputing: serve what we have
+        if envelope is not None:
+            return envelope["value"]
+
+        if time.monotonic() >= deadline:
+            return _compute_and_store(key, compute, timeout, grace)
+        time.sleep(LOCK_POLL_INTERVAL)
+        envelope = _get_envelope(key)
+        if envelope is not None:
+            return envelope["value"]
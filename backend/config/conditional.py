@@ -0,0 +1,37 @@
+"""
+Conditional GET helpers.
+
+ETags are derived from cache generations (see config.cache) rather than from
+the response body, so a matching If-None-Match can be answered with 304 before
+any query runs or any serializer is invoked.
+"""
+
+import hashlib
+from typing import Any
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that identify a response's version"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # If-None-Match uses weak comparison
+    return "*" in etags or etag.removeprefix("W/") in (
+        tag.removeprefix("W/") for tag in etags
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
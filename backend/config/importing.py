@@ -0,0 +1,125 @@
+"""
+Streaming bulk imports.
+
+Import files (CSV with a header row, or JSON Lines) are read a record at a
+time and handled in chunks, so memory use does not grow with the file. Valid
+rows of a chunk are loaded with COPY into a temporary staging table and merged
+into the target table with a single INSERT ... SELECT; invalid rows are
+reported by line number without aborting the rest of the import.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+from django.db import connection
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Rows validated and loaded per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Errors listed in a report; any beyond this are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportReport:
+    """Running totals and per-line errors of an import"""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.errors: list[dict[str, Any]] = []
+
+    def add_error(self, line: int, errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def detect_format(filename: str) -> str | None:
+    """Guess the import format from a file name's extension"""
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    return None
+
+
+def read_records(
+    stream: IO[str], format: str, report: ImportReport
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (line number, record) pairs, reporting lines that cannot be parsed.
+
+    Empty CSV cells are left out of their record so they read as missing.
+    """
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {
+                column: value
+                for column, value in row.items()
+                if column is not None and value not in ("", None)
+            }
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as exc:
+            report.add_error(line, {"non_field_errors": [f"Invalid JSON: {exc}"]})
+            continue
+        if not isinstance(record, dict):
+            report.add_error(line, {"non_field_errors": ["Expected a JSON object."]})
+            continue
+        yield line, record
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _copy_value(value: Any) -> str:
+    # COPY's text format: \N is NULL; backslashes and separators are escaped
+    if value is None:
+        return r"\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(
+    cursor: Any, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]
+) -> None:
+    """Load rows into table with COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    quoted = ", ".join(connection.ops.quote_name(column) for column in columns)
+    cursor.copy_expert(
+        f"COPY {connection.ops.quote_name(table)} ({quoted}) FROM STDIN", buffer
+    )
@@ -0,0 +1,324 @@
+"""
+Management command to benchmark hot queries against a large seeded dataset.
+
+Each scenario seeds its rows with INSERT ... SELECT generate_series inside a
+transaction, runs ANALYZE, prints the query plan and timings, and then rolls
+everything back, so it is safe to run against a development database.
+
+Usage:
+    python manage.py benchmark measurements
+    python manage.py benchmark measurements --rows 500000 --iterations 50
+    python manage.py benchmark catalog_cache --iterations 1000
+    python manage.py benchmark school_search --rows 100000
+    python manage.py benchmark school_nearby
+"""
+
+import statistics
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django_redis import get_redis_connection
+from rest_framework.renderers import JSONRenderer
+
+from catalog.filters import MeasurementFilter
+from catalog.models import UniformSpec
+from catalog.read_model import catalog_specs
+from catalog.serializers import UniformSpecSerializer
+from config.cache import get_or_compute
+from config.responses import pack_json, unpack_json
+from schools.models import School
+from schools.queries import MAX_NEAR_RADIUS_KM, near_schools, search_schools, search_thresholds
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded rows once a scenario has run"""
+
+
+class Command(BaseCommand):
+    help = "Benchmark indexed queries on a large, rolled-back seeded dataset"
+
+    scenarios = ["measurements", "catalog_cache", "school_search", "school_nearby"]
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("scenario", choices=self.scenarios)
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200_000,
+            help="Rows to seed for the scenario (default: 200000)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed runs per query (default: 20)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != "postgresql":
+            raise CommandError("Benchmarks require PostgreSQL")
+
+        self.rows: int = options["rows"]
+        self.iterations: int = options["iterations"]
+        scenario = getattr(self, f"scenario_{options['scenario']}")
+
+        try:
+            with transaction.atomic():
+                scenario()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed_schools(self, count: int, name_sql: str = "'Benchmark School ' || n") -> list[str]:
+        """Insert count schools named by the SQL expression name_sql over n.
+
+        Each of the 50 cities is centred on its own point, and its schools are
+        scattered up to about 30 km from it.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO schools (
+                    id, name, code, city, address, academic_year,
+                    session_start, session_end, latitude, longitude,
+                    is_active, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), {name_sql}, 'BENCH-' || n,
+                       'City ' || (n %% 50), n || ' Benchmark Road', '2025-2026',
+                       '2025-04-01', '2026-03-31',
+                       8 + (n %% 50) * 0.5 + (random() - 0.5) * 0.5,
+                       68 + (n %% 50 * 7 %% 50) * 0.5 + (random() - 0.5) * 0.5,
+                       true, now(), now()
+                FROM generate_series(1, %s) AS n
+                RETURNING id
+                """,
+                [count],
+            )
+            return [str(row[0]) for row in cursor.fetchall()]
+
+    def analyze(self, *tables: str) -> None:
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+    def report(self, label: str, queryset: QuerySet) -> None:
+        """Print a queryset's plan and its timings over several runs"""
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(queryset.explain(analyze=True, buffers=True))
+
+        self.time_runs(lambda: list(queryset.values_list("pk", flat=True)))
+        self.stdout.write("")
+
+    def time_runs(self, run: Callable[[], Any]) -> None:
+        """Print the median and p95 latency of a callable"""
+        timings = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"  median {statistics.median(timings):.3f} ms, "
+            f"p95 {p95:.3f} ms over {self.iterations} runs"
+        )
+
+    def timed(self, label: str, step: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = step()
+        self.stdout.write(f"{label} in {time.perf_counter() - started:.1f}s")
+        return result
+
+    def scenario_measurements(self) -> None:
+        """Measurement filters on a large uniform_specs table"""
+        school_ids = self.timed("Seeded schools", lambda: self.seed_schools(200))
+
+        def seed_specs() -> None:
+            # Mix numbers, numeric strings and sizes like "M" the way real
+            # measurements JSON does
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO uniform_specs (
+                        id, school_id, academic_year, description, item_type,
+                        item_name, gender, season, fabric_gsm, pantone,
+                        measurements, frozen, version, created_at, updated_at
+                    )
+                    SELECT gen_random_uuid(), schools[1 + n %% cardinality(schools)],
+                           '2025-2026', 'Benchmark spec ' || n,
+                           (ARRAY['shirt', 'pants', 'skirt', 'blazer'])[1 + n %% 4],
+                           'Item ' || (n %% 25), (ARRAY['boys', 'girls'])[1 + n %% 2],
+                           'summer', 180, 'PMS 287C',
+                           CASE n %% 3
+                               WHEN 0 THEN jsonb_build_object(
+                                   'chest', 24 + n %% 20, 'waist', 20 + n %% 16,
+                                   'length', 20 + n %% 18)
+                               WHEN 1 THEN jsonb_build_object(
+                                   'chest', (24 + n %% 20)::text,
+                                   'length', (20 + n %% 18)::text)
+                               ELSE jsonb_build_object(
+                                   'size', (ARRAY['S', 'M', 'L', 'XL'])[1 + n %% 4])
+                           END,
+                           false, 1 + n / 5000, now(), now()
+                    FROM generate_series(1, %s) AS n,
+                         (SELECT %s::uuid[] AS schools) AS s
+                    """,
+                    [self.rows, school_ids],
+                )
+
+        self.timed(f"Seeded {self.rows} specs", seed_specs)
+        self.analyze("schools", "uniform_specs")
+
+        measurement_filter = MeasurementFilter()
+        specs = UniformSpec.objects.filter(school_id=school_ids[0])
+
+        self.report(
+            "One school, ?measurements.chest__gte=40",
+            specs.filter(
+                measurement_filter.build_condition("measurements", "chest", "gte", "40")
+            ),
+        )
+        self.report(
+            "One school, ?measurements.waist__gte=24&measurements.waist__lte=28",
+            specs.filter(
+                measurement_filter.build_condition("measurements", "waist", "gte", "24"),
+                measurement_filter.build_condition("measurements", "waist", "lte", "28"),
+            ),
+        )
+        self.report(
+            "One school, ?measurements.size=XL",
+            specs.filter(
+                measurement_filter.build_condition("measurements", "size", "exact", "XL")
+            ),
+        )
+
+    def scenario_catalog_cache(self) -> None:
+        """Cache hits for one catalog page: pickled response.data vs JSON bytes"""
+        school_id = self.seed_schools(1)[0]
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO vendors (
+                    id, name, official_name, email, phone, city, status,
+                    verification_level, payout_info, is_active, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), 'Vendor ' || n, 'Benchmark Vendor ' || n,
+                       'vendor' || n || '@example.com', '9000000000', 'Mumbai',
+                       'approved', 1, '{}', true, now(), now()
+                FROM generate_series(1, 5) AS n
+                """
+            )
+            cursor.execute(
+                """
+                INSERT INTO uniform_specs (
+                    id, school_id, academic_year, description, item_type,
+                    item_name, gender, season, fabric_gsm, pantone,
+                    measurements, frozen, version, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), %s, '2025-2026',
+                       'Cotton blend, machine washable, school crest on pocket',
+                       (ARRAY['shirt', 'pants', 'skirt', 'blazer'])[1 + n %% 4],
+                       'Item ' || n, (ARRAY['boys', 'girls'])[1 + n %% 2], 'summer',
+                       180, 'PMS 287C',
+                       jsonb_build_object('chest', 24 + n, 'waist', 20 + n, 'length', 28),
+                       false, 1, now(), now()
+                FROM generate_series(1, %s) AS n
+                """,
+                [school_id, page_size],
+            )
+            # Every vendor lists every spec
+            cursor.execute(
+                """
+                INSERT INTO listings (
+                    id, vendor_id, school_id, spec_id, sku, base_price, mrp,
+                    lead_time_days, enabled, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), v.id, s.school_id, s.id,
+                       'SKU-' || left(s.id::text, 8) || '-' || left(v.id::text, 4),
+                       499.00, 599.00, 7, true, now(), now()
+                FROM uniform_specs s CROSS JOIN vendors v
+                WHERE s.school_id = %s AND v.name LIKE 'Vendor %%'
+                """,
+                [school_id],
+            )
+
+        specs = catalog_specs().filter(school_id=school_id).order_by("item_type")
+        data = {
+            "count": page_size,
+            "next": None,
+            "previous": None,
+            "results": UniformSpecSerializer(specs[:page_size], many=True).data,
+        }
+
+        pickled_key = "benchmark:catalog_cache:pickled"
+        rendered_key = "benchmark:catalog_cache:rendered"
+        renderer = JSONRenderer()
+        cache.set(pickled_key, data, timeout=600)
+        get_or_compute(rendered_key, lambda: pack_json(data), timeout=600)
+        try:
+            self.stdout.write(self.style.MIGRATE_HEADING("Hit: unpickle response.data, render JSON"))
+            self.time_runs(lambda: renderer.render(cache.get(pickled_key)))
+            self.stdout.write(self.style.MIGRATE_HEADING("Hit: read stored JSON bytes"))
+            self.time_runs(
+                lambda: unpack_json(get_or_compute(rendered_key, dict, timeout=600))
+            )
+
+            redis = get_redis_connection("default")
+            for label, key in (("pickled", pickled_key), ("rendered", rendered_key)):
+                size = redis.memory_usage(cache.make_key(key))
+                self.stdout.write(f"Redis memory, {label}: {size} bytes")
+        finally:
+            cache.delete_many([pickled_key, rendered_key])
+
+    def scenario_school_search(self) -> None:
+        """Fuzzy ?search= on a large schools table"""
+        # A made-up word from md5 letters keeps names distinct, followed by
+        # the common words real school names share
+        name_sql = """
+            initcap(translate(left(md5(n::text), 7), '0123456789abcdef', 'aeioubcdfghklmnr'))
+            || ' ' || (ARRAY['Public', 'Convent', 'International', 'Model',
+                             'Central', 'Vidya', 'Modern', 'Global'])[1 + n %% 8]
+            || ' ' || (ARRAY['School', 'Academy', 'High School', 'Vidyalaya'])[1 + n / 8 %% 4]
+        """
+        self.timed(f"Seeded {self.rows} schools", lambda: self.seed_schools(self.rows, name_sql))
+        self.analyze("schools")
+
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        name = School.objects.filter(code="BENCH-1").values_list("name", flat=True).get()
+        # Swap two letters of the distinctive word, as a typo would
+        typo = name[0] + name[2] + name[1] + name[3:]
+        for label, text in (
+            ("Exact name", name),
+            ("Typo", typo),
+            ("Partial name", name[: len(name.split()[0]) + 4]),
+            ("Code", "BENCH-1"),
+            # Thousands of schools share these words; all of them are ranked
+            ("Common words only", name.split(" ", 1)[1]),
+        ):
+            queryset = search_schools(School.objects.all(), text).order_by(
+                "-similarity", "name", "pk"
+            )
+            with search_thresholds():
+                self.report(f"{label}, ?search={text}", queryset[:page_size])
+
+    def scenario_school_nearby(self) -> None:
+        """?near= lookups on a large schools table"""
+        self.timed(f"Seeded {self.rows} schools", lambda: self.seed_schools(self.rows))
+        self.analyze("schools")
+
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        # The centre of City 1, where its schools are densest
+        latitude, longitude = 8.5, 71.5
+        for radius in (1, 5, 20, MAX_NEAR_RADIUS_KM):
+            queryset = near_schools(School.objects.all(), latitude, longitude, radius)
+            self.stdout.write(f"Schools within {radius} km: {queryset.count()}")
+            self.report(
+                f"?near={latitude},{longitude}&radius={radius}",
+                queryset.order_by("nearness", "name", "pk")[:page_size],
+            )
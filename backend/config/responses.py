@@ -0,0 +1,77 @@
+"""
+Cached, pre-rendered JSON responses.
+
+Cached API responses are stored as the final JSON bytes (zlib-compressed when
+large) rather than as pickled response.data, so a cache hit is a single Redis
+read and a memcpy: no unpickling of nested dicts, Decimals and UUIDs and no
+re-rendering. Hits for the browsable API decode the same bytes.
+"""
+
+import json
+import zlib
+from typing import Any, Callable
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import get_or_compute
+
+# Bodies smaller than this are stored as-is; compressing them saves little
+COMPRESS_MIN_BYTES = 1024
+
+# Single-byte headers telling stored bodies apart
+_RAW = b"r"
+_ZLIB = b"z"
+
+
+def pack_json(data: Any) -> bytes:
+    """Render data to JSON the way the API does and pack it for the cache"""
+    return pack_rendered_json(JSONRenderer().render(data))
+
+
+def pack_rendered_json(body: bytes) -> bytes:
+    """Pack an already rendered JSON body for the cache"""
+    if len(body) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(body)
+    return _RAW + body
+
+
+def unpack_json(blob: bytes) -> bytes:
+    """Return the JSON body of a value stored by pack_json()"""
+    if blob[:1] == _ZLIB:
+        return zlib.decompress(blob[1:])
+    return blob[1:]
+
+
+def cached_json_response(
+    request: Request,
+    cache_key: str,
+    build: Callable[[], Any],
+    timeout: int,
+    headers: dict[str, str] | None = None,
+) -> HttpResponse:
+    """Serve a response from its cached JSON bytes, building them if needed.
+
+    ``build`` returns the response data on a miss (see get_or_compute for how
+    concurrent misses are coalesced). The request that built the data responds
+    with it as usual; hits return the stored bytes directly.
+    """
+    built = {}
+
+    def compute() -> bytes:
+        built["data"] = build()
+        return pack_json(built["data"])
+
+    blob = get_or_compute(cache_key, compute, timeout=timeout)
+    if "data" in built:
+        return Response(built["data"], headers=headers)
+
+    body = unpack_json(blob)
+    if request.accepted_renderer.format == "json":
+        response = HttpResponse(body, content_type="application/json")
+        for header, value in (headers or {}).items():
+            response[header] = value
+        return response
+    return Response(json.loads(body), headers=headers)
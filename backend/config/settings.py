@@ -82,6 +82,7 @@ INSTALLED_APPS = [
     "catalog",
     "vendors",
     "checkout",
+    "sync",
     "corsheaders",
 ]
 
@@ -220,6 +221,21 @@ CACHES = {
     }
 }
 
+# Serve school catalogs from the denormalized catalog_entries read model
+# (see catalog.read_model) instead of joining specs and listings per request.
+# Writes keep the read model current, but the migration that adds it leaves
+# it empty: on an existing database, run `python manage.py rebuild_catalog`
+# before turning this on, or catalogs are served empty.
+CATALOG_SERVE_FROM_READ_MODEL = os.getenv(
+    "CATALOG_SERVE_FROM_READ_MODEL", "False"
+).lower() in ("true", "1", "yes")
+
+# Return only the newest version of each spec from the catalog unless the
+# client passes ?latest=false
+CATALOG_LATEST_ONLY_DEFAULT = os.getenv(
+    "CATALOG_LATEST_ONLY_DEFAULT", "False"
+).lower() in ("true", "1", "yes")
+
 # JWT settings
 from datetime import timedelta
 
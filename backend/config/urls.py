@@ -25,4 +25,5 @@ urlpatterns = [
     path("api/", include("catalog.urls")),
     path("api/", include("vendors.urls")),
     path("api/", include("checkout.urls")),
+    path("api/", include("sync.urls")),
 ]
@@ -0,0 +1,201 @@
+"""
+In-process autocomplete over active school names.
+
+Typeahead fires a request per keystroke, so lookups are answered from a
+sorted list in worker memory with bisect, without touching the database or
+Redis. Every suffix of a name that starts at a word is a key ("delhi public
+school", "public school", "school"), as is the code, so "pub" finds "Delhi
+Public School".
+
+The index is loaded when a worker starts (see config.wsgi) or else on first
+use. Writes made in this process are applied once they commit (see
+schools.signals). Writes made by other workers are picked up by an
+incremental refresh at most every AUTOCOMPLETE_REFRESH_INTERVAL seconds,
+which reads the schools updated since the last refresh plus school
+tombstones.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+from .models import School
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+# Seconds between incremental refreshes from the database
+AUTOCOMPLETE_REFRESH_INTERVAL = 30
+
+# Refreshes re-read rows stamped this long before the previous one, so rows
+# whose transaction committed late are not missed
+AUTOCOMPLETE_REFRESH_LAG = timedelta(seconds=60)
+
+# Columns kept per school and returned by search()
+FIELDS = ("id", "name", "city", "code")
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Casefold text and collapse anything but letters and digits to a space"""
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def school_keys(school: dict[str, Any]) -> set[str]:
+    """Keys a school is found by: each word-started suffix of its name, and its code"""
+    words = normalize(school["name"]).split()
+    keys = {" ".join(words[start:]) for start in range(len(words))}
+    keys.add(normalize(school["code"]))
+    keys.discard("")
+    return keys
+
+
+class SchoolAutocomplete:
+    """A sorted (key, school id) list searched by prefix with bisect.
+
+    Updates build a new list and dict and swap them in together, so searches
+    never take a lock and always see a consistent snapshot.
+    """
+
+    def __init__(self) -> None:
+        # (sorted (key, school id) entries, school id -> school)
+        self._state: tuple[list[tuple[str, str]], dict[str, dict[str, Any]]] = ([], {})
+        self._write_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._loaded = False
+        self._refreshed_at: datetime | None = None
+        self._next_refresh = 0.0
+
+    def load(self) -> None:
+        """(Re)build the index from every active school"""
+        started = timezone.now()
+        schools = list(School.objects.filter(is_active=True).values(*FIELDS))
+        with self._write_lock:
+            self._swap({}, schools)
+            self._refreshed_at = started
+            self._next_refresh = time.monotonic() + AUTOCOMPLETE_REFRESH_INTERVAL
+            self._loaded = True
+
+    def refresh(self) -> None:
+        """Apply schools changed or deleted since the last load or refresh"""
+        from sync.models import SyncTombstone
+
+        if self._refreshed_at is None:
+            self.load()
+            return
+        started = timezone.now()
+        since = self._refreshed_at - AUTOCOMPLETE_REFRESH_LAG
+        changed = list(
+            School.objects.filter(updated_at__gt=since).values(*FIELDS, "is_active")
+        )
+        deleted = SyncTombstone.objects.filter(
+            kind="school", deleted_at__gt=since
+        ).values_list("object_id", flat=True)
+        self.apply(changed, deleted)
+        self._refreshed_at = started
+
+    def apply(
+        self, changed: Iterable[dict[str, Any]], deleted: Iterable[Any] = ()
+    ) -> None:
+        """Upsert changed schools (dropping inactive ones) and remove deleted ids"""
+        if not self._loaded:
+            # load() reads the current rows anyway
+            return
+        changed = list(changed)
+        deleted = {str(school_id) for school_id in deleted}
+        with self._write_lock:
+            schools = dict(self._state[1])
+            for school in changed:
+                schools.pop(str(school["id"]), None)
+            for school_id in deleted:
+                schools.pop(school_id, None)
+            self._swap(
+                schools,
+                (
+                    school
+                    for school in changed
+                    if school.get("is_active", True) and str(school["id"]) not in deleted
+                ),
+            )
+
+    def _swap(
+        self, schools: dict[str, dict[str, Any]], added: Iterable[dict[str, Any]]
+    ) -> None:
+        for school in added:
+            school_id = str(school["id"])
+            schools[school_id] = {field: school[field] for field in FIELDS}
+            schools[school_id]["id"] = school_id
+        entries = sorted(
+            (key, school_id)
+            for school_id, school in schools.items()
+            for key in school_keys(school)
+        )
+        self._state = (entries, schools)
+
+    def ensure_fresh(self) -> None:
+        """Load on first use, then refresh when due without blocking readers"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+            return
+        if time.monotonic() < self._next_refresh:
+            return
+        # One thread refreshes; the rest keep answering from the current index
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_refresh = time.monotonic() + AUTOCOMPLETE_REFRESH_INTERVAL
+            self.refresh()
+        except Exception:
+            # Keep serving the index we have; the next refresh catches up
+            logger.exception("School autocomplete refresh failed")
+        finally:
+            self._refresh_lock.release()
+
+    def search(self, text: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[dict[str, Any]]:
+        """Schools with a name word or code starting with text, in key order"""
+        self.ensure_fresh()
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        entries, schools = self._state
+
+        results: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        position = bisect_left(entries, (prefix,))
+        while position < len(entries) and len(results) < limit:
+            key, school_id = entries[position]
+            if not key.startswith(prefix):
+                break
+            if school_id not in seen:
+                seen.add(school_id)
+                results.append(schools[school_id])
+            position += 1
+        return results
+
+
+index = SchoolAutocomplete()
+
+
+def warm_index() -> None:
+    """Load the index while a worker starts instead of on its first search"""
+    try:
+        index.load()
+    except DatabaseError:
+        logger.exception("School autocomplete not loaded; loading on first use")
+    finally:
+        # Servers that fork workers after loading the app must not share
+        # this connection between them
+        connections.close_all()
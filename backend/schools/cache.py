@@ -0,0 +1,46 @@
+"""School cache keys and invalidation."""
+
+from typing import Any, Iterable
+
+from config.cache import bump_generation_on_commit, get_generation
+
+# Entries are invalidated on write via generations, so the TTL only bounds
+# memory use, not staleness. Applies to school lists and details.
+SCHOOL_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Covers school lists not filtered by city; lists filtered with ?city= have a
+# scope per city so writes elsewhere leave them cached
+SCHOOL_LIST_SCOPE = "schools"
+
+
+def school_scope(school_id: Any) -> str:
+    return f"school:{school_id}"
+
+
+def school_cache_key(school_id: Any) -> str:
+    """Build the cache key for a school's detail at its current generation"""
+    generation = get_generation(school_scope(school_id))
+    return f"school_{school_id}:v{generation}"
+
+
+def school_list_scope(city: str | None = None) -> str:
+    return f"{SCHOOL_LIST_SCOPE}:city:{city}" if city else SCHOOL_LIST_SCOPE
+
+
+def school_list_cache_key(query_params: str, city: str | None = None) -> str:
+    """Build the cache key for a school list page at its current generation"""
+    scope = school_list_scope(city)
+    return f"{scope}:v{get_generation(scope)}:{query_params}"
+
+
+def invalidate_school(school_id: Any, cities: Iterable[str | None] = ()) -> None:
+    """Invalidate a school's detail, unfiltered lists and lists of its cities"""
+    invalidate_schools([school_id], cities)
+
+
+def invalidate_schools(school_ids: Iterable[Any], cities: Iterable[str | None] = ()) -> None:
+    bump_generation_on_commit(
+        *(school_scope(school_id) for school_id in set(school_ids)),
+        SCHOOL_LIST_SCOPE,
+        *(school_list_scope(city) for city in set(cities) if city),
+    )
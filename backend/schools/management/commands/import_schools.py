@@ -0,0 +1,69 @@
+"""
+Management command to bulk import schools from a CSV or JSON Lines file.
+
+CSV files need a header row naming the columns: name, code, city, address,
+board, academic_year, session_start, session_end and is_active (board and
+is_active are optional). JSON Lines files hold one object per line with the
+same keys. Schools are upserted on code; see schools.importing.
+
+Usage:
+    python manage.py import_schools district.csv
+    python manage.py import_schools district.jsonl --chunk-size 5000
+    cat district.csv | python manage.py import_schools - --format csv
+"""
+
+import sys
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from config.importing import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, detect_format
+from schools.importing import import_schools
+
+
+class Command(BaseCommand):
+    help = "Bulk import schools from a CSV or JSON Lines file, upserting on code"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help=f"Rows validated and loaded per transaction (default: {IMPORT_CHUNK_SIZE})",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        format = options["format"] or (None if path == "-" else detect_format(path))
+        if format is None:
+            raise CommandError("Cannot tell the file format; pass --format")
+
+        if path == "-":
+            report = import_schools(sys.stdin, format, options["chunk_size"])
+        else:
+            try:
+                # utf-8-sig drops the byte order mark spreadsheets write
+                with open(path, encoding="utf-8-sig", newline="") as stream:
+                    report = import_schools(stream, format, options["chunk_size"])
+            except OSError as exc:
+                raise CommandError(f"Cannot read {path}: {exc}") from exc
+
+        for error in report.errors:
+            self.stderr.write(f"  line {error['line']}: {error['errors']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f"  ... and {report.failed - len(report.errors)} more")
+
+        summary = (
+            f"Created {report.created}, updated {report.updated}, "
+            f"unchanged {report.unchanged}, failed {report.failed}"
+        )
+        if report.failed:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
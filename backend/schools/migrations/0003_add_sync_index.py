@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_add_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['updated_at', 'id'], name='idx_school_updated'),
+        ),
+    ]
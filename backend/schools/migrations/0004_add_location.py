@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import CreateExtension
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0003_add_sync_index'),
+    ]
+
+    operations = [
+        # earthdistance's ll_to_earth() and earth_box() build on cube
+        CreateExtension('cube'),
+        CreateExtension('earthdistance'),
+        migrations.AddField(
+            model_name='school',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='school',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=django.contrib.postgres.indexes.GistIndex(models.Func('latitude', 'longitude', function='ll_to_earth'), condition=models.Q(('latitude__isnull', False), ('longitude__isnull', False)), name='idx_school_location'),
+        ),
+        migrations.AddConstraint(
+            model_name='school',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('latitude__isnull', True), ('longitude__isnull', True)), models.Q(('latitude__isnull', False), ('longitude__isnull', False)), _connector='OR'), name='school_location_complete'),
+        ),
+    ]
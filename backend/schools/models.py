@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GistIndex
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from typing import ClassVar
 
@@ -15,6 +17,16 @@ class School(models.Model):
     academic_year = models.CharField(max_length=20, help_text="e.g. 2025-2026")
     session_start = models.DateField()
     session_end = models.DateField()
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -25,6 +37,20 @@ class School(models.Model):
         indexes = [
             models.Index(fields=["name"], name="idx_school_name"),
             models.Index(fields=["city"], name="idx_school_city"),
+            models.Index(fields=["updated_at", "id"], name="idx_school_updated"),
+            # Nearby lookups (see schools.queries.near_schools)
+            GistIndex(
+                models.Func("latitude", "longitude", function="ll_to_earth"),
+                name="idx_school_location",
+                condition=models.Q(latitude__isnull=False, longitude__isnull=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(latitude__isnull=True, longitude__isnull=True)
+                | models.Q(latitude__isnull=False, longitude__isnull=False),
+                name="school_location_complete",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,115 @@
+"""Reusable school queryset building blocks."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.contrib.postgres.lookups import DataContains
+from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Case, F, Field, FloatField, Func, Q, QuerySet, Value, When
+from django.db.models.functions import Greatest
+
+# pg_trgm's default word_similarity_threshold (0.6) misses a swapped letter in
+# a short word ("dehli" scores 0.33 against "Delhi"); use the same 0.3 as its
+# default for whole strings
+SEARCH_WORD_SIMILARITY_THRESHOLD = 0.3
+
+# ?radius= for nearby lookups when none is given, and the largest allowed, in km
+NEAR_RADIUS_KM = 5
+MAX_NEAR_RADIUS_KM = 50
+
+
+class LlToEarth(Func):
+    """earthdistance's point on the earth for a latitude and longitude"""
+
+    function = "ll_to_earth"
+    output_field = Field()
+
+
+class EarthBox(Func):
+    """A cube bounding every point within a distance, in metres, of a point"""
+
+    function = "earth_box"
+    output_field = Field()
+
+
+class CubeDistance(Func):
+    """cube's ``<->`` distance, which GiST indexes can return rows in order of"""
+
+    arg_joiner = " <-> "
+    template = "(%(expressions)s)"
+    output_field = FloatField()
+
+
+class EarthDistance(Func):
+    """Great-circle distance in metres between two ll_to_earth() points"""
+
+    function = "earth_distance"
+    output_field = FloatField()
+
+
+@contextmanager
+def search_thresholds() -> Iterator[None]:
+    """Run the search_schools() queries inside the block at our thresholds"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        # SET LOCAL, so the setting ends with the transaction and never leaks
+        # to other requests through a pooled connection
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [str(SEARCH_WORD_SIMILARITY_THRESHOLD)],
+        )
+        yield
+
+
+def search_schools(queryset: QuerySet, text: str) -> QuerySet:
+    """Fuzzy match schools on name, or exactly on code.
+
+    Every word of the text has to fuzzy-match some word of the name (pg_trgm's
+    ``%>``), so a distinctive word narrows the GIN index idx_school_name_trgm
+    down to a few rows even when the rest, like "Public School", is shared by
+    thousands of schools. The code match goes through the unique index on
+    code. Rows are annotated with ``similarity`` for relevance ordering, exact
+    code matches scoring 1.
+    """
+    code_match = Q(code=text) | Q(code=text.upper())
+    # Words without letters or digits have no trigrams and would match nothing
+    words = [word for word in text.split() if any(char.isalnum() for char in word)]
+    name_match = Q()
+    for word in words:
+        name_match &= Q(name__trigram_word_similar=word)
+
+    return queryset.filter(name_match | code_match if words else code_match).annotate(
+        similarity=Greatest(
+            TrigramSimilarity("name", text),
+            TrigramWordSimilarity(text, "name"),
+            Case(
+                When(code_match, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+    )
+
+
+def near_schools(
+    queryset: QuerySet, latitude: float, longitude: float, radius_km: float
+) -> QuerySet:
+    """Schools within radius_km of a point, annotated with ``distance`` in km.
+
+    The bounding-box test ``earth_box(origin, radius) @> ll_to_earth(...)``
+    is answered by the GiST index idx_school_location; only the schools in
+    the box have their exact distance computed to drop the box's corners.
+    Order by the ``nearness`` alias rather than ``distance`` so the index
+    returns the nearest schools first and a page stops reading early
+    however many schools the radius covers.
+    """
+    origin = LlToEarth(Value(latitude), Value(longitude))
+    location = LlToEarth(F("latitude"), F("longitude"))
+    radius = radius_km * 1000
+    return (
+        queryset.filter(latitude__isnull=False, longitude__isnull=False)
+        .filter(DataContains(EarthBox(origin, Value(radius)), location))
+        .annotate(distance=EarthDistance(origin, location) / 1000)
+        .alias(nearness=CubeDistance(location, origin))
+        .filter(distance__lte=radius_km)
+    )
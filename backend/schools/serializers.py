@@ -3,6 +3,9 @@ from .models import School
 
 
 class SchoolSerializer(serializers.ModelSerializer[School]):
+    # Set on ?near= lookups only, in km
+    distance = serializers.FloatField(read_only=True)
+
     class Meta:
         model = School
         fields = [
@@ -12,6 +15,9 @@ class SchoolSerializer(serializers.ModelSerializer[School]):
             "board",
             "session_start",
             "session_end",
+            "latitude",
+            "longitude",
+            "distance",
             "is_active",
             "created_at",
             "updated_at",
@@ -0,0 +1,56 @@
+"""Invalidate cached school responses and update autocomplete on write."""
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from . import autocomplete
+from .cache import invalidate_school, invalidate_schools
+from .models import School
+
+# Sent inside the transaction of a bulk import (see schools.importing), whose
+# raw SQL skips the model signals. ``schools`` holds a dict per created or
+# changed school: id, name, code, city, is_active, created and previous_city.
+schools_imported = Signal()
+
+
+@receiver(pre_save, sender=School)
+def remember_city(sender: Any, instance: School, **kwargs: Any) -> None:
+    # Lists of the city a school moves out of must be invalidated too
+    instance._previous_city = (
+        None
+        if instance._state.adding
+        else School.objects.filter(pk=instance.pk).values_list("city", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+def invalidate_school_caches(sender: Any, instance: School, **kwargs: Any) -> None:
+    invalidate_school(
+        instance.pk, [instance.city, getattr(instance, "_previous_city", None)]
+    )
+
+
+@receiver(post_save, sender=School)
+def update_autocomplete(sender: Any, instance: School, **kwargs: Any) -> None:
+    school = {field: getattr(instance, field) for field in autocomplete.FIELDS}
+    school["is_active"] = instance.is_active
+    transaction.on_commit(lambda: autocomplete.index.apply([school]))
+
+
+@receiver(post_delete, sender=School)
+def remove_from_autocomplete(sender: Any, instance: School, **kwargs: Any) -> None:
+    school_id = instance.pk
+    transaction.on_commit(lambda: autocomplete.index.apply([], [school_id]))
+
+
+@receiver(schools_imported)
+def schools_imported_caches(sender: Any, schools: list[dict[str, Any]], **kwargs: Any) -> None:
+    invalidate_schools(
+        [school["id"] for school in schools],
+        [city for school in schools for city in (school["city"], school["previous_city"])],
+    )
+    transaction.on_commit(lambda: autocomplete.index.apply(schools))
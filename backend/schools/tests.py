@@ -1,5 +1,7 @@
+import uuid
 from datetime import date
 from django.urls import reverse
+from django.utils import timezone
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from rest_framework import status
@@ -69,6 +71,18 @@ class SchoolTests(APITestCase):
         self.assertEqual(response.data["name"], "School A")
         self.assertEqual(response.data["city"], "Mumbai")
 
+    def test_retrieve_unknown_school(self):
+        """Test unknown school ids get a 404 without creating a generation key"""
+        from config.cache import peek_generations
+        from .cache import school_scope
+
+        for school_id in (uuid.uuid4(), "not-a-uuid"):
+            url = reverse("school-detail", kwargs={"pk": school_id})
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(peek_generations([school_scope(school_id)]), {})
+
     def test_filter_schools_by_city(self):
         """Test filtering schools by city"""
         url = reverse("school-list")
@@ -122,3 +136,530 @@ class SchoolTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_retrieve_school_cache_invalidated_on_write(self):
+        """Test cached school detail reflects writes immediately"""
+        url = reverse("school-detail", kwargs={"pk": self.school_a.id})
+        response = self.client.get(url)
+        self.assertEqual(response.data["name"], "School A")
+
+        school = School.objects.get(pk=self.school_a.pk)
+        school.name = "School A Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            school.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["name"], "School A Renamed")
+
+    def test_list_schools_conditional_get(self):
+        """Test school list answers a matching If-None-Match with 304"""
+        url = reverse("school-list")
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            School.objects.create(
+                name="New School",
+                code="SCH-NEW",
+                city="Pune",
+                address="1 New Rd",
+                academic_year="2025-2026",
+                session_start=date(2025, 4, 1),
+                session_end=date(2026, 3, 31),
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("New School", [school["name"] for school in response.data["results"]])
+
+    def test_list_schools_cached(self):
+        """Test school list pages are served from the cache until a write"""
+        url = reverse("school-list")
+        self.client.get(url, {"city": "Mumbai"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {"city": "Mumbai"})
+        self.assertEqual([school["name"] for school in response.json()["results"]], ["School A"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.school_a.name = "School A Renamed"
+            self.school_a.save()
+        response = self.client.get(url, {"city": "Mumbai"})
+        self.assertEqual(
+            [school["name"] for school in response.json()["results"]], ["School A Renamed"]
+        )
+
+    def test_list_schools_cached_per_city(self):
+        """Test a write invalidates lists of its own cities and unfiltered lists only"""
+        url = reverse("school-list")
+        for params in ({"city": "Mumbai"}, {"city": "Delhi"}, {}):
+            self.client.get(url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.school_b.board = "CBSE"
+            self.school_b.save()
+        with self.assertNumQueries(0):
+            self.client.get(url, {"city": "Mumbai"})
+        for params in ({"city": "Delhi"}, {}):
+            with self.assertNumQueries(2):
+                self.client.get(url, params)
+
+        # Moving a school changes the lists of both cities
+        with self.captureOnCommitCallbacks(execute=True):
+            self.school_b.city = "Mumbai"
+            self.school_b.save()
+        response = self.client.get(url, {"city": "Delhi"})
+        self.assertEqual(response.json()["results"], [])
+        response = self.client.get(url, {"city": "Mumbai"})
+        self.assertEqual(
+            [school["name"] for school in response.json()["results"]], ["School A", "School B"]
+        )
+
+    def test_list_schools_unknown_city(self):
+        """Test lists of a city without schools are not cached under a new generation"""
+        from config.cache import peek_generations
+        from .cache import school_list_scope
+
+        url = reverse("school-list")
+        response = self.client.get(url, {"city": "Atlantis"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+        self.assertEqual(peek_generations([school_list_scope("Atlantis")]), {})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            School.objects.create(
+                name="Atlantis School",
+                code="SCH-ATL",
+                city="Atlantis",
+                address="1 Sea Rd",
+                academic_year="2025-2026",
+                session_start=date(2025, 4, 1),
+                session_end=date(2026, 3, 31),
+            )
+        response = self.client.get(url, {"city": "Atlantis"})
+        self.assertEqual(
+            [school["name"] for school in response.json()["results"]], ["Atlantis School"]
+        )
+
+    def test_retrieve_school_conditional_get(self):
+        """Test school detail answers a matching If-None-Match with 304"""
+        url = reverse("school-detail", kwargs={"pk": self.school_a.id})
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_search_schools_fuzzy(self):
+        """Test ?search= matches misspelt and partial names, best match first"""
+        School.objects.create(
+            name="Delhi Public School",
+            code="DPS-RKP",
+            city="Delhi",
+            address="Sector 12, RK Puram",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        School.objects.create(
+            name="Delhi Private School",
+            code="DPS-DXB",
+            city="Delhi",
+            address="Oud Metha",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        url = reverse("school-list")
+
+        response = self.client.get(url, {"search": "dehli publc"})
+        names = [school["name"] for school in response.data["results"]]
+        self.assertEqual(names[0], "Delhi Public School")
+        self.assertNotIn("School A", names)
+
+        response = self.client.get(url, {"search": "Delhi Pub"})
+        self.assertEqual(response.data["results"][0]["name"], "Delhi Public School")
+
+        # An exact code match ranks above fuzzy name matches
+        response = self.client.get(url, {"search": "sch-b"})
+        self.assertEqual(response.data["results"][0]["name"], "School B")
+
+    def test_search_schools_uses_trigram_index(self):
+        """Test name search goes through idx_school_name_trgm"""
+        from django.db import connection
+        from .queries import search_schools, search_thresholds
+
+        queryset = search_schools(School.objects.all(), "delhi public").order_by()
+        with search_thresholds(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_school_name_trgm", plan)
+
+    def test_near_schools(self):
+        """Test ?near= returns schools within ?radius= km, nearest first"""
+        School.objects.filter(pk=self.school_a.pk).update(latitude=19.0760, longitude=72.8777)
+        # About 3 km and 20 km from School A
+        School.objects.filter(pk=self.school_b.pk).update(latitude=19.1030, longitude=72.8777)
+        School.objects.create(
+            name="Thane School",
+            code="SCH-T",
+            city="Thane",
+            address="1 Thane Rd",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+            latitude=19.2183,
+            longitude=72.9781,
+        )
+        url = reverse("school-list")
+
+        response = self.client.get(url, {"near": "19.0760,72.8777"})
+        results = response.data["results"]
+        self.assertEqual([school["name"] for school in results], ["School A", "School B"])
+        self.assertAlmostEqual(results[0]["distance"], 0, places=3)
+        self.assertAlmostEqual(results[1]["distance"], 3.0, delta=0.1)
+
+        response = self.client.get(url, {"near": "19.0760,72.8777", "radius": "25"})
+        self.assertEqual(
+            [school["name"] for school in response.data["results"]],
+            ["School A", "School B", "Thane School"],
+        )
+
+        # Schools without a location are never near anything
+        response = self.client.get(url, {"near": "0,0", "radius": "50"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_near_schools_validates_params(self):
+        """Test ?near= and ?radius= reject malformed and out-of-range values"""
+        url = reverse("school-list")
+        for params, field in (
+            ({"near": "19.07"}, "near"),
+            ({"near": "north,south"}, "near"),
+            ({"near": "91,72"}, "near"),
+            ({"near": "19.07,72.87", "radius": "far"}, "radius"),
+            ({"near": "19.07,72.87", "radius": "0"}, "radius"),
+            ({"near": "19.07,72.87", "radius": "500"}, "radius"),
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertIn(field, response.data)
+
+    def test_near_schools_uses_location_index(self):
+        """Test nearby lookups go through idx_school_location"""
+        from django.db import connection, transaction
+        from .queries import near_schools
+
+        queryset = near_schools(School.objects.all(), 19.0760, 72.8777, 5).order_by()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_school_location", plan)
+
+
+class SchoolAutocompleteTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create shared test data once per test class"""
+        cls.user = User.objects.create_user(
+            email="test@example.com", password="password123", role="parent"
+        )
+        cls.dps = School.objects.create(
+            name="Delhi Public School",
+            code="DPS-RKP",
+            city="Delhi",
+            address="Sector 12, RK Puram",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        cls.closed = School.objects.create(
+            name="Delhi Closed School",
+            code="DCS-1",
+            city="Delhi",
+            address="1 Old Rd",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+            is_active=False,
+        )
+
+    def setUp(self):
+        from .autocomplete import index
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("school-autocomplete")
+        self.index = index
+        self.index.load()
+
+    def names(self, q):
+        response = self.client.get(self.url, {"q": q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [school["name"] for school in response.data["results"]]
+
+    def new_school(self, name, code):
+        return School.objects.create(
+            name=name,
+            code=code,
+            city="Mumbai",
+            address="1 New Rd",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+
+    def test_autocomplete_matches_word_prefixes_and_code(self):
+        """Test any name word or the code can be typed, without search queries"""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("del"), ["Delhi Public School"])
+            self.assertEqual(self.names("PUBLIC sch"), ["Delhi Public School"])
+            self.assertEqual(self.names("dps-r"), ["Delhi Public School"])
+            self.assertEqual(self.names("xyz"), [])
+            self.assertEqual(self.names(""), [])
+
+        response = self.client.get(self.url, {"q": "del"})
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": str(self.dps.id), "name": "Delhi Public School", "city": "Delhi",
+             "code": "DPS-RKP"},
+        )
+
+    def test_autocomplete_rejects_inactive_users(self):
+        """Test a deactivated user's still-valid token no longer works"""
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.names("del"), ["Delhi Public School"])
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(self.url, {"q": "del"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_autocomplete_limit(self):
+        """Test ?limit= caps the results"""
+        self.new_school("Delhi Model School", "DMS-1")
+        self.index.load()
+
+        response = self.client.get(self.url, {"q": "school", "limit": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(self.url, {"q": "school", "limit": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_applies_local_writes_on_commit(self):
+        """Test writes in this process update the index once committed"""
+        with self.captureOnCommitCallbacks(execute=True):
+            school = self.new_school("Mumbai Model School", "MMS-1")
+        self.assertEqual(self.names("mumbai"), ["Mumbai Model School"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            school.name = "Mumbai Modern School"
+            school.save()
+        self.assertEqual(self.names("modern"), ["Mumbai Modern School"])
+        self.assertEqual(self.names("model"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dps.is_active = False
+            self.dps.save()
+        self.assertEqual(self.names("delhi"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            school.delete()
+        self.assertEqual(self.names("mumbai"), [])
+
+    def test_autocomplete_refreshes_from_database(self):
+        """Test writes by other workers are picked up by the periodic refresh"""
+        from sync.models import SyncTombstone
+
+        # Written without signals, as another worker's writes look here
+        School.objects.filter(pk=self.closed.pk).update(
+            is_active=True, updated_at=timezone.now()
+        )
+        SyncTombstone.objects.create(kind="school", object_id=self.dps.pk)
+        self.assertEqual(self.names("delhi"), ["Delhi Public School"])
+
+        self.index._next_refresh = 0
+        self.assertEqual(self.names("delhi"), ["Delhi Closed School"])
+
+
+class SchoolImportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create shared test data once per test class"""
+        cls.ops_user = User.objects.create_user(
+            email="ops@example.com", password="password123", role="ops"
+        )
+        cls.parent = User.objects.create_user(
+            email="parent@example.com", password="password123", role="parent"
+        )
+        cls.school = School.objects.create(
+            name="School A",
+            code="SCH-A",
+            city="Mumbai",
+            address="123 Test St",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.ops_user)
+        self.url = reverse("school-import")
+
+    def upload(self, name, content, **data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {"file": upload, **data}, format="multipart")
+
+    def test_import_csv(self):
+        """Test CSV rows are created or upserted on code, and bad rows reported"""
+        from catalog.models import CatalogEntry, UniformSpec
+
+        UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="shirt",
+            item_name="Test Shirt",
+            gender="boys",
+            season="summer",
+            fabric_gsm=180,
+            pantone="PMS 287C",
+            measurements={},
+        )
+        content = (
+            "name,code,city,address,board,academic_year,session_start,session_end,"
+            "latitude,longitude\n"
+            "School A Renamed,SCH-A,Pune,123 Test St,,2025-2026,2025-04-01,2026-03-31,,\n"
+            "New School,SCH-NEW,Delhi,\"1 New Rd, Delhi\",CBSE,2025-2026,2025-04-01,2026-03-31,"
+            "28.5672,77.1734\n"
+            "Bad Dates,SCH-BAD,Delhi,2 Bad Rd,,2025-2026,2026-04-01,2025-03-31,,\n"
+            ",SCH-NONAME,Delhi,3 Rd,,2025-2026,2025-04-01,2026-03-31,,\n"
+            "Half Located,SCH-HALF,Delhi,4 Rd,,2025-2026,2025-04-01,2026-03-31,28.5,\n"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload("district.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {key: response.data[key] for key in ("created", "updated", "unchanged", "failed")},
+            {"created": 1, "updated": 1, "unchanged": 0, "failed": 3},
+        )
+        self.assertEqual(
+            [(error["line"], list(error["errors"])) for error in response.data["errors"]],
+            [(4, ["session_end"]), (5, ["name"]), (6, ["non_field_errors"])],
+        )
+        self.school.refresh_from_db()
+        self.assertEqual((self.school.name, self.school.city), ("School A Renamed", "Pune"))
+        new_school = School.objects.get(code="SCH-NEW")
+        self.assertEqual((new_school.address, new_school.board), ("1 New Rd, Delhi", "CBSE"))
+        self.assertEqual((new_school.latitude, new_school.longitude), (28.5672, 77.1734))
+        self.assertIsNone(self.school.board)
+        self.assertEqual(
+            CatalogEntry.objects.get(school=self.school).school_name, "School A Renamed"
+        )
+
+        # Identical rows are left alone on a re-run
+        response = self.upload("district.csv", content)
+        self.assertEqual((response.data["created"], response.data["unchanged"]), (0, 2))
+
+    def test_import_invalidates_school_lists(self):
+        """Test imported schools show up in cached lists once committed"""
+        list_url = reverse("school-list")
+        self.client.get(list_url, {"city": "Delhi"})
+
+        content = (
+            '{"name": "New School", "code": "SCH-NEW", "city": "Delhi", '
+            '"address": "1 New Rd", "academic_year": "2025-2026", '
+            '"session_start": "2025-04-01", "session_end": "2026-03-31"}\n'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload("district.jsonl", content)
+
+        response = self.client.get(list_url, {"city": "Delhi"})
+        self.assertEqual([school["name"] for school in response.json()["results"]], ["New School"])
+
+    def test_import_invalidates_vendor_listings(self):
+        """Test renaming a school by import drops its vendors' cached listings"""
+        from decimal import Decimal
+
+        from catalog.models import UniformSpec
+        from vendors.cache import vendor_listings_generation
+        from vendors.models import Listing, Vendor
+
+        spec = UniformSpec.objects.create(
+            school=self.school,
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="shirt",
+            item_name="Test Shirt",
+            gender="boys",
+            season="summer",
+            fabric_gsm=180,
+            pantone="PMS 287C",
+            measurements={},
+        )
+        vendor = Vendor.objects.create(
+            official_name="Test Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        Listing.objects.create(
+            vendor=vendor,
+            school=self.school,
+            spec=spec,
+            sku="SHIRT-1",
+            base_price=Decimal("100.00"),
+            mrp=Decimal("120.00"),
+            lead_time_days=5,
+        )
+        generation = vendor_listings_generation(vendor.id)
+
+        content = (
+            '{"name": "School A Renamed", "code": "SCH-A", "city": "Mumbai", '
+            '"address": "123 Test St", "academic_year": "2025-2026", '
+            '"session_start": "2025-04-01", "session_end": "2026-03-31"}\n'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload("district.jsonl", content)
+
+        self.assertNotEqual(vendor_listings_generation(vendor.id), generation)
+
+    def test_import_requires_ops(self):
+        """Test only ops and staff can import, and a file and format are required"""
+        response = self.upload("district.txt", "name\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("format", response.data)
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertIn("file", response.data)
+
+        self.client.force_authenticate(user=self.parent)
+        response = self.upload("district.csv", "name\n")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_schools_command(self):
+        """Test the command imports JSON Lines and reports unparseable lines"""
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as source:
+            source.write(
+                '{"name": "New School", "code": "SCH-NEW", "city": "Delhi", '
+                '"address": "1 New Rd", "academic_year": "2025-2026", '
+                '"session_start": "2025-04-01", "session_end": "2026-03-31", '
+                '"is_active": false}\n'
+                "\n"
+                "{not json\n"
+            )
+            source.flush()
+            out, err = StringIO(), StringIO()
+            call_command("import_schools", source.name, stdout=out, stderr=err)
+
+        self.assertIn("Created 1, updated 0, unchanged 0, failed 1", out.getvalue())
+        self.assertIn("line 3", err.getvalue())
+        self.assertFalse(School.objects.get(code="SCH-NEW").is_active)
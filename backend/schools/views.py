@@ -1,14 +1,37 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.request import Request
-from django.core.cache import cache
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
+import io
 from typing import Any
+from config.cache import peek_generations
+from config.importing import IMPORT_FORMATS, detect_format
+from config.conditional import etag_matches, make_etag, not_modified
+from config.responses import cached_json_response
+from vendors.permissions import IsOpsOrStaff
+from .autocomplete import AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT
+from .autocomplete import index as autocomplete_index
+from .cache import (
+    SCHOOL_CACHE_TIMEOUT,
+    school_cache_key,
+    school_list_cache_key,
+    school_list_scope,
+    school_scope,
+)
 from .models import School
+from .importing import import_schools
+from .queries import (
+    MAX_NEAR_RADIUS_KM,
+    NEAR_RADIUS_KM,
+    near_schools,
+    search_schools,
+    search_thresholds,
+)
 from .serializers import SchoolSerializer
 
 
@@ -24,27 +47,134 @@ class SchoolViewSet(viewsets.ReadOnlyModelViewSet[School]):
         # Only load fields needed by serializer
         return School.objects.only(
             "id", "name", "city", "board",
-            "session_start", "session_end",
+            "session_start", "session_end", "latitude", "longitude",
             "is_active", "created_at", "updated_at"
         )
 
-    @method_decorator(cache_page(60 * 5))
+    def search_text(self) -> str:
+        return self.request.query_params.get("search", "").strip()
+
+    def near_point(self) -> tuple[float, float, float] | None:
+        """(latitude, longitude, radius in km) from ?near=lat,lng&radius=km"""
+        params = self.request.query_params
+        if not params.get("near"):
+            return None
+        try:
+            latitude, longitude = (float(part) for part in params["near"].split(","))
+        except ValueError:
+            raise ValidationError({"near": "Expected latitude,longitude."})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({"near": "Latitude or longitude out of range."})
+        try:
+            radius = float(params.get("radius", NEAR_RADIUS_KM))
+        except ValueError:
+            raise ValidationError({"radius": "A number is required."})
+        if not 0 < radius <= MAX_NEAR_RADIUS_KM:
+            raise ValidationError(
+                {"radius": f"Must be more than 0 and at most {MAX_NEAR_RADIUS_KM} km."}
+            )
+        return latitude, longitude, radius
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ranking = []
+        if search_text := self.search_text():
+            queryset = search_schools(queryset, search_text)
+            ranking.append("-similarity")
+        if near := self.near_point():
+            queryset = near_schools(queryset, *near)
+            ranking.append("nearness")
+        # Rank by similarity, then distance, unless the client picked an order
+        if ranking and "ordering" not in self.request.query_params:
+            queryset = queryset.order_by(*ranking, "name", "pk")
+        return queryset
+
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        return super().list(request, *args, **kwargs)
+        def build() -> Any:
+            if self.search_text():
+                with search_thresholds():
+                    return super(SchoolViewSet, self).list(request, *args, **kwargs).data
+            return super(SchoolViewSet, self).list(request, *args, **kwargs).data
+
+        # A city's generation key is created only once a school is there;
+        # lists of any other ?city= are empty and not worth caching
+        city = request.query_params.get("city")
+        if (
+            city
+            and not peek_generations([school_list_scope(city)])
+            and not School.objects.filter(city=city).exists()
+        ):
+            return Response(build())
+
+        cache_key = school_list_cache_key(request.query_params.urlencode(), city)
+        etag = make_etag(cache_key, request.accepted_renderer.format)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return cached_json_response(
+            request, cache_key, build, SCHOOL_CACHE_TIMEOUT, headers={"ETag": etag}
+        )
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         school_id = kwargs.get("pk")
-        cache_key = f"school_{school_id}"
+        # Generation keys never expire, so one is created only once the
+        # school is known to exist (see catalog.views.existing_schools)
+        school = None
+        if not peek_generations([school_scope(school_id)]):
+            school = self.get_object()
+        cache_key = school_cache_key(school_id)
 
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+        etag = make_etag(cache_key, request.accepted_renderer.format)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return cached_json_response(
+            request,
+            cache_key,
+            lambda: self.get_serializer(school or self.get_object()).data,
+            SCHOOL_CACHE_TIMEOUT,
+            headers={"ETag": etag},
+        )
 
-        # Get from database
-        response = super().retrieve(request, *args, **kwargs)
+    @action(detail=False)
+    def autocomplete(self, request: Request) -> Response:
+        """Active schools whose name words or code start with ?q=, from memory"""
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            return Response(
+                {"limit": "A number is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, MAX_AUTOCOMPLETE_LIMIT))
+        results = autocomplete_index.search(request.query_params.get("q", ""), limit)
+        return Response({"results": results})
 
-        # Cache the response
-        cache.set(cache_key, response.data, timeout=60 * 5)
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        permission_classes=[IsOpsOrStaff],
+        parser_classes=[MultiPartParser],
+    )
+    def bulk_import(self, request: Request) -> Response:
+        """
+        Bulk import schools from an uploaded CSV or JSON Lines file (ops only).
+        Upserts on code and reports invalid rows by line; see import_schools.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": "No file was submitted."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        format = request.data.get("format") or detect_format(upload.name or "")
+        if format not in IMPORT_FORMATS:
+            return Response(
+                {"format": f"Pass one of: {', '.join(IMPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return response
+        # Large uploads are spooled to disk; read them back a line at a time
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        report = import_schools(stream, format)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import SyncTombstone
+
+
+@admin.register(SyncTombstone)
+class SyncTombstoneAdmin(admin.ModelAdmin):
+    list_display = ["kind", "object_id", "deleted_at"]
+    list_filter = ["kind"]
+    search_fields = ["object_id"]
+    ordering = ["-deleted_at"]
+    readonly_fields = ["id", "kind", "object_id", "deleted_at"]
@@ -0,0 +1,42 @@
+"""
+Management command to delete sync tombstones past their retention.
+
+Run daily. Sync requests with watermarks older than TOMBSTONE_RETENTION are
+refused (see sync.views), so no client can miss a pruned deletion. Deletes
+run in batches so no single statement locks many rows.
+
+Usage:
+    python manage.py prune_tombstones
+    python manage.py prune_tombstones --batch-size 5000
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from sync.models import TOMBSTONE_RETENTION, SyncTombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than the retention window"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tombstones deleted per statement (default: 1000)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        cutoff = timezone.now() - TOMBSTONE_RETENTION
+        expired = SyncTombstone.objects.filter(deleted_at__lt=cutoff).order_by(
+            "deleted_at", "id"
+        )
+
+        pruned = 0
+        while batch := list(expired.values_list("id", flat=True)[: options["batch_size"]]):
+            pruned += SyncTombstone.objects.filter(id__in=batch).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} tombstones"))
@@ -0,0 +1,36 @@
+import uuid
+from datetime import timedelta
+from django.db import models
+from typing import ClassVar
+
+# How long tombstones are kept (see the prune_tombstones command). A client
+# whose watermark is older than this may have missed deletions and must sync
+# from scratch.
+TOMBSTONE_RETENTION = timedelta(days=90)
+
+
+class SyncTombstone(models.Model):
+    """Record of a deleted row, so delta syncs can tell clients to drop it"""
+
+    objects: ClassVar[models.Manager["SyncTombstone"]]
+
+    KIND_CHOICES: list[tuple[str, str]] = [
+        ("school", "School"),
+        ("spec", "Uniform spec"),
+        ("listing", "Listing"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "sync_tombstones"
+        ordering = ["deleted_at", "id"]
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="idx_tombstone_deleted"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
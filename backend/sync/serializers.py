@@ -0,0 +1,27 @@
+from rest_framework import serializers
+from vendors.models import Listing
+
+
+class SyncListingSerializer(serializers.ModelSerializer[Listing]):
+    """A listing as held by offline clients, shaped like the catalog's listings"""
+
+    vendor_name = serializers.CharField(source="vendor.official_name", read_only=True)
+    price = serializers.DecimalField(
+        source="base_price", max_digits=10, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Listing
+        fields = [
+            "id",
+            "school",
+            "spec",
+            "vendor",
+            "vendor_name",
+            "sku",
+            "price",
+            "mrp",
+            "lead_time_days",
+            "updated_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,36 @@
+"""Record what delta sync clients need to see beyond rows' own updated_at."""
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from catalog.models import UniformSpec
+from schools.models import School
+from vendors.models import Listing, Vendor
+from vendors.signals import listing_visibility_changed
+from .models import SyncTombstone
+
+
+@receiver(post_delete, sender=School)
+def school_deleted(sender: Any, instance: School, **kwargs: Any) -> None:
+    SyncTombstone.objects.create(kind="school", object_id=instance.pk)
+
+
+@receiver(post_delete, sender=UniformSpec)
+def spec_deleted(sender: Any, instance: UniformSpec, **kwargs: Any) -> None:
+    SyncTombstone.objects.create(kind="spec", object_id=instance.pk)
+
+
+@receiver(post_delete, sender=Listing)
+def listing_deleted(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    SyncTombstone.objects.create(kind="listing", object_id=instance.pk)
+
+
+@receiver(post_save, sender=Vendor)
+def vendor_saved(sender: Any, instance: Vendor, **kwargs: Any) -> None:
+    # Synced listings carry the vendor name and are dropped when the vendor
+    # is no longer approved and active; other edits leave them alone
+    if listing_visibility_changed(instance):
+        Listing.objects.filter(vendor_id=instance.pk).update(updated_at=timezone.now())
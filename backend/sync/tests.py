@@ -0,0 +1,282 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from catalog.models import UniformSpec
+from schools.models import School
+from vendors.models import Listing, Vendor
+from .models import TOMBSTONE_RETENTION, SyncTombstone
+from .views import decode_watermark, encode_watermark
+
+User = get_user_model()
+
+
+class SyncTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create shared test data once per test class"""
+        cls.user = User.objects.create_user(
+            email="test@example.com", password="password123", role="parent"
+        )
+        cls.schools = [
+            School.objects.create(
+                name=f"School {code}",
+                code=f"SCH-{code}",
+                city="Mumbai",
+                address="123 Test St",
+                academic_year="2025-2026",
+                session_start=date(2025, 4, 1),
+                session_end=date(2026, 3, 31),
+            )
+            for code in ("A", "B")
+        ]
+        cls.spec = UniformSpec.objects.create(
+            school=cls.schools[0],
+            academic_year="2025-2026",
+            description="Test Description",
+            item_type="shirt",
+            item_name="Test Shirt",
+            gender="boys",
+            season="summer",
+            fabric_gsm=180,
+            pantone="PMS 287C",
+            measurements={},
+        )
+        cls.vendor = Vendor.objects.create(
+            official_name="Approved Vendor", city="Mumbai", status="approved", is_active=True
+        )
+        cls.listing = Listing.objects.create(
+            vendor=cls.vendor,
+            school=cls.schools[0],
+            spec=cls.spec,
+            sku="SHIRT-1",
+            base_price=Decimal("100.00"),
+            mrp=Decimal("120.00"),
+            lead_time_days=5,
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("sync")
+
+    def backdate_all(self):
+        """Make every existing row look like it last changed yesterday"""
+        yesterday = timezone.now() - timedelta(days=1)
+        for model in (School, UniformSpec, Listing):
+            model.objects.update(updated_at=yesterday)
+
+    def test_full_sync(self):
+        """Test a sync without a watermark returns every row"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["has_more"])
+        self.assertEqual(
+            {school["id"] for school in response.data["schools"]["updated"]},
+            {str(school.id) for school in self.schools},
+        )
+        self.assertEqual(response.data["specs"]["updated"][0]["id"], str(self.spec.id))
+        listing = response.data["listings"]["updated"][0]
+        self.assertEqual(listing["sku"], "SHIRT-1")
+        self.assertEqual(listing["vendor_name"], "Approved Vendor")
+        self.assertTrue(response.data["watermark"])
+
+    def test_delta_sync(self):
+        """Test a sync from a watermark returns only what changed since"""
+        self.backdate_all()
+        watermark = self.client.get(self.url).data["watermark"]
+
+        response = self.client.get(self.url, {"since": watermark})
+        self.assertEqual(response.data["schools"], {"updated": [], "deleted": []})
+        self.assertEqual(response.data["specs"], {"updated": [], "deleted": []})
+        self.assertEqual(response.data["listings"], {"updated": [], "deleted": []})
+
+        self.spec.description = "Updated Description"
+        self.spec.save()
+        response = self.client.get(self.url, {"since": watermark})
+
+        self.assertEqual(
+            [spec["description"] for spec in response.data["specs"]["updated"]],
+            ["Updated Description"],
+        )
+        self.assertEqual(response.data["schools"]["updated"], [])
+
+    def test_sync_tombstones(self):
+        """Test deleted rows and disabled listings come back as deletions"""
+        self.backdate_all()
+        watermark = self.client.get(self.url).data["watermark"]
+
+        other_listing = Listing.objects.create(
+            vendor=self.vendor,
+            school=self.schools[1],
+            spec=self.spec,
+            sku="SHIRT-2",
+            base_price=Decimal("90.00"),
+            mrp=Decimal("120.00"),
+            lead_time_days=5,
+        )
+        self.listing.enabled = False
+        self.listing.save()
+        other_listing_id = str(other_listing.id)
+        other_listing.delete()
+        school_id = str(self.schools[1].id)
+        self.schools[1].delete()
+
+        response = self.client.get(self.url, {"since": watermark})
+
+        self.assertEqual(response.data["schools"]["deleted"], [school_id])
+        self.assertEqual(response.data["listings"]["updated"], [])
+        self.assertEqual(
+            set(response.data["listings"]["deleted"]),
+            {str(self.listing.id), other_listing_id},
+        )
+        self.assertEqual(SyncTombstone.objects.filter(kind="listing").count(), 1)
+
+    def test_sync_rejected_vendor_listings_deleted(self):
+        """Test rejecting a vendor sends its listings as deletions"""
+        self.backdate_all()
+        watermark = self.client.get(self.url).data["watermark"]
+
+        self.vendor.status = "rejected"
+        self.vendor.save()
+        response = self.client.get(self.url, {"since": watermark})
+
+        self.assertEqual(response.data["listings"]["deleted"], [str(self.listing.id)])
+
+    def test_sync_vendor_profile_edit_leaves_listings(self):
+        """Test vendor edits that do not change listings resend nothing"""
+        self.backdate_all()
+        watermark = self.client.get(self.url).data["watermark"]
+
+        self.vendor.phone = "+919999999999"
+        self.vendor.save()
+        response = self.client.get(self.url, {"since": watermark})
+        self.assertEqual(response.data["listings"], {"updated": [], "deleted": []})
+
+        self.vendor.official_name = "Renamed Vendor"
+        self.vendor.save()
+        response = self.client.get(self.url, {"since": watermark})
+        self.assertEqual(
+            [listing["vendor_name"] for listing in response.data["listings"]["updated"]],
+            ["Renamed Vendor"],
+        )
+
+    def test_sync_pages_per_type(self):
+        """Test each type is paged and the watermark resumes after the last row"""
+        # Outside the lag window, so pages resume mid-stream
+        self.backdate_all()
+        response = self.client.get(self.url, {"limit": 1})
+        self.assertTrue(response.data["has_more"])
+        first = response.data["schools"]["updated"]
+        self.assertEqual(len(first), 1)
+
+        response = self.client.get(
+            self.url, {"limit": 1, "since": response.data["watermark"]}
+        )
+        second = response.data["schools"]["updated"]
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0]["id"], second[0]["id"])
+        self.assertFalse(response.data["has_more"])
+
+    def test_sync_page_inside_lag_window_not_skipped(self):
+        """Test a page cut off inside the lag window resumes from its start"""
+        now = timezone.now()
+        School.objects.filter(pk=self.schools[0].pk).update(updated_at=now - timedelta(seconds=10))
+        School.objects.filter(pk=self.schools[1].pk).update(updated_at=now - timedelta(seconds=5))
+        response = self.client.get(self.url, {"limit": 1})
+        self.assertEqual(
+            [school["id"] for school in response.data["schools"]["updated"]],
+            [str(self.schools[0].id)],
+        )
+        self.assertFalse(response.data["has_more"])
+
+        # Stamped before the last row sent, but committed after the page
+        late = School.objects.create(
+            name="Late School",
+            code="SCH-LATE",
+            city="Mumbai",
+            address="1 Late Rd",
+            academic_year="2025-2026",
+            session_start=date(2025, 4, 1),
+            session_end=date(2026, 3, 31),
+        )
+        School.objects.filter(pk=late.pk).update(updated_at=now - timedelta(seconds=20))
+
+        response = self.client.get(self.url, {"since": response.data["watermark"]})
+        self.assertIn(
+            str(late.id), [school["id"] for school in response.data["schools"]["updated"]]
+        )
+
+    def test_sync_invalid_watermark(self):
+        """Test a malformed watermark is rejected"""
+        for since in ("not-a-watermark", "e30"):
+            response = self.client.get(self.url, {"since": since})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("since", response.data)
+
+    def test_sync_watermark_with_invalid_object_id(self):
+        """Test a watermark whose resume position is not a UUID is rejected"""
+        positions = decode_watermark(self.client.get(self.url).data["watermark"])
+        positions["schools"] = (positions["schools"][0], "not-a-uuid")
+
+        response = self.client.get(self.url, {"since": encode_watermark(positions)})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
+    def test_sync_expired_watermark(self):
+        """Test a watermark older than the tombstone retention is refused"""
+        positions = decode_watermark(self.client.get(self.url).data["watermark"])
+        expired = timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1)
+        positions = {section: (expired, None) for section in positions}
+
+        response = self.client.get(self.url, {"since": encode_watermark(positions)})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertIn("since", response.data)
+
+    def test_full_sync_skips_old_tombstones(self):
+        """Test a sync from scratch does not list rows deleted before it"""
+        SyncTombstone.objects.create(kind="school", object_id=self.schools[1].id)
+        SyncTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=1))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data["schools"]["deleted"], [])
+
+    def test_prune_tombstones(self):
+        """Test tombstones past the retention are pruned and newer ones kept"""
+        old, recent = (
+            SyncTombstone.objects.create(kind="spec", object_id=self.spec.id)
+            for _ in range(2)
+        )
+        SyncTombstone.objects.filter(id=old.id).update(
+            deleted_at=timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1)
+        )
+
+        call_command("prune_tombstones", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(list(SyncTombstone.objects.values_list("id", flat=True)), [recent.id])
+
+    def test_sync_unauthenticated(self):
+        """Test sync requires authentication"""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sync_uses_updated_at_index(self):
+        """Test changed rows are found through the (updated_at, id) indexes"""
+        from django.db import connection
+
+        since = timezone.now() - timedelta(hours=1)
+        queryset = Listing.objects.filter(updated_at__gt=since).order_by("updated_at", "id")
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_listing_updated", plan)
@@ -0,0 +1,196 @@
+"""
+Delta sync for clients that keep an offline copy of the catalog.
+
+GET /api/sync returns every school, spec and listing; each response carries a
+watermark, and GET /api/sync?since=<watermark> then returns only the rows
+created or updated since, plus the ids of rows deleted (see SyncTombstone)
+or listings no longer sold. Rows are read in (updated_at, id) order off
+indexes on those columns, a page per type at a time.
+
+Tombstones are pruned after TOMBSTONE_RETENTION, so a watermark older than
+that is refused with 410 Gone and the client starts over with a full sync.
+"""
+
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db.models import Model, Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from catalog.models import UniformSpec
+from catalog.serializers import UniformSpecDetailSerializer
+from schools.models import School
+from schools.serializers import SchoolSerializer
+from vendors.models import Listing
+from .models import TOMBSTONE_RETENTION, SyncTombstone
+from .serializers import SyncListingSerializer
+
+SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 2000
+
+# Rows are stamped with updated_at before their transaction commits, so one
+# can become visible after a sync already moved past its timestamp. Once a
+# client is caught up, its watermark trails the sync by this much; clients
+# upsert rows, so the few sent twice are harmless.
+SYNC_WATERMARK_LAG = timedelta(seconds=60)
+
+# Independently paged row streams; each has its own position in a watermark
+SECTIONS = ("schools", "specs", "listings", "tombstones")
+
+Position = tuple[datetime, str | None]
+
+
+def encode_watermark(positions: dict[str, Position]) -> str:
+    payload = {
+        section: [timestamp.isoformat(), object_id]
+        for section, (timestamp, object_id) in positions.items()
+    }
+    encoded = urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return encoded.decode().rstrip("=")
+
+
+def decode_watermark(watermark: str) -> dict[str, Position]:
+    """Parse a watermark from encode_watermark(), raising ValueError if invalid"""
+    try:
+        payload = json.loads(urlsafe_b64decode(watermark + "=" * (-len(watermark) % 4)))
+        positions = {}
+        for section in SECTIONS:
+            timestamp, object_id = payload[section]
+            parsed = parse_datetime(timestamp)
+            if parsed is None or timezone.is_naive(parsed):
+                raise ValueError(timestamp)
+            if object_id is not None:
+                object_id = str(uuid.UUID(object_id))
+            positions[section] = (parsed, object_id)
+    except (AttributeError, KeyError, TypeError) as exc:
+        raise ValueError(watermark) from exc
+    return positions
+
+
+def changed_after(
+    queryset: QuerySet, field: str, position: Position | None, limit: int
+) -> tuple[list[Model], bool]:
+    """Return up to limit rows past position in (field, id) order, and whether more remain"""
+    if position is not None:
+        timestamp, object_id = position
+        after = Q(**{f"{field}__gt": timestamp})
+        if object_id is not None:
+            after |= Q(**{field: timestamp, "id__gt": object_id})
+        queryset = queryset.filter(after)
+    rows = list(queryset.order_by(field, "id")[: limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def next_position(
+    position: Position | None,
+    rows: list[Model],
+    field: str,
+    truncated: bool,
+    caught_up_at: datetime,
+) -> Position:
+    if truncated:
+        # Resume right after the last row sent, but never past caught_up_at:
+        # rows still committing may carry an earlier timestamp
+        timestamp = getattr(rows[-1], field)
+        if timestamp < caught_up_at:
+            return timestamp, str(rows[-1].pk)
+    elif position is not None and position[0] >= caught_up_at:
+        return position
+    return caught_up_at, None
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def sync_changes(request: Request) -> Response:
+    """Schools, specs and listings changed since ?since=<watermark>"""
+    caught_up_at = timezone.now() - SYNC_WATERMARK_LAG
+    since = request.query_params.get("since")
+    if since:
+        try:
+            positions = decode_watermark(since)
+        except ValueError:
+            return Response(
+                {"since": "Invalid watermark."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if positions["tombstones"][0] < timezone.now() - TOMBSTONE_RETENTION:
+            return Response(
+                {"since": "Watermark has expired; sync again without since."},
+                status=status.HTTP_410_GONE,
+            )
+    else:
+        # A client starting from nothing has nothing to delete, so tombstones
+        # are read from when this sync began rather than from the oldest kept
+        positions = {**dict.fromkeys(SECTIONS), "tombstones": (caught_up_at, None)}
+    try:
+        limit = int(request.query_params.get("limit", SYNC_PAGE_SIZE))
+    except ValueError:
+        return Response(
+            {"limit": "A number is required."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    limit = max(1, min(limit, MAX_SYNC_PAGE_SIZE))
+
+    streams: dict[str, tuple[QuerySet, str]] = {
+        "schools": (School.objects.all(), "updated_at"),
+        "specs": (UniformSpec.objects.all(), "updated_at"),
+        "listings": (
+            Listing.objects.select_related("vendor").only(
+                "id", "school_id", "spec_id", "vendor_id", "sku", "base_price",
+                "mrp", "lead_time_days", "enabled", "updated_at",
+                "vendor__official_name", "vendor__status", "vendor__is_active",
+            ),
+            "updated_at",
+        ),
+        "tombstones": (SyncTombstone.objects.all(), "deleted_at"),
+    }
+    rows: dict[str, list[Any]] = {}
+    next_positions: dict[str, Position] = {}
+    has_more = False
+    for section, (queryset, field) in streams.items():
+        rows[section], truncated = changed_after(queryset, field, positions[section], limit)
+        next_positions[section] = next_position(
+            positions[section], rows[section], field, truncated, caught_up_at
+        )
+        # A page cut off inside the lag window is resent from caught_up_at on
+        # the next poll instead; asking for more now would return it again
+        has_more |= truncated and next_positions[section][1] is not None
+
+    deleted: dict[str, list[str]] = {kind: [] for kind, _ in SyncTombstone.KIND_CHOICES}
+    for tombstone in rows["tombstones"]:
+        deleted[tombstone.kind].append(str(tombstone.object_id))
+
+    # Listings the catalog no longer shows are tombstones to the client
+    listings = []
+    for listing in rows["listings"]:
+        vendor = listing.vendor
+        if listing.enabled and vendor.status == "approved" and vendor.is_active:
+            listings.append(listing)
+        else:
+            deleted["listing"].append(str(listing.pk))
+
+    return Response(
+        {
+            "watermark": encode_watermark(next_positions),
+            "has_more": has_more,
+            "schools": {
+                "updated": SchoolSerializer(rows["schools"], many=True).data,
+                "deleted": deleted["school"],
+            },
+            "specs": {
+                "updated": UniformSpecDetailSerializer(rows["specs"], many=True).data,
+                "deleted": deleted["spec"],
+            },
+            "listings": {
+                "updated": SyncListingSerializer(listings, many=True).data,
+                "deleted": deleted["listing"],
+            },
+        }
+    )
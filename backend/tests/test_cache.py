@@ -0,0 +1,117 @@
+"""
+Tests for the shared cache helpers (config.cache, config.responses).
+"""
+
+import json
+import threading
+import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from config.cache import _lock_key, get_or_compute
+from config.responses import COMPRESS_MIN_BYTES, pack_json, unpack_json
+
+
+class GetOrComputeTests(SimpleTestCase):
+    """Test single-flight recomputation and stale-while-revalidate"""
+
+    key = "test:get_or_compute"
+
+    def setUp(self):
+        cache.delete_many([self.key, _lock_key(self.key)])
+        self.calls = 0
+
+    def compute(self, value="fresh", delay=0.0):
+        def run():
+            self.calls += 1
+            time.sleep(delay)
+            return value
+
+        return run
+
+    def store(self, value, expires_in, delta=0.0):
+        cache.set(
+            self.key,
+            {"value": value, "expires": time.time() + expires_in, "delta": delta},
+            timeout=60,
+        )
+
+    def test_computes_once_then_serves_cached_value(self):
+        """Test a fresh value is computed once and then reused"""
+        self.assertEqual(get_or_compute(self.key, self.compute(), timeout=60), "fresh")
+        self.assertEqual(get_or_compute(self.key, self.compute("other"), timeout=60), "fresh")
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(cache.get(_lock_key(self.key)))
+
+    def test_expired_value_recomputed_when_unlocked(self):
+        """Test an expired value is recomputed by the first reader"""
+        self.store("stale", expires_in=-1)
+
+        self.assertEqual(get_or_compute(self.key, self.compute(), timeout=60), "fresh")
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_served_while_locked(self):
+        """Test readers get the stale value while another worker recomputes"""
+        self.store("stale", expires_in=-1)
+        cache.add(_lock_key(self.key), 1, timeout=60)
+
+        self.assertEqual(get_or_compute(self.key, self.compute(), timeout=60), "stale")
+        self.assertEqual(self.calls, 0)
+
+    def test_refreshes_early_near_expiry(self):
+        """Test a value that is slow to compute is refreshed before it expires"""
+        # A 1000s recompute expiring in 1s is always due for early refresh
+        self.store("stale", expires_in=1, delta=1000)
+
+        self.assertEqual(get_or_compute(self.key, self.compute(), timeout=60), "fresh")
+
+    def test_value_in_other_format_treated_as_miss(self):
+        """Test a bare value cached by older code is recomputed, not misread"""
+        cache.set(self.key, Decimal("30"), timeout=60)
+
+        self.assertEqual(get_or_compute(self.key, self.compute(), timeout=60), "fresh")
+        self.assertEqual(get_or_compute(self.key, self.compute("other"), timeout=60), "fresh")
+        self.assertEqual(self.calls, 1)
+
+    def test_missing_value_computed_once_under_concurrency(self):
+        """Test concurrent misses trigger a single computation"""
+        results = []
+
+        def request():
+            results.append(get_or_compute(self.key, self.compute(delay=0.2), timeout=60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["fresh"] * 8)
+        self.assertEqual(self.calls, 1)
+
+    def test_waiters_compute_when_lock_holder_stalls(self):
+        """Test a missing value is computed anyway once the lock wait runs out"""
+        cache.add(_lock_key(self.key), 1, timeout=60)
+
+        value = get_or_compute(self.key, self.compute(), timeout=60, lock_timeout=1)
+
+        self.assertEqual(value, "fresh")
+        self.assertEqual(self.calls, 1)
+
+
+class PackedJsonTests(SimpleTestCase):
+    """Test the JSON bytes stored for cached responses"""
+
+    def test_small_bodies_stored_raw(self):
+        blob = pack_json({"id": 1})
+        self.assertEqual(unpack_json(blob), b'{"id":1}')
+        self.assertEqual(len(blob), len(b'{"id":1}') + 1)
+
+    def test_large_bodies_compressed(self):
+        data = {"results": [{"id": n, "price": "499.00"} for n in range(200)]}
+        blob = pack_json(data)
+
+        self.assertLess(len(blob), COMPRESS_MIN_BYTES * 2)
+        self.assertEqual(json.loads(unpack_json(blob))["results"][1], {"id": 1, "price": "499.00"})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VendorsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vendors"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+"""Vendor cache keys and invalidation."""
+
+from typing import Any, Iterable
+
+from config.cache import bump_generation_on_commit, get_generation
+
+
+def vendor_listings_scope(vendor_id: Any) -> str:
+    return f"vendor_listings:{vendor_id}"
+
+
+def vendor_listings_generation(vendor_id: Any) -> int:
+    return get_generation(vendor_listings_scope(vendor_id))
+
+
+def invalidate_vendor_listings(vendor_ids: Iterable[Any]) -> None:
+    bump_generation_on_commit(
+        *(vendor_listings_scope(vendor_id) for vendor_id in set(vendor_ids))
+    )
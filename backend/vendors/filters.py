@@ -0,0 +1,29 @@
+"""Vendor filter sets."""
+
+from django.db.models import Q, QuerySet
+from django_filters import rest_framework as filters
+
+from .models import Vendor
+
+
+class VendorFilter(filters.FilterSet):
+    """
+    Filters for the ops vendor list: ?status=, ?city=, ?created_after= and
+    ?created_before= (dates, both inclusive) and ?name=, which matches part of
+    the official or legacy name through the idx_vendor_*_trgm indexes.
+    """
+
+    status = filters.ChoiceFilter(choices=Vendor.STATUS_CHOICES)
+    city = filters.CharFilter()
+    created = filters.DateFromToRangeFilter(field_name="created_at")
+    name = filters.CharFilter(method="filter_name")
+
+    class Meta:
+        model = Vendor
+        fields = ["status", "city", "created", "name"]
+
+    def filter_name(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        value = value.strip()
+        if not value:
+            return queryset
+        return queryset.filter(Q(official_name__icontains=value) | Q(name__icontains=value))
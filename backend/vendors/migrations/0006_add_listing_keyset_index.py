@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0005_add_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['vendor', 'created_at', 'id'], name='idx_listing_vendor_created'),
+        ),
+    ]
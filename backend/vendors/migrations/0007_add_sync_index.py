@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0006_add_listing_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['updated_at', 'id'], name='idx_listing_updated'),
+        ),
+    ]
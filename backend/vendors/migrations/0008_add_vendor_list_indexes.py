@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:15
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0007_add_sync_index'),
+        # Creates the pg_trgm extension
+        ('schools', '0002_add_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['created_at', 'id'], name='idx_vendor_created'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='idx_vendor_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['city', 'created_at', 'id'], name='idx_vendor_city_created'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('official_name'), name='gin_trgm_ops'), name='idx_vendor_official_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='idx_vendor_name_trgm'),
+        ),
+    ]
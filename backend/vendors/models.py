@@ -1,7 +1,9 @@
 import uuid
 from decimal import Decimal
 from typing import ClassVar
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator
 from django.conf import settings
 
@@ -48,6 +50,24 @@ class Vendor(models.Model):
             models.Index(fields=["city", "is_active"], name="idx_vendor_city_active"),
             models.Index(fields=["status"], name="idx_vendor_status"),
             models.Index(fields=["gst_number"], name="idx_vendor_gst"),
+            # Keyset pages of the ops vendor list, unfiltered or filtered
+            # by status or city
+            models.Index(fields=["created_at", "id"], name="idx_vendor_created"),
+            models.Index(
+                fields=["status", "created_at", "id"], name="idx_vendor_status_created"
+            ),
+            models.Index(
+                fields=["city", "created_at", "id"], name="idx_vendor_city_created"
+            ),
+            # ?name= matches with icontains, which compares UPPER() values
+            GinIndex(
+                OpClass(Upper("official_name"), name="gin_trgm_ops"),
+                name="idx_vendor_official_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="idx_vendor_name_trgm",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -143,6 +163,10 @@ class Listing(models.Model):
             models.Index(fields=["vendor", "enabled"], name="idx_listing_vendor_en"),
             models.Index(fields=["enabled", "created_at"], name="idx_listing_en_created"),
             models.Index(fields=["vendor", "school"], name="idx_listing_vendor_school"),
+            models.Index(
+                fields=["vendor", "created_at", "id"], name="idx_listing_vendor_created"
+            ),
+            models.Index(fields=["updated_at", "id"], name="idx_listing_updated"),
         ]
         constraints = []
 
@@ -3,7 +3,7 @@ from typing import Any, Dict, Optional
 import re
 from rest_framework import serializers
 from django.utils import timezone
-from django.core.cache import cache
+from config.cache import get_or_compute
 from .models import Vendor, VendorApproval, Listing, PricePolicy
 
 
@@ -23,27 +23,38 @@ def validate_gst_number(gst: str) -> str:
     return gst.upper()
 
 
+# Policy and approval lookups are not invalidated on write, so keep serving
+# them stale for only a short while past their TTL. Their keys carry a format
+# version: v2 entries are get_or_compute() envelopes, where older workers
+# cached the bare value under the unversioned keys.
+POLICY_CACHE_TIMEOUT = 300
+POLICY_CACHE_GRACE = 30
+
+
 def get_price_policy_cached(school_id: str) -> Optional[Decimal]:
     """Cache price policy lookup for 5 minutes"""
-    cache_key = f"price_policy:{school_id}"
-    max_markup = cache.get(cache_key)
-    if max_markup is None:
+
+    def load() -> Decimal:
         try:
             policy = PricePolicy.objects.only("max_markup_pct").get(school_id=school_id)
-            max_markup = policy.max_markup_pct
+            return policy.max_markup_pct
         except PricePolicy.DoesNotExist:
-            max_markup = Decimal("30.00")
-        cache.set(cache_key, max_markup, timeout=300)
-    return max_markup
+            return Decimal("30.00")
+
+    return get_or_compute(
+        f"price_policy:v2:{school_id}",
+        load,
+        timeout=POLICY_CACHE_TIMEOUT,
+        grace=POLICY_CACHE_GRACE,
+    )
 
 
 def get_vendor_approval_cached(
     vendor_id: str, school_id: str
 ) -> Optional[VendorApproval]:
     """Cache vendor approval lookup for 5 minutes"""
-    cache_key = f"approval:{vendor_id}:{school_id}"
-    approval_data = cache.get(cache_key)
-    if approval_data is None:
+
+    def load() -> Dict[str, Any]:
         approval = (
             VendorApproval.objects.filter(
                 vendor_id=vendor_id, school_id=school_id, status="approved"
@@ -51,12 +62,17 @@ def get_vendor_approval_cached(
             .only("expires_at")
             .first()
         )
-        approval_data = {
+        return {
             "exists": approval is not None,
             "expires_at": approval.expires_at if approval else None,
         }
-        cache.set(cache_key, approval_data, timeout=300)
-    return approval_data
+
+    return get_or_compute(
+        f"approval:v2:{vendor_id}:{school_id}",
+        load,
+        timeout=POLICY_CACHE_TIMEOUT,
+        grace=POLICY_CACHE_GRACE,
+    )
 
 
 class VendorSerializer(serializers.ModelSerializer[Vendor]):
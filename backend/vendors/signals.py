@@ -0,0 +1,81 @@
+"""Invalidate vendor listing responses whenever the data they embed changes."""
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from catalog.models import UniformSpec
+from schools.models import School
+from schools.signals import schools_imported
+from .cache import invalidate_vendor_listings
+from .models import Listing, Vendor
+
+
+# Vendor fields that decide whether and how its listings are shown
+LISTING_VISIBILITY_FIELDS = ("status", "is_active", "official_name")
+
+
+@receiver(pre_save, sender=Vendor)
+def remember_listing_visibility(sender: Any, instance: Vendor, **kwargs: Any) -> None:
+    # Lets receivers skip work on listings for profile-only edits
+    instance._previous_visibility = (
+        None
+        if instance._state.adding
+        else Vendor.objects.filter(pk=instance.pk)
+        .values_list(*LISTING_VISIBILITY_FIELDS)
+        .first()
+    )
+
+
+def listing_visibility_changed(vendor: Vendor) -> bool:
+    """Whether saving a vendor changed how its listings are shown"""
+    current = tuple(getattr(vendor, field) for field in LISTING_VISIBILITY_FIELDS)
+    return getattr(vendor, "_previous_visibility", None) != current
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def listing_changed(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    invalidate_vendor_listings([instance.vendor_id])
+
+
+@receiver(post_save, sender=Vendor)
+def vendor_saved(sender: Any, instance: Vendor, **kwargs: Any) -> None:
+    invalidate_vendor_listings([instance.pk])
+
+
+@receiver(post_save, sender=School)
+def school_saved(sender: Any, instance: School, created: bool, **kwargs: Any) -> None:
+    # Listings embed the school name
+    if not created:
+        invalidate_vendor_listings(
+            Listing.objects.filter(school_id=instance.pk)
+            .values_list("vendor_id", flat=True)
+            .distinct()
+        )
+
+
+@receiver(schools_imported)
+def schools_imported_listings(
+    sender: Any, schools: list[dict[str, Any]], **kwargs: Any
+) -> None:
+    # See school_saved; new schools have no listings yet
+    school_ids = [school["id"] for school in schools if not school["created"]]
+    if school_ids:
+        invalidate_vendor_listings(
+            Listing.objects.filter(school_id__in=school_ids)
+            .values_list("vendor_id", flat=True)
+            .distinct()
+        )
+
+
+@receiver(post_save, sender=UniformSpec)
+def spec_saved(sender: Any, instance: UniformSpec, created: bool, **kwargs: Any) -> None:
+    # Listings embed the spec's item type
+    if not created:
+        invalidate_vendor_listings(
+            Listing.objects.filter(spec_id=instance.pk)
+            .values_list("vendor_id", flat=True)
+            .distinct()
+        )
@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 from decimal import Decimal
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -243,6 +244,20 @@ class VendorTests(APITestCase):
         skus = [item["sku"] for item in response.data["results"]]
         self.assertIn("SHIRT-TEST-006", skus)
 
+    def test_vendor_listings_unknown_vendor(self):
+        """Test an unknown vendor id gets a 404 without creating a generation key"""
+        import uuid
+
+        from config.cache import peek_generations
+        from .cache import vendor_listings_scope
+
+        vendor_id = uuid.uuid4()
+        url = reverse("vendor-listings", kwargs={"vendor_id": vendor_id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(peek_generations([vendor_listings_scope(vendor_id)]), {})
+
     def test_missing_idempotency_key(self):
         """Test that missing idempotency key returns error"""
         url = reverse("listing-create")
@@ -261,3 +276,152 @@ class VendorTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Idempotency-Key", str(response.data))
+
+    def test_vendor_listings_conditional_get(self):
+        """Test vendor listings answer a matching If-None-Match with 304"""
+        url = reverse("vendor-listings", kwargs={"vendor_id": self.vendor.id})
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Listing.objects.create(
+                vendor=self.vendor,
+                school=self.school,
+                spec=self.spec,
+                sku="SHIRT-ETAG",
+                base_price=Decimal("100.00"),
+                mrp=Decimal("125.00"),
+                lead_time_days=7,
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("SHIRT-ETAG", [item["sku"] for item in response.data["results"]])
+
+    def test_vendor_listings_keyset_pagination(self):
+        """Test vendor listings can be walked newest first with a cursor"""
+        skus = []
+        for i in range(3):
+            Listing.objects.create(
+                vendor=self.vendor,
+                school=self.school,
+                spec=self.spec,
+                sku=f"SHIRT-PAGE-{i}",
+                base_price=Decimal("100.00"),
+                mrp=Decimal("125.00"),
+                lead_time_days=7,
+            )
+            skus.insert(0, f"SHIRT-PAGE-{i}")
+
+        url = reverse("vendor-listings", kwargs={"vendor_id": self.vendor.id})
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [item["sku"] for item in response.data["results"]]
+
+        response = self.client.get(response.data["next"])
+        second_page = [item["sku"] for item in response.data["results"]]
+
+        self.assertEqual(first_page + second_page, skus)
+        self.assertIsNone(response.data["next"])
+
+
+class VendorListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ops_user = User.objects.create_user(
+            email="ops@example.com", password="password123", role="ops"
+        )
+        cls.vendors = {
+            name: Vendor.objects.create(official_name=name, city=city, status=vendor_status)
+            for name, city, vendor_status in (
+                ("Mumbai Uniforms", "Mumbai", "approved"),
+                ("Mumbai Tailors", "Mumbai", "pending"),
+                ("Delhi Uniforms", "Delhi", "approved"),
+                ("Pune Stitchers", "Pune", "rejected"),
+            )
+        }
+        # A legacy vendor with only the old name field
+        cls.vendors["Legacy Outfitters"] = Vendor.objects.create(
+            name="Legacy Outfitters", city="Pune", status="approved"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.ops_user)
+        self.url = reverse("vendor-list")
+
+    def names(self, response):
+        return [vendor["official_name"] or None for vendor in response.data["results"]]
+
+    def test_vendor_list_keyset_pages(self):
+        """Test vendors are listed newest first a keyset page at a time, with a count"""
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"page_size": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["count"], response.data["count_exact"]), (5, True))
+        seen = [vendor["id"] for vendor in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        seen += [vendor["id"] for vendor in response.data["results"]]
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(
+            seen,
+            [
+                str(vendor.id)
+                for vendor in sorted(
+                    self.vendors.values(), key=lambda vendor: (vendor.created_at, vendor.id)
+                )
+            ][::-1],
+        )
+
+    def test_vendor_list_filters(self):
+        """Test status, city, name and created range filters"""
+        response = self.client.get(self.url, {"status": "approved", "city": "Mumbai"})
+        self.assertEqual(self.names(response), ["Mumbai Uniforms"])
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(self.url, {"name": "uniform"})
+        self.assertEqual(set(self.names(response)), {"Mumbai Uniforms", "Delhi Uniforms"})
+        response = self.client.get(self.url, {"name": "outfit"})
+        self.assertEqual(
+            [vendor["id"] for vendor in response.data["results"]],
+            [str(self.vendors["Legacy Outfitters"].id)],
+        )
+
+        Vendor.objects.filter(pk=self.vendors["Pune Stitchers"].pk).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        last_week = (timezone.now() - timedelta(days=7)).date().isoformat()
+        response = self.client.get(self.url, {"created_before": last_week})
+        self.assertEqual(self.names(response), ["Pune Stitchers"])
+        response = self.client.get(self.url, {"created_after": last_week})
+        self.assertEqual(response.data["count"], 4)
+
+        response = self.client.get(self.url, {"status": "suspended"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.data)
+
+    def test_vendor_list_estimates_large_counts(self):
+        """Test counts past EXACT_COUNT_LIMIT come from the planner's estimate"""
+        from unittest import mock
+
+        with mock.patch("config.pagination.EXACT_COUNT_LIMIT", 2):
+            response = self.client.get(self.url)
+
+        self.assertFalse(response.data["count_exact"])
+        self.assertGreaterEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_vendor_list_name_search_uses_trigram_index(self):
+        """Test ?name= goes through the trigram indexes"""
+        from django.db import connection, transaction
+        from .filters import VendorFilter
+
+        queryset = VendorFilter({"name": "uniform"}, queryset=Vendor.objects.all()).qs
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("idx_vendor_official_name_trgm", plan)
+        self.assertIn("idx_vendor_name_trgm", plan)
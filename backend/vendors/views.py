@@ -4,7 +4,13 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.request import Request
 from django.db import IntegrityError, transaction
+from django.http import Http404
 from typing import Any
+from config.cache import peek_generations
+from config.conditional import etag_matches, make_etag, not_modified
+from config.pagination import CountedKeysetPagination, KeysetPaginationMixin
+from .cache import vendor_listings_generation, vendor_listings_scope
+from .filters import VendorFilter
 from .models import Listing, Vendor
 from .serializers import (
     VendorOnboardSerializer,
@@ -109,11 +115,27 @@ def vendor_reject(request: Request, vendor_id: str) -> Response:
 @permission_classes([IsOpsOrStaff])
 def vendor_list(request: Request) -> Response:
     """
-    List all vendors (admin/ops only).
+    List vendors newest first, a keyset page at a time (admin/ops only).
+    Filter with ?status=, ?city=, ?created_after=, ?created_before= and ?name=;
+    count is exact up to EXACT_COUNT_LIMIT and estimated beyond.
     """
-    vendors = Vendor.objects.select_related("user").order_by("-created_at")
-    serializer = VendorSerializer(vendors, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    vendors = (
+        Vendor.objects.select_related("user")
+        # Only the columns VendorSerializer reads
+        .only(
+            "id", "user", "user__email", "user__role", "gst_number", "official_name",
+            "email", "phone", "city", "status", "is_active",
+            "created_at", "updated_at",
+        )
+    )
+    filterset = VendorFilter(request.query_params, queryset=vendors, request=request)
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    paginator = CountedKeysetPagination()
+    page = paginator.paginate_queryset(filterset.qs, request)
+    serializer = VendorSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(["GET"])
@@ -200,7 +222,7 @@ def create_listing(request: Request) -> Response:
         )
 
 
-class VendorListingViewSet(viewsets.ReadOnlyModelViewSet[Listing]):
+class VendorListingViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet[Listing]):
     serializer_class = ListingSerializer
     permission_classes = [IsAuthenticated]
 
@@ -211,3 +233,26 @@ class VendorListingViewSet(viewsets.ReadOnlyModelViewSet[Listing]):
             .select_related("vendor", "school", "spec__school")
             .order_by("-created_at")
         )
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        vendor_id = kwargs.get("vendor_id")
+        # Generation keys never expire, so one is created only once the
+        # vendor is known to exist (see catalog.views.existing_schools)
+        if (
+            not peek_generations([vendor_listings_scope(vendor_id)])
+            and not Vendor.objects.filter(pk=vendor_id).exists()
+        ):
+            raise Http404
+        etag = make_etag(
+            "vendor_listings",
+            vendor_id,
+            vendor_listings_generation(vendor_id),
+            request.query_params.urlencode(),
+            request.accepted_renderer.format,
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response